@@ -0,0 +1,127 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-06
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "organizations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_organizations_id", "organizations", ["id"])
+
+    op.create_table(
+        "employees",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("preferences", sa.Text(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_employees_id", "employees", ["id"])
+
+    op.create_table(
+        "shift_patterns",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("pattern_data", sa.Text(), nullable=False),
+        sa.Column("shifts_per_day", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_shift_patterns_id", "shift_patterns", ["id"])
+
+    op.create_table(
+        "employee_shift_patterns",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("shift_pattern_id", sa.Integer(), sa.ForeignKey("shift_patterns.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_employee_shift_patterns_id", "employee_shift_patterns", ["id"])
+
+    op.create_table(
+        "schedules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_schedules_id", "schedules", ["id"])
+
+    op.create_table(
+        "schedule_assignments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("schedule_id", sa.Integer(), sa.ForeignKey("schedules.id"), nullable=False),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("shift_position", sa.Integer(), nullable=False),
+        sa.Column("is_manual_override", sa.Boolean(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_schedule_assignments_id", "schedule_assignments", ["id"])
+
+    op.create_table(
+        "leaves",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        *timestamps(),
+    )
+    op.create_index("ix_leaves_id", "leaves", ["id"])
+
+
+def downgrade() -> None:
+    for table in (
+        "leaves", "schedule_assignments", "schedules", "employee_shift_patterns",
+        "shift_patterns", "employees", "organizations", "users",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,37 @@
+"""Composite indexes for the hot query shapes
+
+Leaves are looked up by employee, active flag and overlapping date range, assignments
+by schedule and date, and employees by organization and active flag.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-06
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_leaves_employee_id_is_active_dates", "leaves",
+        ["employee_id", "is_active", "start_date", "end_date"]
+    )
+    op.create_index(
+        "ix_schedule_assignments_schedule_id_date", "schedule_assignments",
+        ["schedule_id", "date"]
+    )
+    op.create_index(
+        "ix_employees_organization_id_is_active", "employees",
+        ["organization_id", "is_active"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_organization_id_is_active", table_name="employees")
+    op.drop_index("ix_schedule_assignments_schedule_id_date", table_name="schedule_assignments")
+    op.drop_index("ix_leaves_employee_id_is_active_dates", table_name="leaves")
@@ -0,0 +1,42 @@
+"""Per-employee shift statistics of finalized schedules
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-13
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "schedule_employee_stats",
+        sa.Column("schedule_id", sa.Integer(), sa.ForeignKey("schedules.id"), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id"), primary_key=True),
+        sa.Column("shift_position", sa.Integer(), primary_key=True),
+        sa.Column("shift_count", sa.Integer(), nullable=False),
+    )
+
+    # Statistics of schedules finalized before this migration
+    op.execute(
+        """
+        INSERT INTO schedule_employee_stats (schedule_id, employee_id, shift_position, shift_count)
+        SELECT schedule_assignments.schedule_id, schedule_assignments.employee_id,
+               schedule_assignments.shift_position, COUNT(schedule_assignments.id)
+        FROM schedule_assignments
+        JOIN schedules ON schedules.id = schedule_assignments.schedule_id
+        WHERE schedules.status = 'finalized'
+        GROUP BY schedule_assignments.schedule_id, schedule_assignments.employee_id,
+                 schedule_assignments.shift_position
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("schedule_employee_stats")
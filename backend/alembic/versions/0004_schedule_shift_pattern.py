@@ -0,0 +1,30 @@
+"""Shift pattern a schedule was generated from
+
+Schedules generated before this migration keep a NULL shift_pattern_id.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("schedules") as batch_op:
+        batch_op.add_column(sa.Column("shift_pattern_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_schedules_shift_pattern_id", "shift_patterns", ["shift_pattern_id"], ["id"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("schedules") as batch_op:
+        batch_op.drop_constraint("fk_schedules_shift_pattern_id", type_="foreignkey")
+        batch_op.drop_column("shift_pattern_id")
@@ -0,0 +1,186 @@
+"""Read endpoints served from the async database engine
+
+Included in front of the regular routers when ASYNC_DATABASE_ENABLED is set, so these
+paths are handled on the event loop instead of occupying a threadpool worker while the
+queries run. Responses are the same as those of the synchronous endpoints.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ..core.async_database import get_async_db
+from ..crud import (
+    employee as employee_crud, leave as leave_crud, organization as organization_crud,
+    schedule as schedule_crud, schedule_stats, user as user_crud
+)
+from ..schemas.employee import Employee
+from ..schemas.leave import Leave
+from ..schemas.organization import Organization
+from ..schemas.schedule import Schedule, ScheduleWithAssignments
+from ..schemas.user import User
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..utils.schedule_cache import cached_schedule_response, render_schedule_json, schedule_response
+from .auth import credentials_exception, get_token_email, security
+
+router = APIRouter()
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    email = get_token_email(credentials)
+    user = await user_crud.get_user_by_email_async(db, email=email)
+    if user is None:
+        raise credentials_exception()
+    return user
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+@router.get("/organizations/", response_model=List[Organization])
+async def read_organizations(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get a page of organizations, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        organizations, next_cursor = await organization_crud.get_organizations_async(db, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    set_next_cursor(response, next_cursor)
+    return organizations
+
+
+@router.get("/organizations/{organization_id}", response_model=Organization)
+async def read_organization(
+    organization_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    organization = await organization_crud.get_organization_async(db, organization_id=organization_id)
+    if organization is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    return organization
+
+
+@router.get("/employees/organization/{organization_id}", response_model=List[Employee])
+async def read_employees_by_organization(
+    organization_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get a page of active employees, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        employees, next_cursor = await employee_crud.get_employees_by_organization_async(
+            db, organization_id=organization_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    set_next_cursor(response, next_cursor)
+    return employees
+
+
+@router.get("/employees/{employee_id}", response_model=Employee)
+async def read_employee(
+    employee_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    employee = await employee_crud.get_employee_async(db, employee_id=employee_id)
+    if employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
+
+
+@router.get("/schedules/organization/{organization_id}", response_model=List[Schedule])
+async def read_schedules_by_organization(
+    organization_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get a page of schedules, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        schedules, next_cursor = await schedule_crud.get_schedules_by_organization_async(
+            db, organization_id=organization_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    set_next_cursor(response, next_cursor)
+    return schedules
+
+
+@router.get("/schedules/{schedule_id}", response_model=ScheduleWithAssignments)
+async def read_schedule(
+    schedule_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    schedule = await schedule_crud.get_schedule_async(db, schedule_id=schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    cached = cached_schedule_response(request, schedule, "json")
+    if cached is not None:
+        return cached
+
+    # The response does not include employees, so only the assignments are loaded
+    await schedule_crud.load_assignments_async(db, schedule, with_employees=False)
+    return schedule_response(schedule, "json", render_schedule_json(schedule))
+
+
+@router.get("/schedules/{schedule_id}/statistics")
+async def get_schedule_statistics(
+    schedule_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get shift distribution statistics for a schedule"""
+    schedule = await schedule_crud.get_schedule_async(db, schedule_id=schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return await schedule_stats.get_schedule_statistics_async(db, schedule)
+
+
+@router.get("/leaves/employee/{employee_id}", response_model=List[Leave])
+async def read_leaves_by_employee(
+    employee_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get a page of active leaves, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        leaves, next_cursor = await leave_crud.get_leaves_by_employee_async(
+            db, employee_id=employee_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    set_next_cursor(response, next_cursor)
+    return leaves
+
+
+@router.get("/leaves/{leave_id}", response_model=Leave)
+async def read_leave(
+    leave_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    leave = await leave_crud.get_leave_async(db, leave_id=leave_id)
+    if leave is None:
+        raise HTTPException(status_code=404, detail="Leave not found")
+    return leave
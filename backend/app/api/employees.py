@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 from ..core.database import get_db
-from ..crud import employee as employee_crud
+from ..crud import employee as employee_crud, organization as organization_crud
 from ..schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
+from ..schemas.bulk_import import ImportResult
 from .auth import get_current_user
 from ..schemas.user import User
+from ..utils.replan import replan_draft_schedules_for_employee
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..utils.bulk_import import detect_import_format, import_employees, iter_records
 
 router = APIRouter()
 
@@ -22,17 +27,50 @@ def create_employee(
 @router.get("/organization/{organization_id}", response_model=List[Employee])
 def read_employees_by_organization(
     organization_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    employees = employee_crud.get_employees_by_organization(
-        db, organization_id=organization_id, skip=skip, limit=limit
-    )
+    """Get a page of active employees, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        employees, next_cursor = employee_crud.get_employees_by_organization(
+            db, organization_id=organization_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return employees
 
 
+@router.post("/organization/{organization_id}/import", response_model=ImportResult)
+def import_employees_file(
+    organization_id: int,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Import employees from a CSV (with a header line) or NDJSON file
+
+    Columns/keys are name, email, phone and preferences (JSON text in CSV). Rows are
+    read from the upload, validated and inserted in batches, so memory use does not grow
+    with the file. Invalid rows are skipped and reported by line number; everything
+    else is imported in one transaction. dry_run only validates.
+    """
+    if organization_crud.get_organization(db, organization_id=organization_id) is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    try:
+        import_format = detect_import_format(file.filename, file.content_type)
+        return import_employees(
+            db, organization_id, iter_records(file.file, import_format, required_columns=["name"]), dry_run=dry_run
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/{employee_id}", response_model=Employee)
 def read_employee(
     employee_id: int,
@@ -66,7 +104,16 @@ def delete_employee(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    employee = employee_crud.delete_employee(db, employee_id=employee_id)
-    if employee is None:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    try:
+        employee = employee_crud.delete_employee(db, employee_id=employee_id, commit=False)
+        if employee is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        
+        # Hand the employee's upcoming shifts in draft schedules to colleagues, committed
+        # together with the deactivation
+        replan_draft_schedules_for_employee(db, employee_id, date.today(), date.max, commit=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     return {"message": "Employee deleted successfully"} 
\ No newline at end of file
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from ..core.database import get_db, SessionLocal
+from ..crud import employee as employee_crud, shift_pattern as shift_pattern_crud
+from ..schemas.job import Job
+from ..schemas.schedule import ScheduleGenerationRequest, BatchGenerationRequest
+from .auth import get_current_user
+from ..schemas.user import User
+from ..utils.scheduler import generate_schedule
+from ..utils.pattern_cache import get_compiled_pattern
+from ..utils.generation_stats import GenerationStats
+from ..utils.jobs import job_manager
+from ..utils.batch import run_batch_generation
+
+router = APIRouter()
+
+
+def run_schedule_generation_job(job, request: ScheduleGenerationRequest):
+    """Generate a schedule in a worker thread with its own database session"""
+    db = SessionLocal()
+    stats = GenerationStats()
+    try:
+        shift_pattern = shift_pattern_crud.get_shift_pattern(db, request.shift_pattern_id)
+        if not shift_pattern:
+            raise ValueError("Shift pattern not found")
+        
+        with stats.collecting(), stats.phase("load_employees"):
+            employees = list(employee_crud.iter_employees_by_organization(db, request.organization_id))
+        if not employees:
+            raise ValueError("No employees found for organization")
+        
+        schedule = generate_schedule(
+            db=db,
+            organization_id=request.organization_id,
+            year=request.year,
+            month=request.month,
+            shift_pattern=shift_pattern,
+            employees=employees,
+            name=request.name or f"Schedule {request.year}-{request.month:02d}",
+            optimize=request.optimize,
+            time_budget=request.time_budget_seconds,
+            seed=request.seed,
+            progress_callback=job.report_progress,
+            stats=stats
+        )
+        return {"schedule_id": schedule.id, "generation_stats": stats.as_dict()}
+    finally:
+        db.close()
+
+
+@router.post("/schedule-generation", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def submit_schedule_generation(
+    request: ScheduleGenerationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a schedule generation and return the job to poll for its progress"""
+    # Fail fast on requests that can never succeed
+    shift_pattern = shift_pattern_crud.get_shift_pattern(db, request.shift_pattern_id)
+    if not shift_pattern:
+        raise HTTPException(status_code=404, detail="Shift pattern not found")
+    try:
+        get_compiled_pattern(shift_pattern)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    return job_manager.submit(
+        "schedule_generation",
+        request.dict(),
+        lambda job: run_schedule_generation_job(job, request)
+    )
+
+
+@router.post("/batch-generation", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def submit_batch_generation(
+    request: BatchGenerationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue schedule generation for several organizations and months on a process pool"""
+    if (request.start_year, request.start_month) > (request.end_year, request.end_month):
+        raise HTTPException(status_code=400, detail="Start month must not be after end month")
+    
+    return job_manager.submit(
+        "batch_generation",
+        request.dict(),
+        lambda job: run_batch_generation(
+            request.organization_ids,
+            (request.start_year, request.start_month),
+            (request.end_year, request.end_month),
+            shift_pattern_ids=request.shift_pattern_ids,
+            optimize=request.optimize,
+            time_budget=request.time_budget_seconds,
+            seed=request.seed,
+            progress_callback=job.report_progress
+        ),
+        phase_weights={"generating": 1.0}
+    )
+
+
+@router.get("/{job_id}", response_model=Job)
+def read_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=Job)
+def cancel_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Cancel a queued or running job, a cancelled generation leaves no schedule behind"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
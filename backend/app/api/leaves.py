@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from ..core.database import get_db
-from ..crud import leave as leave_crud
+from ..crud import leave as leave_crud, organization as organization_crud
 from ..schemas.leave import Leave, LeaveCreate, LeaveUpdate
+from ..schemas.bulk_import import LeaveImportResult
 from .auth import get_current_user
 from ..schemas.user import User
+from ..utils.replan import replan_draft_schedules_for_employee
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..utils.bulk_import import detect_import_format, import_leaves, iter_records
 
 router = APIRouter()
 
@@ -17,20 +21,70 @@ def create_leave(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return leave_crud.create_leave(db=db, leave=leave)
+    try:
+        db_leave = leave_crud.create_leave(db=db, leave=leave, commit=False)
+        
+        # Move the employee's shifts in existing draft schedules to colleagues, committed
+        # together with the leave so a failed re-plan does not leave the drafts stale
+        replan_draft_schedules_for_employee(
+            db, db_leave.employee_id, db_leave.start_date, db_leave.end_date, commit=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(db_leave)
+    return db_leave
+
+
+@router.post("/organization/{organization_id}/import", response_model=LeaveImportResult)
+def import_leaves_file(
+    organization_id: int,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Import leaves of an organization's employees from a CSV or NDJSON file
+
+    Columns/keys are employee_id or employee_email, start_date, end_date, reason and
+    notes. Invalid rows and rows that duplicate or overlap an existing leave or another
+    row of the file are skipped and reported by line number; everything else is imported
+    in one transaction. The response lists the schedule assignments that fall on the new
+    leaves; unlike single leaves, imported leaves do not re-plan draft schedules.
+    dry_run only validates.
+    """
+    if organization_crud.get_organization(db, organization_id=organization_id) is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    try:
+        import_format = detect_import_format(file.filename, file.content_type)
+        return import_leaves(
+            db, organization_id,
+            iter_records(file.file, import_format, required_columns=["start_date", "end_date"]),
+            dry_run=dry_run
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.get("/employee/{employee_id}", response_model=List[Leave])
 def read_leaves_by_employee(
     employee_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    leaves = leave_crud.get_leaves_by_employee(
-        db, employee_id=employee_id, skip=skip, limit=limit
-    )
+    """Get a page of active leaves by start date, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        leaves, next_cursor = leave_crud.get_leaves_by_employee(
+            db, employee_id=employee_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return leaves
 
 
@@ -53,11 +107,22 @@ def update_leave(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_leave = leave_crud.update_leave(
-        db, leave_id=leave_id, leave=leave
-    )
-    if db_leave is None:
-        raise HTTPException(status_code=404, detail="Leave not found")
+    try:
+        db_leave = leave_crud.update_leave(
+            db, leave_id=leave_id, leave=leave, commit=False
+        )
+        if db_leave is None:
+            raise HTTPException(status_code=404, detail="Leave not found")
+        
+        if db_leave.is_active:
+            replan_draft_schedules_for_employee(
+                db, db_leave.employee_id, db_leave.start_date, db_leave.end_date, commit=False
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(db_leave)
     return db_leave
 
 
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..core.database import get_db
 from ..crud import organization as organization_crud
 from ..schemas.organization import Organization, OrganizationCreate, OrganizationUpdate
 from .auth import get_current_user
 from ..schemas.user import User
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
 
 router = APIRouter()
 
@@ -21,12 +22,19 @@ def create_organization(
 
 @router.get("/", response_model=List[Organization])
 def read_organizations(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    organizations = organization_crud.get_organizations(db, skip=skip, limit=limit)
+    """Get a page of organizations, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        organizations, next_cursor = organization_crud.get_organizations(db, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return organizations
 
 
@@ -1,79 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date, datetime
 import calendar
 import random
 from ..core.database import get_db
 from ..crud import schedule as schedule_crud, employee as employee_crud, shift_pattern as shift_pattern_crud, leave as leave_crud
+from ..crud import schedule_stats
 from ..schemas.schedule import (
     Schedule, ScheduleCreate, ScheduleUpdate, 
-    ScheduleAssignment, ScheduleAssignmentCreate, ScheduleAssignmentUpdate,
-    ScheduleWithAssignments, ScheduleGenerationRequest
+    ScheduleAssignment, ScheduleAssignmentCreate, ScheduleAssignmentUpdate, ScheduleAssignmentBatch,
+    ScheduleWithAssignments, ScheduleGenerationRequest, ReplanRequest, GeneratedSchedule,
+    ScheduleGrid
 )
 from .auth import get_current_user
 from ..schemas.user import User
 from ..utils.scheduler import generate_schedule
-from ..utils.export import export_schedule_to_excel, export_schedule_to_pdf
+from ..utils.generation_stats import GenerationStats
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..utils.replan import replan_schedule
+from ..utils.export import render_schedule_pdf, stream_schedule_excel
+from ..utils.schedule_cache import (
+    cached_schedule_response, render_schedule_json, schedule_response, streaming_schedule_response
+)
+from ..utils.schedule_grid import build_schedule_grid
 
 router = APIRouter()
 
 
-@router.post("/generate", response_model=Schedule)
+@router.post("/generate", response_model=GeneratedSchedule)
 def generate_new_schedule(
     request: ScheduleGenerationRequest,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate a new schedule based on shift pattern and employees"""
+    """Generate a new schedule based on shift pattern and employees
+
+    The phase timings and counters of the generation are returned in generation_stats
+    and in the Server-Timing header.
+    """
+    stats = GenerationStats()
+    
     # Get shift pattern
     shift_pattern = shift_pattern_crud.get_shift_pattern(db, request.shift_pattern_id)
     if not shift_pattern:
         raise HTTPException(status_code=404, detail="Shift pattern not found")
     
     # Get employees for the organization
-    employees = employee_crud.get_employees_by_organization(db, request.organization_id)
+    with stats.collecting(), stats.phase("load_employees"):
+        employees = list(employee_crud.iter_employees_by_organization(db, request.organization_id))
     if not employees:
         raise HTTPException(status_code=400, detail="No employees found for organization")
     
-    # Generate schedule
-    schedule = generate_schedule(
-        db=db,
-        organization_id=request.organization_id,
-        year=request.year,
-        month=request.month,
-        shift_pattern=shift_pattern,
-        employees=employees,
-        name=request.name or f"Schedule {request.year}-{request.month:02d}"
-    )
+    # Generate schedule; patterns stored before their validation existed may be invalid
+    try:
+        schedule = generate_schedule(
+            db=db,
+            organization_id=request.organization_id,
+            year=request.year,
+            month=request.month,
+            shift_pattern=shift_pattern,
+            employees=employees,
+            name=request.name or f"Schedule {request.year}-{request.month:02d}",
+            optimize=request.optimize,
+            time_budget=request.time_budget_seconds,
+            seed=request.seed,
+            stats=stats
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     
+    response.headers["Server-Timing"] = stats.server_timing()
+    schedule.generation_stats = stats.as_dict()
     return schedule
 
 
 @router.get("/organization/{organization_id}", response_model=List[Schedule])
 def read_schedules_by_organization(
     organization_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    schedules = schedule_crud.get_schedules_by_organization(
-        db, organization_id=organization_id, skip=skip, limit=limit
-    )
+    """Get a page of schedules, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        schedules, next_cursor = schedule_crud.get_schedules_by_organization(
+            db, organization_id=organization_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return schedules
 
 
 @router.get("/{schedule_id}", response_model=ScheduleWithAssignments)
 def read_schedule(
     schedule_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    schedule = schedule_crud.get_schedule_with_assignments(db, schedule_id=schedule_id)
+    """Get a schedule with its assignments
+
+    Finalized schedules are served from the response cache with an ETag; a request with
+    a matching If-None-Match gets 304 Not Modified.
+    """
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
     if schedule is None:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    return schedule
+    cached = cached_schedule_response(request, schedule, "json")
+    if cached is not None:
+        return cached
+    
+    # The response does not include employees, so only the assignments are loaded
+    schedule_crud.load_assignments(db, schedule, with_employees=False)
+    return schedule_response(schedule, "json", render_schedule_json(schedule))
+
+
+@router.get("/{schedule_id}/grid", response_model=ScheduleGrid)
+def read_schedule_grid(
+    schedule_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a schedule as a days x shifts matrix of employee indices
+
+    A compact alternative to the full schedule for calendar views, without the notes and
+    per-assignment ids and timestamps. Cached with an ETag for finalized schedules.
+    """
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    cached = cached_schedule_response(request, schedule, "grid")
+    if cached is not None:
+        return cached
+    
+    grid = build_schedule_grid(db, schedule)
+    return schedule_response(schedule, "grid", grid.model_dump_json().encode())
 
 
 @router.put("/{schedule_id}", response_model=Schedule)
@@ -106,11 +174,33 @@ def finalize_schedule(
         raise HTTPException(status_code=400, detail="Only draft schedules can be finalized")
     
     schedule.status = "finalized"
+    schedule_stats.update_stats_for_status(db, schedule_id, "draft", "finalized")
     db.commit()
     db.refresh(schedule)
     return schedule
 
 
+@router.post("/{schedule_id}/replan")
+def replan_schedule_assignments(
+    schedule_id: int,
+    request: ReplanRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Re-plan only the shifts of employees who became unavailable, keeping manual overrides"""
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    if request.start_date > request.end_date:
+        raise HTTPException(status_code=400, detail="Start date must not be after end date")
+    
+    result = replan_schedule(
+        db, schedule, request.employee_ids, request.start_date, request.end_date
+    )
+    return {"schedule_id": schedule_id, **result}
+
+
 @router.put("/{schedule_id}/assignments/{assignment_id}", response_model=ScheduleAssignment)
 def update_schedule_assignment(
     schedule_id: int,
@@ -120,45 +210,74 @@ def update_schedule_assignment(
     current_user: User = Depends(get_current_user)
 ):
     """Manually override a schedule assignment"""
+    # Marked as manual override in the same commit as the change
     db_assignment = schedule_crud.update_schedule_assignment(
-        db, assignment_id=assignment_id, assignment=assignment
+        db, assignment_id=assignment_id, assignment=assignment.model_copy(update={"is_manual_override": True})
     )
     if db_assignment is None:
         raise HTTPException(status_code=404, detail="Schedule assignment not found")
-    
-    # Mark as manual override
-    db_assignment.is_manual_override = True
-    db.commit()
-    db.refresh(db_assignment)
     return db_assignment
 
 
+@router.post("/{schedule_id}/assignments/batch", response_model=List[ScheduleAssignment])
+def update_schedule_assignments(
+    schedule_id: int,
+    batch: ScheduleAssignmentBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Manually override several assignments of a schedule at once
+
+    edits change the employee, shift position or notes of an assignment and swaps
+    exchange the employees of two assignments. All of them are validated first and
+    applied in one transaction, or none is. Returns the changed assignments.
+    """
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    try:
+        return schedule_crud.apply_assignment_batch(db, schedule, batch)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/{schedule_id}/export/excel")
 def export_schedule_excel(
     schedule_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Export schedule to Excel"""
-    schedule = schedule_crud.get_schedule_with_assignments(db, schedule_id=schedule_id)
+    """Export schedule to Excel, finalized schedules are cached like the schedule itself
+
+    The workbook is streamed while its assignments are read.
+    """
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
     if schedule is None:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    
-    return export_schedule_to_excel(schedule)
+    cached = cached_schedule_response(request, schedule, "excel")
+    if cached is not None:
+        return cached
+    return streaming_schedule_response(schedule, "excel", stream_schedule_excel(schedule))
 
 
 @router.get("/{schedule_id}/export/pdf")
 def export_schedule_pdf(
     schedule_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Export schedule to PDF"""
-    schedule = schedule_crud.get_schedule_with_assignments(db, schedule_id=schedule_id)
+    """Export schedule to PDF, finalized schedules are cached like the schedule itself"""
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
     if schedule is None:
         raise HTTPException(status_code=404, detail="Schedule not found")
+    cached = cached_schedule_response(request, schedule, "pdf")
+    if cached is not None:
+        return cached
     
-    return export_schedule_to_pdf(schedule)
+    schedule_crud.load_assignments(db, schedule)
+    return schedule_response(schedule, "pdf", render_schedule_pdf(schedule))
 
 
 @router.get("/{schedule_id}/statistics")
@@ -168,25 +287,8 @@ def get_schedule_statistics(
     current_user: User = Depends(get_current_user)
 ):
     """Get shift distribution statistics for a schedule"""
-    schedule = schedule_crud.get_schedule_with_assignments(db, schedule_id=schedule_id)
+    schedule = schedule_crud.get_schedule(db, schedule_id=schedule_id)
     if schedule is None:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    # Calculate statistics
-    stats = {}
-    for assignment in schedule.assignments:
-        employee_name = assignment.employee.name
-        if employee_name not in stats:
-            stats[employee_name] = {"total_shifts": 0, "shifts_by_position": {}}
-        
-        stats[employee_name]["total_shifts"] += 1
-        shift_pos = assignment.shift_position
-        if shift_pos not in stats[employee_name]["shifts_by_position"]:
-            stats[employee_name]["shifts_by_position"][shift_pos] = 0
-        stats[employee_name]["shifts_by_position"][shift_pos] += 1
-    
-    return {
-        "schedule_id": schedule_id,
-        "total_assignments": len(schedule.assignments),
-        "employee_statistics": stats
-    } 
\ No newline at end of file
+    return schedule_stats.get_schedule_statistics(db, schedule) 
\ No newline at end of file
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..core.database import get_db
 from ..crud import shift_pattern as shift_pattern_crud
 from ..schemas.shift_pattern import ShiftPattern, ShiftPatternCreate, ShiftPatternUpdate
 from .auth import get_current_user
 from ..schemas.user import User
+from ..utils.pagination import NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
 
 router = APIRouter()
 
@@ -22,14 +23,21 @@ def create_shift_pattern(
 @router.get("/organization/{organization_id}", response_model=List[ShiftPattern])
 def read_shift_patterns_by_organization(
     organization_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    shift_patterns = shift_pattern_crud.get_shift_patterns_by_organization(
-        db, organization_id=organization_id, skip=skip, limit=limit
-    )
+    """Get a page of active shift patterns, the next page's cursor is sent in the X-Next-Cursor header"""
+    try:
+        shift_patterns, next_cursor = shift_pattern_crud.get_shift_patterns_by_organization(
+            db, organization_id=organization_id, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return shift_patterns
 
 
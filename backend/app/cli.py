@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+from .utils.batch import run_batch_generation
+
+
+def parse_month(value: str):
+    """Parse a YYYY-MM argument into (year, month)"""
+    try:
+        year, month = value.split("-")
+        return int(year), int(month)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected YYYY-MM, got {value!r}")
+
+
+def parse_pattern(value: str):
+    """Parse an ORGANIZATION_ID=SHIFT_PATTERN_ID argument"""
+    try:
+        organization_id, shift_pattern_id = value.split("=")
+        return int(organization_id), int(shift_pattern_id)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected ORGANIZATION_ID=SHIFT_PATTERN_ID, got {value!r}")
+
+
+def batch_generate(args):
+    summary = run_batch_generation(
+        args.organization_ids,
+        args.start,
+        args.end,
+        shift_pattern_ids=dict(args.patterns),
+        optimize=args.optimize,
+        time_budget=args.time_budget,
+        seed=args.seed,
+        max_workers=args.workers
+    )
+    json.dump(summary, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 1 if summary["failed"] else 0
+
+
+def migrate(args):
+    from .core.migrations import run_migrations
+    run_migrations(args.revision)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Shift Planner command line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch-generate", help="Generate schedules for several organizations and months")
+    batch.add_argument("organization_ids", type=int, nargs="+", metavar="ORGANIZATION_ID")
+    batch.add_argument("--from", dest="start", type=parse_month, required=True, metavar="YYYY-MM")
+    batch.add_argument("--to", dest="end", type=parse_month, required=True, metavar="YYYY-MM")
+    batch.add_argument(
+        "--pattern", dest="patterns", type=parse_pattern, action="append", default=[],
+        metavar="ORGANIZATION_ID=SHIFT_PATTERN_ID",
+        help="Shift pattern to use for an organization (default: its oldest active pattern)"
+    )
+    batch.add_argument("--optimize", action="store_true", help="Improve schedules by local search")
+    batch.add_argument("--time-budget", type=float, default=2.0, help="Optimizer seconds per schedule")
+    batch.add_argument("--seed", type=int, default=None)
+    batch.add_argument("--workers", type=int, default=None, help="Worker processes (default: BATCH_WORKERS or one per CPU)")
+    batch.set_defaults(handler=batch_generate)
+
+    migrations = subparsers.add_parser("migrate", help="Upgrade the database schema")
+    migrations.add_argument("--revision", default="head", help="Target revision (default: head)")
+    migrations.set_defaults(handler=migrate)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
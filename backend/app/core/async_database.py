@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from .config import settings
+from .database import get_pool_options, instrument_engine
+
+# Async drivers for the synchronous DATABASE_URL schemes
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL with its driver replaced by an async one"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, separator, rest = settings.DATABASE_URL.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+
+ASYNC_DATABASE_URL = get_async_database_url()
+
+# Create async database engine, it shares the pool settings and metrics of the sync one
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **get_pool_options(ASYNC_DATABASE_URL),
+)
+instrument_engine(async_engine.sync_engine)
+
+# Objects stay usable after commit, lazy loads are not possible in async sessions
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,13 +1,30 @@
-from sqlalchemy import create_engine
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import registry
+
+
+def get_pool_options(database_url: str) -> dict:
+    """Connection pool options from the settings, SQLite keeps its default pool"""
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=300,
+    **get_pool_options(settings.DATABASE_URL),
 )
 
 # Create session factory
@@ -16,6 +33,119 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+# Query buckets, most requests should issue a handful of statements
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting in the pool's queue for a connection, excluding connecting and pre-ping",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS_IN_USE = registry.gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+)
+
+
+class RequestDatabaseStats:
+    """SQL statements issued and pool waits while handling one request"""
+
+    __slots__ = ("queries", "query_seconds", "checkout_wait_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.checkout_wait_seconds = 0.0
+
+
+# Stats of the request being handled, set by the metrics middleware
+current_request_db_stats: ContextVar[Optional[RequestDatabaseStats]] = ContextVar(
+    "current_request_db_stats", default=None
+)
+
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        operation = "OTHER"
+    DB_QUERY_SECONDS.observe(elapsed, operation=operation)
+
+    stats = current_request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+def discard_query_timer(exception_context):
+    # after_cursor_execute is not called for failed statements
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CONNECTIONS_IN_USE.inc()
+
+
+def count_checkin(dbapi_connection, connection_record):
+    DB_POOL_CONNECTIONS_IN_USE.dec()
+
+
+def instrument_engine(target):
+    """Record statement timings and pool usage of an engine in the metrics"""
+    event.listen(target, "before_cursor_execute", start_query_timer)
+    event.listen(target, "after_cursor_execute", record_query)
+    event.listen(target, "handle_error", discard_query_timer)
+    event.listen(target, "engine_disposed", lambda engine: time_pool_queue(engine.pool))
+    event.listen(target.pool, "checkout", count_checkout)
+    event.listen(target.pool, "checkin", count_checkin)
+    time_pool_queue(target.pool)
+
+
+def time_pool_queue(pool):
+    """Time how long checkouts wait in the queue of a QueuePool
+
+    A checkout waits in the queue's get until a connection is returned to the pool (or
+    the pool timeout passes); connecting and the pre-ping happen afterwards and are not
+    included. Pools without a queue hand out connections without waiting. Disposing the
+    engine replaces its pool, instrument_engine then instruments the new one.
+    """
+    queue = getattr(pool, "_pool", None)
+    if queue is None or getattr(queue.get, "timed", False):
+        return
+    get = queue.get
+
+    def timed_get(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return get(*args, **kwargs)
+        finally:
+            record_checkout_wait(time.perf_counter() - started)
+
+    timed_get.timed = True
+    queue.get = timed_get
+
+
+def record_checkout_wait(waited: float):
+    DB_POOL_CHECKOUT_WAIT_SECONDS.observe(waited)
+    stats = current_request_db_stats.get()
+    if stats is not None:
+        stats.checkout_wait_seconds += waited
+
+
+instrument_engine(engine)
+
 
 def get_db():
     """Dependency to get database session"""
@@ -23,4 +153,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
@@ -0,0 +1,31 @@
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from .database import engine
+
+ALEMBIC_INI = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini"))
+
+# Revision matching the schema that Base.metadata.create_all used to create
+INITIAL_REVISION = "0001"
+
+
+def get_alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    # Keep the application's logging configuration
+    config.attributes["configure_logging"] = False
+    return config
+
+
+def run_migrations(revision: str = "head"):
+    """Upgrade the database schema to the given revision
+
+    Databases created by the former Base.metadata.create_all at startup have the tables
+    but no migration history; they are stamped with the initial revision first so that
+    only the later migrations run.
+    """
+    config = get_alembic_config()
+    table_names = inspect(engine).get_table_names()
+    if "alembic_version" not in table_names and "users" in table_names:
+        command.stamp(config, INITIAL_REVISION)
+    command.upgrade(config, revision)
@@ -0,0 +1,83 @@
+import time
+from .database import RequestDatabaseStats, current_request_db_stats, QUERY_COUNT_BUCKETS
+from .metrics import registry
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "Handled HTTP requests",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response body was sent",
+    ["method", "route"],
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+HTTP_REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per HTTP request",
+    ["method", "route"],
+)
+HTTP_REQUEST_DB_POOL_WAIT_SECONDS = registry.histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time spent waiting for pooled database connections per HTTP request",
+    ["method", "route"],
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes and database usage per route
+
+    Requests are labelled with the route's path template (e.g. /api/schedules/{schedule_id})
+    so that the number of series stays bounded; requests matching no route are labelled
+    "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        db_stats = RequestDatabaseStats()
+        token = current_request_db_stats.set(db_stats)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec(method=method)
+            current_request_db_stats.reset(token)
+
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=status_code)
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=method, route=route_path)
+            HTTP_REQUEST_DB_QUERIES.observe(db_stats.queries, method=method, route=route_path)
+            HTTP_REQUEST_DB_SECONDS.observe(db_stats.query_seconds, method=method, route=route_path)
+            HTTP_REQUEST_DB_POOL_WAIT_SECONDS.observe(
+                db_stats.checkout_wait_seconds, method=method, route=route_path
+            )
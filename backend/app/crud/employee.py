@@ -1,19 +1,47 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterator, Optional
 import json
 from ..models.employee import Employee
 from ..schemas.employee import EmployeeCreate, EmployeeUpdate
+from .schedule import touch_schedules_of_employee
+from ..utils.pagination import paginate, paginate_async, iterate
 
 
 def get_employee(db: Session, employee_id: int):
     return db.query(Employee).filter(Employee.id == employee_id).first()
 
 
-def get_employees_by_organization(db: Session, organization_id: int, skip: int = 0, limit: int = 100):
+async def get_employee_async(db: AsyncSession, employee_id: int):
+    return await db.get(Employee, employee_id)
+
+
+def active_employees_query(db: Session, organization_id: int):
     return db.query(Employee).filter(
         Employee.organization_id == organization_id,
         Employee.is_active == True
-    ).offset(skip).limit(limit).all()
+    )
+
+
+def get_employees_by_organization(db: Session, organization_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get a page of active employees ordered by id, returns (employees, next cursor)"""
+    return paginate(active_employees_query(db, organization_id), [Employee.id], cursor, limit)
+
+
+async def get_employees_by_organization_async(db: AsyncSession, organization_id: int, cursor: Optional[str] = None,
+                                              limit: int = 100):
+    """Like get_employees_by_organization, on an async session"""
+    statement = select(Employee).where(
+        Employee.organization_id == organization_id,
+        Employee.is_active == True
+    )
+    return await paginate_async(db, statement, [Employee.id], cursor, limit)
+
+
+def iter_employees_by_organization(db: Session, organization_id: int) -> Iterator[Employee]:
+    """Iterate over all active employees ordered by id, for server-side consumers"""
+    return iterate(active_employees_query(db, organization_id), [Employee.id])
 
 
 def create_employee(db: Session, employee: EmployeeCreate):
@@ -37,6 +65,9 @@ def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate):
     update_data = employee.dict(exclude_unset=True)
     if "preferences" in update_data and update_data["preferences"]:
         update_data["preferences"] = json.dumps(update_data["preferences"])
+    if "name" in update_data and update_data["name"] != db_employee.name:
+        # Cached schedule responses and their ETags show the old name
+        touch_schedules_of_employee(db, employee_id)
     
     for field, value in update_data.items():
         setattr(db_employee, field, value)
@@ -46,11 +77,15 @@ def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate):
     return db_employee
 
 
-def delete_employee(db: Session, employee_id: int):
+def delete_employee(db: Session, employee_id: int, commit: bool = True):
+    """Deactivate an employee; with commit=False it is only flushed, for a larger transaction"""
     db_employee = get_employee(db, employee_id)
     if db_employee:
         db_employee.is_active = False
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
     return db_employee
 
 
@@ -1,20 +1,39 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import date
 from ..models.leave import Leave
+from ..models.employee import Employee
 from ..schemas.leave import LeaveCreate, LeaveUpdate
+from ..utils.pagination import paginate, paginate_async
 
 
 def get_leave(db: Session, leave_id: int):
     return db.query(Leave).filter(Leave.id == leave_id).first()
 
 
-def get_leaves_by_employee(db: Session, employee_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Leave).filter(
+async def get_leave_async(db: AsyncSession, leave_id: int):
+    return await db.get(Leave, leave_id)
+
+
+def get_leaves_by_employee(db: Session, employee_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get a page of active leaves ordered by start date, returns (leaves, next cursor)"""
+    query = db.query(Leave).filter(
         Leave.employee_id == employee_id,
         Leave.is_active == True
-    ).offset(skip).limit(limit).all()
+    )
+    return paginate(query, [Leave.start_date, Leave.id], cursor, limit)
+
+
+async def get_leaves_by_employee_async(db: AsyncSession, employee_id: int, cursor: Optional[str] = None,
+                                       limit: int = 100):
+    """Like get_leaves_by_employee, on an async session"""
+    statement = select(Leave).where(
+        Leave.employee_id == employee_id,
+        Leave.is_active == True
+    )
+    return await paginate_async(db, statement, [Leave.start_date, Leave.id], cursor, limit)
 
 
 def get_active_leaves_by_date_range(db: Session, employee_id: int, start_date: date, end_date: date):
@@ -29,15 +48,19 @@ def get_active_leaves_by_date_range(db: Session, employee_id: int, start_date: d
     ).all()
 
 
-def create_leave(db: Session, leave: LeaveCreate):
+def create_leave(db: Session, leave: LeaveCreate, commit: bool = True):
+    """Create a leave; with commit=False it is only flushed, for a larger transaction"""
     db_leave = Leave(**leave.dict())
     db.add(db_leave)
-    db.commit()
-    db.refresh(db_leave)
+    if commit:
+        db.commit()
+        db.refresh(db_leave)
+    else:
+        db.flush()
     return db_leave
 
 
-def update_leave(db: Session, leave_id: int, leave: LeaveUpdate):
+def update_leave(db: Session, leave_id: int, leave: LeaveUpdate, commit: bool = True):
     db_leave = get_leave(db, leave_id)
     if not db_leave:
         return None
@@ -46,8 +69,11 @@ def update_leave(db: Session, leave_id: int, leave: LeaveUpdate):
     for field, value in update_data.items():
         setattr(db_leave, field, value)
     
-    db.commit()
-    db.refresh(db_leave)
+    if commit:
+        db.commit()
+        db.refresh(db_leave)
+    else:
+        db.flush()
     return db_leave
 
 
@@ -69,4 +95,26 @@ def is_employee_on_leave(db: Session, employee_id: int, check_date: date):
             Leave.end_date >= check_date
         )
     ).first()
-    return leave is not None 
\ No newline at end of file
+    return leave is not None
+
+
+def get_active_leave_intervals_by_organization(
+    db: Session, organization_id: int, start_date: date, end_date: date, with_ids: bool = False
+):
+    """Get (employee_id, start_date, end_date) of all active leaves in an organization overlapping the date range
+
+    With with_ids the rows are (id, employee_id, start_date, end_date).
+    """
+    columns = [Leave.employee_id, Leave.start_date, Leave.end_date]
+    if with_ids:
+        columns.insert(0, Leave.id)
+    return db.query(*columns).join(
+        Employee, Employee.id == Leave.employee_id
+    ).filter(
+        and_(
+            Employee.organization_id == organization_id,
+            Leave.is_active == True,
+            Leave.start_date <= end_date,
+            Leave.end_date >= start_date
+        )
+    ).all()
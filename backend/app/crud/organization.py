@@ -1,14 +1,28 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..models.organization import Organization
 from ..schemas.organization import OrganizationCreate, OrganizationUpdate
+from ..utils.pagination import paginate, paginate_async
 
 
 def get_organization(db: Session, organization_id: int):
     return db.query(Organization).filter(Organization.id == organization_id).first()
 
 
-def get_organizations(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Organization).offset(skip).limit(limit).all()
+def get_organizations(db: Session, cursor: Optional[str] = None, limit: int = 100):
+    """Get a page of organizations ordered by id, returns (organizations, next cursor)"""
+    return paginate(db.query(Organization), [Organization.id], cursor, limit)
+
+
+async def get_organization_async(db: AsyncSession, organization_id: int):
+    return await db.get(Organization, organization_id)
+
+
+async def get_organizations_async(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100):
+    """Like get_organizations, on an async session"""
+    return await paginate_async(db, select(Organization), [Organization.id], cursor, limit)
 
 
 def create_organization(db: Session, organization: OrganizationCreate):
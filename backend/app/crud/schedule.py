@@ -1,28 +1,100 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Iterable, Optional
+from datetime import datetime, timezone
+from itertools import islice
 from ..models.schedule import Schedule
 from ..models.schedule_assignment import ScheduleAssignment
-from ..schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleAssignmentCreate, ScheduleAssignmentUpdate
+from ..models.employee import Employee
+from ..models.shift_pattern import ShiftPattern
+from ..schemas.schedule import (
+    ScheduleCreate, ScheduleUpdate, ScheduleAssignmentCreate, ScheduleAssignmentUpdate, ScheduleAssignmentBatch
+)
+from ..utils.pagination import paginate, paginate_async
+from ..utils.leave_index import load_leave_index
+from ..utils.schedule_cache import schedule_cache
+from . import schedule_stats
 
 
 def get_schedule(db: Session, schedule_id: int):
     return db.query(Schedule).filter(Schedule.id == schedule_id).first()
 
 
-def get_schedules_by_organization(db: Session, organization_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Schedule).filter(
-        Schedule.organization_id == organization_id
-    ).offset(skip).limit(limit).all()
+async def get_schedule_async(db: AsyncSession, schedule_id: int):
+    return await db.get(Schedule, schedule_id)
 
 
-def get_schedule_with_assignments(db: Session, schedule_id: int):
-    return db.query(Schedule).filter(Schedule.id == schedule_id).first()
+def get_schedules_by_organization(db: Session, organization_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get a page of an organization's schedules ordered by id, returns (schedules, next cursor)"""
+    query = db.query(Schedule).filter(Schedule.organization_id == organization_id)
+    return paginate(query, [Schedule.id], cursor, limit)
+
+
+async def get_schedules_by_organization_async(db: AsyncSession, organization_id: int, cursor: Optional[str] = None,
+                                              limit: int = 100):
+    """Like get_schedules_by_organization, on an async session"""
+    statement = select(Schedule).where(Schedule.organization_id == organization_id)
+    return await paginate_async(db, statement, [Schedule.id], cursor, limit)
+
+
+def get_schedule_with_assignments(db: Session, schedule_id: int, with_employees: bool = True):
+    """Get a schedule with its assignments, ordered by date and shift, loaded up front
+
+    The assignments are fetched with one additional query instead of lazily. With
+    with_employees, the id and name of each assignment's employee are joined into that
+    query, so walking assignment.employee.name issues no further queries.
+    """
+    return db.query(Schedule).options(
+        assignments_loader(with_employees)
+    ).filter(Schedule.id == schedule_id).first()
+
 
+def load_assignments(db: Session, schedule: Schedule, with_employees: bool = True) -> Schedule:
+    """Load the assignments of an already loaded schedule with one query
+
+    Like get_schedule_with_assignments, without selecting the schedule row again.
+    """
+    assignments = db.scalars(assignments_statement(schedule.id, with_employees)).all()
+    set_committed_value(schedule, "assignments", assignments)
+    return schedule
+
+
+async def load_assignments_async(db: AsyncSession, schedule: Schedule, with_employees: bool = True) -> Schedule:
+    """Like load_assignments, on an async session"""
+    assignments = (await db.scalars(assignments_statement(schedule.id, with_employees))).all()
+    set_committed_value(schedule, "assignments", assignments)
+    return schedule
+
+
+def assignments_statement(schedule_id: int, with_employees: bool):
+    statement = select(ScheduleAssignment).where(
+        ScheduleAssignment.schedule_id == schedule_id
+    ).order_by(ScheduleAssignment.date, ScheduleAssignment.shift_position, ScheduleAssignment.id)
+    if with_employees:
+        statement = statement.options(
+            joinedload(ScheduleAssignment.employee, innerjoin=True).load_only(Employee.id, Employee.name)
+        )
+    return statement
 
-def create_schedule(db: Session, schedule: ScheduleCreate):
+
+def assignments_loader(with_employees: bool):
+    loader = selectinload(Schedule.assignments)
+    if with_employees:
+        loader = loader.joinedload(
+            ScheduleAssignment.employee, innerjoin=True
+        ).load_only(Employee.id, Employee.name)
+    return loader
+
+
+def create_schedule(db: Session, schedule: ScheduleCreate, commit: bool = True):
     db_schedule = Schedule(**schedule.dict())
     db.add(db_schedule)
+    if not commit:
+        # Flush only so the caller can attach rows to the schedule id in the same transaction
+        db.flush()
+        return db_schedule
     db.commit()
     db.refresh(db_schedule)
     return db_schedule
@@ -33,9 +105,12 @@ def update_schedule(db: Session, schedule_id: int, schedule: ScheduleUpdate):
     if not db_schedule:
         return None
     
+    old_status = db_schedule.status
     update_data = schedule.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_schedule, field, value)
+    schedule_stats.update_stats_for_status(db, schedule_id, old_status, db_schedule.status)
+    schedule_cache.invalidate(schedule_id)
     
     db.commit()
     db.refresh(db_schedule)
@@ -45,36 +120,278 @@ def update_schedule(db: Session, schedule_id: int, schedule: ScheduleUpdate):
 def delete_schedule(db: Session, schedule_id: int):
     db_schedule = get_schedule(db, schedule_id)
     if db_schedule:
+        schedule_stats.clear_schedule_stats(db, schedule_id)
+        schedule_cache.invalidate(schedule_id)
         db.delete(db_schedule)
         db.commit()
     return db_schedule
 
 
+def get_shifts_per_day(db: Session, schedule: Schedule) -> int:
+    """Number of shift positions per day of a schedule
+
+    Taken from the shift pattern the schedule was generated from; schedules without one
+    fall back to their highest assigned position.
+    """
+    if schedule.shift_pattern_id is not None:
+        shifts_per_day = db.query(ShiftPattern.shifts_per_day).filter(
+            ShiftPattern.id == schedule.shift_pattern_id
+        ).scalar()
+        if shifts_per_day is not None:
+            return shifts_per_day
+    return db.query(func.max(ScheduleAssignment.shift_position)).filter(
+        ScheduleAssignment.schedule_id == schedule.id
+    ).scalar() or 0
+
+
 def create_schedule_assignment(db: Session, assignment: ScheduleAssignmentCreate):
     db_assignment = ScheduleAssignment(**assignment.dict())
     db.add(db_assignment)
+    schedule_stats.record_assignment_changes(
+        db, db_assignment.schedule_id, added=[(db_assignment.employee_id, db_assignment.shift_position)]
+    )
+    touch_schedule(db, db_assignment.schedule_id)
     db.commit()
     db.refresh(db_assignment)
     return db_assignment
 
 
+def touch_schedule(db: Session, schedule_id: int):
+    """Mark a schedule as changed after its assignments changed (not committed)
+
+    updated_at is the version of the schedule's cached responses and ETags. Microsecond
+    timestamps from Python keep successive changes distinct on every database.
+    """
+    schedule_cache.invalidate(schedule_id)
+    db.execute(update(Schedule).where(Schedule.id == schedule_id).values(updated_at=datetime.now(timezone.utc)))
+
+
+def touch_schedules_of_employee(db: Session, employee_id: int):
+    """Mark every schedule an employee is assigned in as changed (not committed)
+
+    Rendered schedules include employee names, so renaming an employee changes them.
+    """
+    schedule_ids = [
+        schedule_id for schedule_id, in db.query(ScheduleAssignment.schedule_id).filter(
+            ScheduleAssignment.employee_id == employee_id
+        ).distinct()
+    ]
+    if not schedule_ids:
+        return
+    for schedule_id in schedule_ids:
+        schedule_cache.invalidate(schedule_id)
+    db.execute(update(Schedule).where(Schedule.id.in_(schedule_ids)).values(updated_at=datetime.now(timezone.utc)))
+
+
+def bulk_create_schedule_assignments(
+    db: Session,
+    assignments: Iterable[Dict[str, Any]],
+    commit: bool = True,
+    return_ids: bool = False,
+    batch_size: int = 1000
+):
+    """Insert schedule assignments in batched executemany statements
+
+    Rows are plain dicts of ScheduleAssignment columns. With commit=False the rows are
+    only flushed so the caller can include them in a larger transaction. Returns the new
+    ids in input order if return_ids is set, otherwise the number of inserted rows.
+    """
+    statement = insert(ScheduleAssignment)
+    if return_ids:
+        statement = statement.returning(ScheduleAssignment.id, sort_by_parameter_order=True)
+    
+    rows = iter(assignments)
+    inserted_ids = []
+    inserted = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        result = db.execute(statement, batch)
+        if return_ids:
+            inserted_ids.extend(result.scalars().all())
+        inserted += len(batch)
+    
+    if commit:
+        db.commit()
+    return inserted_ids if return_ids else inserted
+
+
 def update_schedule_assignment(db: Session, assignment_id: int, assignment: ScheduleAssignmentUpdate):
     db_assignment = db.query(ScheduleAssignment).filter(ScheduleAssignment.id == assignment_id).first()
     if not db_assignment:
         return None
     
+    old_key = (db_assignment.employee_id, db_assignment.shift_position)
     update_data = assignment.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_assignment, field, value)
+    schedule_stats.record_assignment_changes(
+        db, db_assignment.schedule_id,
+        removed=[old_key], added=[(db_assignment.employee_id, db_assignment.shift_position)]
+    )
+    touch_schedule(db, db_assignment.schedule_id)
     
     db.commit()
     db.refresh(db_assignment)
     return db_assignment
 
 
+def apply_assignment_batch(db: Session, schedule: Schedule, batch: ScheduleAssignmentBatch) -> List[ScheduleAssignment]:
+    """Apply manual edits and swaps to assignments of a schedule in one transaction
+
+    Every operation is validated before anything is written; an assignment may appear in
+    only one operation, so the result does not depend on their order. Shift positions
+    must lie within the schedule's shifts per day, newly assigned employees must be
+    active and not on leave that day, and no employee may end up with two shifts on one
+    date. Raises ValueError for invalid batches. The changed assignments are written with a single executemany
+    UPDATE, marked as manual overrides, and returned ordered by id.
+    """
+    ids = [edit.assignment_id for edit in batch.edits]
+    for swap in batch.swaps:
+        ids.extend((swap.assignment_id, swap.other_assignment_id))
+    if not ids:
+        return []
+    seen = set()
+    for assignment_id in ids:
+        if assignment_id in seen:
+            raise ValueError(f"Assignment {assignment_id} appears in more than one edit or swap")
+        seen.add(assignment_id)
+
+    current = {}
+    dates = {}
+    for assignment_id, employee_id, shift_position, notes, assignment_date in db.query(
+        ScheduleAssignment.id,
+        ScheduleAssignment.employee_id,
+        ScheduleAssignment.shift_position,
+        ScheduleAssignment.notes,
+        ScheduleAssignment.date
+    ).filter(
+            ScheduleAssignment.schedule_id == schedule.id,
+        ScheduleAssignment.id.in_(ids)
+    ):
+        current[assignment_id] = {"employee_id": employee_id, "shift_position": shift_position, "notes": notes}
+        dates[assignment_id] = assignment_date
+    missing = [assignment_id for assignment_id in ids if assignment_id not in current]
+    if missing:
+        raise ValueError(f"Assignments not found in schedule {schedule.id}: {', '.join(map(str, missing))}")
+
+    employee_ids = {edit.employee_id for edit in batch.edits if edit.employee_id is not None}
+    if employee_ids:
+        known = {
+            employee_id for employee_id, in db.query(Employee.id).filter(
+                Employee.organization_id == schedule.organization_id,
+                Employee.id.in_(employee_ids)
+            )
+        }
+        unknown = sorted(employee_ids - known)
+        if unknown:
+            raise ValueError(f"Employees not found in the organization: {', '.join(map(str, unknown))}")
+
+    positions = {edit.shift_position for edit in batch.edits if edit.shift_position is not None}
+    if positions:
+        shifts_per_day = get_shifts_per_day(db, schedule)
+        invalid = sorted(position for position in positions if position > shifts_per_day)
+        if invalid:
+            raise ValueError(
+                f"Shift positions must be between 1 and {shifts_per_day}: {', '.join(map(str, invalid))}"
+            )
+
+    changed = {}
+    for edit in batch.edits:
+        changed[edit.assignment_id] = {
+            **current[edit.assignment_id],
+            **edit.model_dump(exclude={"assignment_id"}, exclude_unset=True),
+        }
+    for swap in batch.swaps:
+        first, second = current[swap.assignment_id], current[swap.other_assignment_id]
+        changed[swap.assignment_id] = {**first, "employee_id": second["employee_id"]}
+        changed[swap.other_assignment_id] = {**second, "employee_id": first["employee_id"]}
+    for assignment_id, values in changed.items():
+        # An explicit null in an edit leaves the column unchanged, except for notes
+        for field in ("employee_id", "shift_position"):
+            if values[field] is None:
+                values[field] = current[assignment_id][field]
+    validate_assignment_changes(db, schedule, changed, current, dates)
+
+    db.execute(
+        update(ScheduleAssignment),
+        [{"id": assignment_id, **values, "is_manual_override": True} for assignment_id, values in changed.items()]
+    )
+    schedule_stats.record_assignment_changes(
+        db, schedule.id,
+        removed=[(current[assignment_id]["employee_id"], current[assignment_id]["shift_position"]) for assignment_id in changed],
+        added=[(values["employee_id"], values["shift_position"]) for values in changed.values()]
+    )
+    touch_schedule(db, schedule.id)
+    db.commit()
+
+    return db.query(ScheduleAssignment).filter(
+        ScheduleAssignment.id.in_(ids)
+    ).order_by(ScheduleAssignment.id).all()
+
+
+def validate_assignment_changes(
+    db: Session,
+    schedule: Schedule,
+    changed: Dict[int, Dict[str, Any]],
+    current: Dict[int, Dict[str, Any]],
+    dates: Dict[int, Any]
+):
+    """Check the employees of changed assignments against activity, leave and double booking
+
+    changed and current map assignment ids to their new and old values, dates to their
+    date. The new values are checked together with the other assignments of their dates.
+    Raises ValueError naming the first problem found.
+    """
+    moved = {
+        assignment_id: values["employee_id"] for assignment_id, values in changed.items()
+        if values["employee_id"] != current[assignment_id]["employee_id"]
+    }
+    if moved:
+        inactive = sorted({
+            employee_id for employee_id, in db.query(Employee.id).filter(
+                Employee.id.in_(set(moved.values())),
+                Employee.is_active != True
+            )
+        })
+        if inactive:
+            raise ValueError(f"Employees are inactive: {', '.join(map(str, inactive))}")
+
+        moved_dates = [dates[assignment_id] for assignment_id in moved]
+        leave_index = load_leave_index(db, schedule.organization_id, min(moved_dates), max(moved_dates))
+        for assignment_id, employee_id in sorted(moved.items()):
+            if leave_index.is_on_leave(employee_id, dates[assignment_id]):
+                raise ValueError(f"Employee {employee_id} is on leave on {dates[assignment_id].isoformat()}")
+
+    # Every assignment of the changed dates, with the batch applied
+    employees_by_date: Dict[Any, Dict[int, int]] = {}
+    for assignment_id, employee_id, assignment_date in db.query(
+        ScheduleAssignment.id, ScheduleAssignment.employee_id, ScheduleAssignment.date
+    ).filter(
+        ScheduleAssignment.schedule_id == schedule.id,
+        ScheduleAssignment.date.in_({dates[assignment_id] for assignment_id in changed})
+    ):
+        if assignment_id in changed:
+            employee_id = changed[assignment_id]["employee_id"]
+        employees_by_date.setdefault(assignment_date, {})[assignment_id] = employee_id
+    for assignment_date in sorted(employees_by_date):
+        working = set()
+        for employee_id in employees_by_date[assignment_date].values():
+            if employee_id in working:
+                raise ValueError(
+                    f"Employee {employee_id} would have more than one shift on {assignment_date.isoformat()}"
+                )
+            working.add(employee_id)
+
+
 def delete_schedule_assignment(db: Session, assignment_id: int):
     db_assignment = db.query(ScheduleAssignment).filter(ScheduleAssignment.id == assignment_id).first()
     if db_assignment:
+        schedule_stats.record_assignment_changes(
+            db, db_assignment.schedule_id, removed=[(db_assignment.employee_id, db_assignment.shift_position)]
+        )
+        touch_schedule(db, db_assignment.schedule_id)
         db.delete(db_assignment)
         db.commit()
     return db_assignment
@@ -84,6 +401,26 @@ def get_assignments_by_schedule(db: Session, schedule_id: int):
     return db.query(ScheduleAssignment).filter(ScheduleAssignment.schedule_id == schedule_id).all()
 
 
+def iter_assignments_by_organization(db: Session, organization_id: int, start_date, end_date):
+    """Iterate over (id, schedule_id, employee_id, date, schedule status) of an organization's
+    assignments in the date range, ordered by employee and date, fetched in batches"""
+    return db.query(
+        ScheduleAssignment.id,
+        ScheduleAssignment.schedule_id,
+        ScheduleAssignment.employee_id,
+        ScheduleAssignment.date,
+        Schedule.status
+    ).join(
+        Schedule, Schedule.id == ScheduleAssignment.schedule_id
+    ).filter(
+        Schedule.organization_id == organization_id,
+        ScheduleAssignment.date >= start_date,
+        ScheduleAssignment.date <= end_date
+    ).order_by(
+        ScheduleAssignment.employee_id, ScheduleAssignment.date, ScheduleAssignment.id
+    ).yield_per(1000)
+
+
 def get_assignments_by_date_range(db: Session, schedule_id: int, start_date, end_date):
     return db.query(ScheduleAssignment).filter(
         and_(
@@ -0,0 +1,155 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
+from sqlalchemy import Select, and_, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models.employee import Employee
+from ..models.schedule import Schedule
+from ..models.schedule_assignment import ScheduleAssignment
+from ..models.schedule_employee_stat import ScheduleEmployeeStat
+
+# (employee_id, shift_position)
+StatKey = Tuple[int, int]
+
+
+def get_schedule_statistics(db: Session, schedule: Schedule) -> Dict[str, Any]:
+    """Get the shift distribution of a schedule per employee and shift position
+
+    Finalized schedules are read from their maintained statistics in O(employees); other
+    schedules are aggregated from their assignments with GROUP BY in the database.
+    """
+    rows = db.execute(statistics_statement(schedule)).all()
+    return summarize_statistics(schedule.id, rows)
+
+
+async def get_schedule_statistics_async(db: AsyncSession, schedule: Schedule) -> Dict[str, Any]:
+    """Like get_schedule_statistics, on an async session"""
+    rows = (await db.execute(statistics_statement(schedule))).all()
+    return summarize_statistics(schedule.id, rows)
+
+
+def statistics_statement(schedule: Schedule) -> Select:
+    """Select (employee name, shift position, shift count) rows for a schedule"""
+    if schedule.status == "finalized":
+        return select(
+            Employee.name, ScheduleEmployeeStat.shift_position, ScheduleEmployeeStat.shift_count
+        ).join(
+            Employee, Employee.id == ScheduleEmployeeStat.employee_id
+        ).where(
+            ScheduleEmployeeStat.schedule_id == schedule.id
+        ).order_by(ScheduleEmployeeStat.employee_id, ScheduleEmployeeStat.shift_position)
+    return select(
+        Employee.name, ScheduleAssignment.shift_position, func.count(ScheduleAssignment.id)
+    ).join(
+        Employee, Employee.id == ScheduleAssignment.employee_id
+    ).where(
+        ScheduleAssignment.schedule_id == schedule.id
+    ).group_by(
+        ScheduleAssignment.employee_id, Employee.name, ScheduleAssignment.shift_position
+    ).order_by(ScheduleAssignment.employee_id, ScheduleAssignment.shift_position)
+
+
+def summarize_statistics(schedule_id: int, rows) -> Dict[str, Any]:
+    stats = {}
+    total_assignments = 0
+    for employee_name, shift_position, shift_count in rows:
+        employee_stats = stats.setdefault(employee_name, {"total_shifts": 0, "shifts_by_position": {}})
+        employee_stats["total_shifts"] += shift_count
+        employee_stats["shifts_by_position"][shift_position] = (
+            employee_stats["shifts_by_position"].get(shift_position, 0) + shift_count
+        )
+        total_assignments += shift_count
+
+    return {
+        "schedule_id": schedule_id,
+        "total_assignments": total_assignments,
+        "employee_statistics": stats
+    }
+
+
+def rebuild_schedule_stats(db: Session, schedule_id: int):
+    """Recompute the statistics of a schedule from its assignments (not committed)"""
+    clear_schedule_stats(db, schedule_id)
+    db.execute(
+        insert(ScheduleEmployeeStat).from_select(
+            ["schedule_id", "employee_id", "shift_position", "shift_count"],
+            select(
+                ScheduleAssignment.schedule_id,
+                ScheduleAssignment.employee_id,
+                ScheduleAssignment.shift_position,
+                func.count(ScheduleAssignment.id)
+            ).where(
+                ScheduleAssignment.schedule_id == schedule_id
+            ).group_by(
+                ScheduleAssignment.schedule_id,
+                ScheduleAssignment.employee_id,
+                ScheduleAssignment.shift_position
+            )
+        )
+    )
+
+
+def clear_schedule_stats(db: Session, schedule_id: int):
+    """Drop the statistics of a schedule (not committed)"""
+    db.execute(delete(ScheduleEmployeeStat).where(ScheduleEmployeeStat.schedule_id == schedule_id))
+
+
+def update_stats_for_status(db: Session, schedule_id: int, old_status: str, new_status: str):
+    """Start or stop maintaining statistics when a schedule is finalized or reopened"""
+    if new_status == old_status:
+        return
+    if new_status == "finalized":
+        rebuild_schedule_stats(db, schedule_id)
+    elif old_status == "finalized":
+        clear_schedule_stats(db, schedule_id)
+
+
+def record_assignment_changes(
+    db: Session,
+    schedule_id: int,
+    removed: Iterable[StatKey] = (),
+    added: Iterable[StatKey] = ()
+):
+    """Apply assignment changes to the statistics of a finalized schedule (not committed)
+
+    removed and added are the (employee_id, shift_position) of assignments as they were
+    before and are after the change; an edited assignment appears in both. Does nothing
+    for schedules that are not finalized.
+    """
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    status = db.query(Schedule.status).filter(Schedule.id == schedule_id).scalar()
+    if status != "finalized":
+        return
+
+    for (employee_id, shift_position), delta in deltas.items():
+        key_filter = and_(
+            ScheduleEmployeeStat.schedule_id == schedule_id,
+            ScheduleEmployeeStat.employee_id == employee_id,
+            ScheduleEmployeeStat.shift_position == shift_position
+        )
+        result = db.execute(
+            update(ScheduleEmployeeStat).where(key_filter).values(
+                shift_count=ScheduleEmployeeStat.shift_count + delta
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount == 0 and delta > 0:
+            db.execute(insert(ScheduleEmployeeStat).values(
+                schedule_id=schedule_id,
+                employee_id=employee_id,
+                shift_position=shift_position,
+                shift_count=delta
+            ))
+
+    db.execute(
+        delete(ScheduleEmployeeStat).where(
+            ScheduleEmployeeStat.schedule_id == schedule_id,
+            ScheduleEmployeeStat.shift_count <= 0
+        ),
+        execution_options={"synchronize_session": False}
+    )
@@ -1,18 +1,30 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 import json
 from ..models.shift_pattern import ShiftPattern
 from ..schemas.shift_pattern import ShiftPatternCreate, ShiftPatternUpdate
+from ..utils.pattern_cache import pattern_cache, get_compiled_pattern
+from ..utils.pagination import paginate
 
 
 def get_shift_pattern(db: Session, shift_pattern_id: int):
     return db.query(ShiftPattern).filter(ShiftPattern.id == shift_pattern_id).first()
 
 
-def get_shift_patterns_by_organization(db: Session, organization_id: int, skip: int = 0, limit: int = 100):
+def get_shift_patterns_by_organization(db: Session, organization_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get a page of active shift patterns ordered by id, returns (shift patterns, next cursor)"""
+    query = db.query(ShiftPattern).filter(
+        ShiftPattern.organization_id == organization_id,
+        ShiftPattern.is_active == True
+    )
+    return paginate(query, [ShiftPattern.id], cursor, limit)
+
+
+def get_oldest_shift_pattern_by_organization(db: Session, organization_id: int):
     return db.query(ShiftPattern).filter(
         ShiftPattern.organization_id == organization_id,
         ShiftPattern.is_active == True
-    ).offset(skip).limit(limit).all()
+    ).order_by(ShiftPattern.id).first()
 
 
 def create_shift_pattern(db: Session, shift_pattern: ShiftPatternCreate):
@@ -40,6 +52,7 @@ def update_shift_pattern(db: Session, shift_pattern_id: int, shift_pattern: Shif
         setattr(db_shift_pattern, field, value)
     
     db.commit()
+    pattern_cache.invalidate(shift_pattern_id)
     db.refresh(db_shift_pattern)
     return db_shift_pattern
 
@@ -49,6 +62,7 @@ def delete_shift_pattern(db: Session, shift_pattern_id: int):
     if db_shift_pattern:
         db_shift_pattern.is_active = False
         db.commit()
+        pattern_cache.invalidate(shift_pattern_id)
     return db_shift_pattern
 
 
@@ -57,7 +71,7 @@ def get_shift_pattern_data(db: Session, shift_pattern_id: int):
     shift_pattern = get_shift_pattern(db, shift_pattern_id)
     if shift_pattern and shift_pattern.pattern_data:
         try:
-            return json.loads(shift_pattern.pattern_data)
-        except json.JSONDecodeError:
+            return dict(get_compiled_pattern(shift_pattern).data)
+        except ValueError:
             return {}
     return {} 
\ No newline at end of file
@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .core.config import settings
-from .core.database import engine, Base
+from .core.metrics import registry
+from .core.request_metrics import MetricsMiddleware
 from .models import *  # Import all models to register them
-from .api import auth, organizations, employees, shift_patterns, schedules, leaves
+from .api import auth, organizations, employees, shift_patterns, schedules, leaves, jobs
+from .utils.jobs import job_manager
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic migrations, run "python -m app.cli migrate" before starting
 
 # Create FastAPI app
 app = FastAPI(
@@ -22,15 +24,31 @@ app.add_middleware(
        allow_credentials=True,
        allow_methods=["*"],
        allow_headers=["*"],
+       expose_headers=["X-Next-Cursor", "Server-Timing"],
    )
 
+# Record request latency, status codes and database usage for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
+if settings.ASYNC_DATABASE_ENABLED:
+    # Registered first so these read endpoints take precedence over their sync versions,
+    # which keep documenting them
+    from .api import async_reads
+    app.include_router(async_reads.router, prefix="/api", include_in_schema=False)
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(organizations.router, prefix="/api/organizations", tags=["Organizations"])
 app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
 app.include_router(shift_patterns.router, prefix="/api/shift-patterns", tags=["Shift Patterns"])
 app.include_router(schedules.router, prefix="/api/schedules", tags=["Schedules"])
 app.include_router(leaves.router, prefix="/api/leaves", tags=["Leaves"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+
+
+@app.on_event("shutdown")
+def shutdown_job_manager():
+    # Cancel running jobs so their transactions are rolled back before exit
+    job_manager.shutdown()
 
 
 @app.get("/")
@@ -40,4 +58,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -6,6 +6,7 @@ from .employee_shift_pattern import EmployeeShiftPattern
 from .schedule import Schedule
 from .schedule_assignment import ScheduleAssignment
 from .leave import Leave
+from .schedule_employee_stat import ScheduleEmployeeStat
 
 # Import all models to ensure they are registered with SQLAlchemy
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     "EmployeeShiftPattern",
     "Schedule",
     "ScheduleAssignment",
-    "Leave"
+    "Leave",
+    "ScheduleEmployeeStat"
 ] 
\ No newline at end of file
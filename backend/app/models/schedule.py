@@ -9,6 +9,7 @@ class Schedule(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    shift_pattern_id = Column(Integer, ForeignKey("shift_patterns.id"), nullable=True)  # pattern it was generated from
     name = Column(String, nullable=False)
     year = Column(Integer, nullable=False)
     month = Column(Integer, nullable=False)
@@ -19,4 +20,8 @@ class Schedule(Base):
 
     # Relationships
     organization = relationship("Organization", back_populates="schedules")
-    assignments = relationship("ScheduleAssignment", back_populates="schedule") 
\ No newline at end of file
+    assignments = relationship(
+        "ScheduleAssignment",
+        back_populates="schedule",
+        order_by="(ScheduleAssignment.date, ScheduleAssignment.shift_position, ScheduleAssignment.id)"
+    ) 
\ No newline at end of file
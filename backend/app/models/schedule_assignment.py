@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -6,6 +6,9 @@ from ..core.database import Base
 
 class ScheduleAssignment(Base):
     __tablename__ = "schedule_assignments"
+    __table_args__ = (
+        Index("ix_schedule_assignments_schedule_id_date", "schedule_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     schedule_id = Column(Integer, ForeignKey("schedules.id"), nullable=False)
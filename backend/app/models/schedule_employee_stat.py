@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..core.database import Base
+
+
+class ScheduleEmployeeStat(Base):
+    """Number of shifts per employee and shift position of a finalized schedule
+
+    Maintained alongside the assignments so that statistics of finalized schedules are
+    read without scanning their assignments.
+    """
+    __tablename__ = "schedule_employee_stats"
+
+    schedule_id = Column(Integer, ForeignKey("schedules.id"), primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), primary_key=True)
+    shift_position = Column(Integer, primary_key=True)
+    shift_count = Column(Integer, nullable=False, default=0)
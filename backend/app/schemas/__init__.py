@@ -5,9 +5,13 @@ from .shift_pattern import ShiftPattern, ShiftPatternCreate, ShiftPatternUpdate,
 from .schedule import (
     Schedule, ScheduleCreate, ScheduleUpdate, 
     ScheduleAssignment, ScheduleAssignmentCreate, ScheduleAssignmentUpdate,
-    ScheduleWithAssignments, ScheduleGenerationRequest
+    AssignmentEdit, AssignmentSwap, ScheduleAssignmentBatch,
+    ScheduleWithAssignments, ScheduleGenerationRequest, BatchGenerationRequest,
+    ReplanRequest, GenerationStats, GeneratedSchedule, ScheduleGrid
 )
 from .leave import Leave, LeaveCreate, LeaveUpdate
+from .job import Job
+from .bulk_import import ImportRowError, ImportResult, LeaveAssignmentConflict, LeaveImportResult
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserLogin", "Token", "TokenData",
@@ -16,6 +20,10 @@ __all__ = [
     "ShiftPattern", "ShiftPatternCreate", "ShiftPatternUpdate", "PatternExample",
     "Schedule", "ScheduleCreate", "ScheduleUpdate",
     "ScheduleAssignment", "ScheduleAssignmentCreate", "ScheduleAssignmentUpdate",
-    "ScheduleWithAssignments", "ScheduleGenerationRequest",
-    "Leave", "LeaveCreate", "LeaveUpdate"
+    "AssignmentEdit", "AssignmentSwap", "ScheduleAssignmentBatch",
+    "ScheduleWithAssignments", "ScheduleGenerationRequest", "BatchGenerationRequest",
+    "ReplanRequest", "GenerationStats", "GeneratedSchedule", "ScheduleGrid",
+    "Leave", "LeaveCreate", "LeaveUpdate",
+    "Job",
+    "ImportRowError", "ImportResult", "LeaveAssignmentConflict", "LeaveImportResult"
 ] 
\ No newline at end of file
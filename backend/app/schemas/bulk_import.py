@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+
+
+class ImportRowError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError] = []  # the first 1000 rejected rows
+    errors_truncated: bool = False
+    dry_run: bool = False
+
+
+class LeaveAssignmentConflict(BaseModel):
+    line: int  # of the imported leave
+    employee_id: int
+    date: date
+    assignment_id: int
+    schedule_id: int
+    schedule_status: str
+
+
+class LeaveImportResult(ImportResult):
+    conflicts: List[LeaveAssignmentConflict] = []  # the first 1000 conflicting assignments
+    conflicts_count: int = 0
+    conflicts_truncated: bool = False
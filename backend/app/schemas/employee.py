@@ -1,6 +1,18 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
+import json
+
+
+def validate_preferences(preferences: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Check the preference keys the scheduler reads"""
+    if preferences and "preferred_shifts" in preferences:
+        shifts = preferences["preferred_shifts"]
+        if not isinstance(shifts, list) or any(
+            isinstance(shift, bool) or not isinstance(shift, int) or shift < 1 for shift in shifts
+        ):
+            raise ValueError("preferred_shifts must be a list of shift positions (integers from 1)")
+    return preferences
 
 
 class EmployeeBase(BaseModel):
@@ -13,6 +25,11 @@ class EmployeeBase(BaseModel):
 class EmployeeCreate(EmployeeBase):
     organization_id: int
 
+    @field_validator("preferences")
+    @classmethod
+    def check_preferences(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return validate_preferences(v)
+
 
 class EmployeeUpdate(BaseModel):
     name: Optional[str] = None
@@ -21,6 +38,11 @@ class EmployeeUpdate(BaseModel):
     preferences: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
 
+    @field_validator("preferences")
+    @classmethod
+    def check_preferences(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return validate_preferences(v)
+
 
 class Employee(EmployeeBase):
     id: int
@@ -29,5 +51,13 @@ class Employee(EmployeeBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    @field_validator("preferences", mode="before")
+    @classmethod
+    def parse_preferences(cls, v: Any) -> Any:
+        # Stored as a JSON string in the database
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class Job(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed, cancelled
+    phase: Optional[str] = None
+    progress: float
+    phase_timings: Dict[str, float] = {}
+    schedule_id: Optional[int] = None
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 from datetime import datetime, date
 
 
@@ -12,6 +12,7 @@ class ScheduleBase(BaseModel):
 
 class ScheduleCreate(ScheduleBase):
     organization_id: int
+    shift_pattern_id: Optional[int] = None
 
 
 class ScheduleUpdate(BaseModel):
@@ -23,6 +24,7 @@ class ScheduleUpdate(BaseModel):
 class Schedule(ScheduleBase):
     id: int
     organization_id: int
+    shift_pattern_id: Optional[int] = None
     status: str
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -49,6 +51,24 @@ class ScheduleAssignmentUpdate(BaseModel):
     is_manual_override: Optional[bool] = None
 
 
+class AssignmentEdit(BaseModel):
+    assignment_id: int
+    employee_id: Optional[int] = None
+    shift_position: Optional[int] = Field(default=None, ge=1)
+    notes: Optional[str] = None
+
+
+class AssignmentSwap(BaseModel):
+    # The two assignments exchange their employees
+    assignment_id: int
+    other_assignment_id: int
+
+
+class ScheduleAssignmentBatch(BaseModel):
+    edits: List[AssignmentEdit] = []
+    swaps: List[AssignmentSwap] = []
+
+
 class ScheduleAssignment(ScheduleAssignmentBase):
     id: int
     schedule_id: int
@@ -64,9 +84,63 @@ class ScheduleWithAssignments(Schedule):
     assignments: List[ScheduleAssignment] = []
 
 
+class ScheduleGrid(BaseModel):
+    """Compact form of a schedule's month as a days x shifts matrix
+
+    grid[day][shift] is the index into employee_ids/employee_names of the employee
+    working shift position shift + 1 on start_date + day, or -1 if nobody is assigned.
+    Assignments that do not fit a cell (a second employee on the same shift, or a date
+    outside the month) are listed in extra as [day, shift, employee index] triples, so
+    no assignment is lost. manual_overrides lists the [day, shift] cells set manually.
+    """
+    schedule_id: int
+    year: int
+    month: int
+    status: str
+    updated_at: Optional[datetime] = None
+    start_date: date
+    shifts_per_day: int
+    employee_ids: List[int] = []
+    employee_names: List[str] = []
+    grid: List[List[int]] = []
+    extra: List[List[int]] = []
+    manual_overrides: List[List[int]] = []
+
+
+class GenerationStats(BaseModel):
+    total_seconds: Optional[float] = None
+    phases: Dict[str, float] = {}  # phase -> seconds
+    counters: Dict[str, int] = {}  # queries, rows_written, candidates_evaluated, ...
+
+
+class GeneratedSchedule(Schedule):
+    generation_stats: Optional[GenerationStats] = None
+
+
 class ScheduleGenerationRequest(BaseModel):
     organization_id: int
     year: int
     month: int
     shift_pattern_id: int
-    name: Optional[str] = None 
\ No newline at end of file
+    name: Optional[str] = None
+    optimize: bool = False  # improve the generated schedule by local search
+    time_budget_seconds: float = Field(default=2.0, gt=0, le=300)
+    seed: Optional[int] = None  # fixed seed for reproducible schedules
+
+
+class BatchGenerationRequest(BaseModel):
+    organization_ids: List[int]
+    start_year: int
+    start_month: int = Field(ge=1, le=12)
+    end_year: int
+    end_month: int = Field(ge=1, le=12)
+    shift_pattern_ids: Dict[int, int] = {}  # organization id -> shift pattern id
+    optimize: bool = False
+    time_budget_seconds: float = Field(default=2.0, gt=0, le=300)
+    seed: Optional[int] = None
+
+
+class ReplanRequest(BaseModel):
+    employee_ids: List[int]  # employees who became unavailable
+    start_date: date
+    end_date: date
@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import json
+from ..utils.pattern_cache import compile_pattern_data
 
 
 class ShiftPatternBase(BaseModel):
@@ -13,6 +15,12 @@ class ShiftPatternBase(BaseModel):
 class ShiftPatternCreate(ShiftPatternBase):
     organization_id: int
 
+    @field_validator("pattern_data")
+    @classmethod
+    def validate_pattern_data(cls, v: Dict[str, Any]) -> Dict[str, Any]:
+        compile_pattern_data(v)
+        return v
+
 
 class ShiftPatternUpdate(BaseModel):
     name: Optional[str] = None
@@ -21,6 +29,13 @@ class ShiftPatternUpdate(BaseModel):
     shifts_per_day: Optional[int] = None
     is_active: Optional[bool] = None
 
+    @field_validator("pattern_data")
+    @classmethod
+    def validate_pattern_data(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if v is not None:
+            compile_pattern_data(v)
+        return v
+
 
 class ShiftPattern(ShiftPatternBase):
     id: int
@@ -29,6 +44,14 @@ class ShiftPattern(ShiftPatternBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    @field_validator("pattern_data", mode="before")
+    @classmethod
+    def parse_pattern_data(cls, v: Any) -> Any:
+        # Stored as a JSON string in the database
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
     class Config:
         from_attributes = True
 
@@ -0,0 +1,101 @@
+import json
+from typing import List, Dict, Set, Optional, Callable, Any
+from ..models.employee import Employee
+
+
+def get_preferred_shifts(employees: List[Employee]) -> Dict[int, Set[int]]:
+    """Get the preferred shift positions of each employee from their JSON preferences"""
+    preferred_shifts = {}
+    for employee in employees:
+        if not employee.preferences:
+            continue
+        try:
+            prefs = json.loads(employee.preferences)
+        except json.JSONDecodeError:
+            continue
+        shifts = prefs.get("preferred_shifts") if isinstance(prefs, dict) else None
+        if not isinstance(shifts, list):
+            continue
+        # Ignore malformed entries stored before preferences were validated
+        shifts = {shift for shift in shifts if isinstance(shift, int) and not isinstance(shift, bool)}
+        if shifts:
+            preferred_shifts[employee.id] = shifts
+    return preferred_shifts
+
+
+def solve_day_assignment(
+    employee_ids: List[int],
+    positions: List[int],
+    preferred_shifts: Dict[int, Set[int]],
+    current_positions: Optional[Dict[int, int]] = None,
+    fill_rank: Optional[Callable[[int, int], Any]] = None
+) -> Dict[int, int]:
+    """Assign the employees working on a day to shift positions, maximizing satisfied preferences
+
+    Every employee gets a distinct position (there must be at least as many positions as
+    employees). With 0/1 preference weights the optimal assignment is a maximum bipartite
+    matching over the "prefers" edges, found with augmenting paths in O(V * E); the
+    remaining employees then fill the free positions. Employees keep their current position
+    whenever that does not cost a satisfied preference, so re-solving is stable.
+    fill_rank(employee_id, position), if given, orders the free positions offered to an
+    employee left without a preferred one (lowest first), e.g. to balance positions.
+
+    Returns a mapping of employee id to position.
+    """
+    current_positions = current_positions or {}
+    edges = {
+        employee_id: [p for p in positions if p in preferred_shifts.get(employee_id, ())]
+        for employee_id in employee_ids
+    }
+
+    # position -> employee id
+    matched: Dict[int, int] = {}
+
+    def augment(employee_id: int, visited: Set[int]) -> bool:
+        for position in edges[employee_id]:
+            if position in visited:
+                continue
+            visited.add(position)
+            holder = matched.get(position)
+            if holder is None or augment(holder, visited):
+                matched[position] = employee_id
+                return True
+        return False
+
+    # Warm start with employees already sitting on a preferred position
+    for employee_id in employee_ids:
+        position = current_positions.get(employee_id)
+        if position in edges[employee_id] and position not in matched:
+            matched[position] = employee_id
+
+    warm_started = set(matched.values())
+    for employee_id in employee_ids:
+        if edges[employee_id] and employee_id not in warm_started:
+            augment(employee_id, set())
+
+    assignment = {employee_id: position for position, employee_id in matched.items()}
+
+    # Fill the remaining positions, keeping current positions where possible
+    unassigned = [employee_id for employee_id in employee_ids if employee_id not in assignment]
+    free_positions = {p for p in positions if p not in matched}
+    leftover = []
+    for employee_id in unassigned:
+        position = current_positions.get(employee_id)
+        if position in free_positions:
+            assignment[employee_id] = position
+            free_positions.discard(position)
+        else:
+            leftover.append(employee_id)
+    remaining_positions = [p for p in positions if p in free_positions]
+    if fill_rank is None:
+        for employee_id, position in zip(leftover, remaining_positions):
+            assignment[employee_id] = position
+    else:
+        for employee_id in leftover:
+            if not remaining_positions:
+                break
+            position = min(remaining_positions, key=lambda p: fill_rank(employee_id, p))
+            assignment[employee_id] = position
+            remaining_positions.remove(position)
+
+    return assignment
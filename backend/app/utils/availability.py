@@ -0,0 +1,71 @@
+import numpy as np
+from datetime import date, timedelta
+from typing import List, Sequence
+from .leave_index import LeaveIndex
+from .pattern_cache import CompiledPattern
+
+
+def get_date_range(start_date: date, end_date: date) -> List[date]:
+    """Get all dates between start_date and end_date (inclusive)"""
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def build_pattern_mask(start_date: date, end_date: date, pattern: CompiledPattern) -> np.ndarray:
+    """Build a boolean vector of the days in the range on which the pattern says to work
+
+    Vectorized equivalent of CompiledPattern.works_on over the whole range.
+    """
+    days = np.arange(
+        np.datetime64(start_date, "D"), np.datetime64(end_date + timedelta(days=1), "D")
+    )
+
+    # Position in cycle is counted from the start of each day's year
+    year_starts = days.astype("datetime64[Y]").astype("datetime64[D]")
+    days_since_reference = (days - year_starts).astype(np.int64)
+    cycle_table = np.array(pattern.cycle_table, dtype=bool)
+    mask = cycle_table[days_since_reference % pattern.cycle_length]
+
+    if pattern.skip_weekends:
+        # 1970-01-01 was a Thursday, shift so that Monday == 0
+        weekdays = (days.astype(np.int64) + 3) % 7
+        mask &= weekdays < 5
+
+    return mask
+
+
+def build_leave_mask(
+    employee_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+    leave_index: LeaveIndex
+) -> np.ndarray:
+    """Build an employees x days boolean matrix that is True where the employee is on leave"""
+    num_days = (end_date - start_date).days + 1
+    mask = np.zeros((len(employee_ids), num_days), dtype=bool)
+
+    for row, employee_id in enumerate(employee_ids):
+        for leave_start, leave_end in leave_index.intervals_for(employee_id):
+            if leave_end < start_date or leave_start > end_date:
+                continue
+            first = max((leave_start - start_date).days, 0)
+            last = min((leave_end - start_date).days, num_days - 1)
+            mask[row, first:last + 1] = True
+
+    return mask
+
+
+def build_availability_matrix(
+    employee_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+    pattern: CompiledPattern,
+    leave_index: LeaveIndex
+) -> np.ndarray:
+    """Build an employees x days boolean matrix of who is available to work on which day
+
+    Combines the rotation pattern, skip_weekends and the leave mask for the whole date
+    range in one shot. Row order follows employee_ids, column 0 is start_date.
+    """
+    pattern_mask = build_pattern_mask(start_date, end_date, pattern)
+    leave_mask = build_leave_mask(employee_ids, start_date, end_date, leave_index)
+    return pattern_mask[np.newaxis, :] & ~leave_mask
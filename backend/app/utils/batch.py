@@ -0,0 +1,159 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..crud import employee as employee_crud, shift_pattern as shift_pattern_crud
+from .scheduler import generate_schedule
+from .generation_stats import GenerationStats
+
+
+def iter_months(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Get all (year, month) pairs from start to end (inclusive)"""
+    start_year, start_month = start
+    end_year, end_month = end
+    for month in (start_month, end_month):
+        if not 1 <= month <= 12:
+            raise ValueError(f"Invalid month: {month}")
+    if (start_year, start_month) > (end_year, end_month):
+        raise ValueError("Start month must not be after end month")
+
+    months = []
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def generate_schedule_for_organization_month(
+    organization_id: int,
+    year: int,
+    month: int,
+    shift_pattern_id: Optional[int] = None,
+    optimize: bool = False,
+    time_budget: float = 2.0,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Generate one organization's schedule for one month with a dedicated session
+
+    Runs inside a worker process. Without a shift_pattern_id the organization's oldest
+    active shift pattern is used; an invalid pattern skips the month. Never raises, the
+    outcome is reported in the result.
+    """
+    result = {
+        "organization_id": organization_id,
+        "year": year,
+        "month": month,
+        "status": "succeeded",
+        "schedule_id": None,
+        "assignments": 0,
+        "error": None,
+        "generation_stats": None,
+    }
+    started = time.perf_counter()
+    stats = GenerationStats()
+    db = SessionLocal()
+    try:
+        if shift_pattern_id is not None:
+            shift_pattern = shift_pattern_crud.get_shift_pattern(db, shift_pattern_id)
+        else:
+            shift_pattern = shift_pattern_crud.get_oldest_shift_pattern_by_organization(db, organization_id)
+
+        with stats.collecting(), stats.phase("load_employees"):
+            employees = list(employee_crud.iter_employees_by_organization(db, organization_id))
+        if not shift_pattern or shift_pattern.organization_id != organization_id:
+            result.update(status="skipped", error="Shift pattern not found")
+        elif not employees:
+            result.update(status="skipped", error="No employees found for organization")
+        else:
+            schedule = generate_schedule(
+                db=db,
+                organization_id=organization_id,
+                year=year,
+                month=month,
+                shift_pattern=shift_pattern,
+                employees=employees,
+                name=f"Schedule {year}-{month:02d}",
+                optimize=optimize,
+                time_budget=time_budget,
+                seed=seed,
+                stats=stats
+            )
+            result["schedule_id"] = schedule.id
+            result["assignments"] = stats.counters["rows_written"]
+            result["generation_stats"] = stats.as_dict()
+    except ValueError as exc:
+        # Invalid input such as a shift pattern stored before its validation existed
+        result.update(status="skipped", error=str(exc))
+    except Exception as exc:
+        result.update(status="failed", error=str(exc) or exc.__class__.__name__)
+    finally:
+        db.close()
+
+    result["elapsed_seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_batch_generation(
+    organization_ids: List[int],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    shift_pattern_ids: Optional[Dict[int, int]] = None,
+    optimize: bool = False,
+    time_budget: float = 2.0,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[str, float], None]] = None
+) -> Dict[str, Any]:
+    """Generate schedules for every organization and month in the range on a process pool
+
+    Every (organization, month) pair is an independent task with its own process-local
+    database session. Returns a summary with one result per task. An exception raised
+    from progress_callback cancels the tasks that have not started yet and is re-raised.
+    """
+    months = iter_months(start, end)
+    shift_pattern_ids = shift_pattern_ids or {}
+    tasks = [
+        (organization_id, year, month)
+        for organization_id in dict.fromkeys(organization_ids)
+        for year, month in months
+    ]
+
+    started = time.perf_counter()
+    results = []
+    if tasks:
+        # Spawned workers do not inherit the parent's connection pool or threads
+        executor = ProcessPoolExecutor(
+            max_workers=min(max_workers or settings.BATCH_WORKERS or multiprocessing.cpu_count(), len(tasks)),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            futures = [
+                executor.submit(
+                    generate_schedule_for_organization_month,
+                    organization_id, year, month,
+                    shift_pattern_ids.get(organization_id), optimize, time_budget, seed
+                )
+                for organization_id, year, month in tasks
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress_callback is not None:
+                    progress_callback("generating", len(results) / len(tasks))
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    results.sort(key=lambda item: (item["organization_id"], item["year"], item["month"]))
+    return {
+        "total": len(results),
+        "succeeded": sum(1 for item in results if item["status"] == "succeeded"),
+        "skipped": sum(1 for item in results if item["status"] == "skipped"),
+        "failed": sum(1 for item in results if item["status"] == "failed"),
+        "assignments": sum(item["assignments"] for item in results),
+        "elapsed_seconds": time.perf_counter() - started,
+        "results": results,
+    }
@@ -0,0 +1,471 @@
+import csv
+import io
+import json
+from bisect import bisect_right
+from datetime import date
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..crud import leave as leave_crud, schedule as schedule_crud
+from ..models.employee import Employee
+from ..models.leave import Leave
+from ..schemas.employee import EmployeeCreate
+from ..schemas.leave import LeaveCreate
+
+# Rows validated and written per statement
+IMPORT_BATCH_SIZE = 1000
+
+# Rejected rows listed in the report, later ones are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# Import formats by file extension and media type
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# (line number, fields, None), or (line number, None, error message) for unreadable records
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+EMPLOYEE_COLUMNS = ("organization_id", "name", "email", "phone", "is_active", "preferences")
+
+LEAVE_COLUMNS = ("employee_id", "start_date", "end_date", "reason", "notes", "is_active")
+
+# (line, employee_id, start_date, end_date)
+LeaveInterval = Tuple[int, int, date, date]
+
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """Get "csv" or "ndjson" from an upload's file name or media type
+
+    Raises ValueError if neither identifies a supported format.
+    """
+    if filename:
+        extension = filename[filename.rfind("."):].lower() if "." in filename else ""
+        if extension in IMPORT_FORMATS:
+            return IMPORT_FORMATS[extension]
+    if content_type:
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in IMPORT_FORMATS:
+            return IMPORT_FORMATS[media_type]
+    raise ValueError("Unsupported file format, upload a .csv or .ndjson file")
+
+
+def iter_records(stream: BinaryIO, import_format: str, required_columns: Sequence[str] = ()) -> Iterator[Record]:
+    """Read records one by one from a binary stream, without loading the whole file
+
+    Raises ValueError while iterating if the file cannot be read any further.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if import_format == "csv":
+        return iter_csv_records(text, required_columns)
+    return iter_ndjson_records(text)
+
+
+def iter_csv_records(text: Iterable[str], required_columns: Sequence[str] = ()) -> Iterator[Record]:
+    """Read CSV rows with a header line as dicts, empty cells become None"""
+    reader = csv.DictReader(text)
+    try:
+        header = [column.strip() for column in reader.fieldnames or ()]
+        missing = [column for column in required_columns if column not in header]
+        if missing:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+        for row in reader:
+            fields = {
+                key.strip(): (value.strip() or None) if isinstance(value, str) else value
+                for key, value in row.items() if key
+            }
+            yield reader.line_num, fields, None
+    except csv.Error as exc:
+        raise ValueError(f"Malformed CSV at line {reader.line_num}: {exc}")
+    except UnicodeDecodeError:
+        raise ValueError(f"File is not UTF-8 encoded (after line {reader.line_num})")
+
+
+def iter_ndjson_records(text: Iterable[str]) -> Iterator[Record]:
+    """Read one JSON object per line, blank lines are skipped"""
+    line_number = 0
+    lines = iter(text)
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            raise ValueError(f"File is not UTF-8 encoded (after line {line_number})")
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(fields, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, fields, None
+
+
+def validation_messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+
+class ImportReport:
+    """Counts of an import and the first MAX_REPORTED_ERRORS rejected rows"""
+
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def reject(self, line: int, messages: Sequence[str]):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": list(messages)})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def validate_records(
+    records: Iterable[Record],
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+    report: ImportReport
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield the line and row of each valid record
+
+    to_row turns the fields of a record into the column values of a row, raising
+    ValidationError or ValueError for invalid records, which are added to the report.
+    """
+    for line, fields, error in records:
+        if error is not None:
+            report.reject(line, [error])
+            continue
+        try:
+            yield line, to_row(fields)
+        except ValidationError as exc:
+            report.reject(line, validation_messages(exc))
+        except ValueError as exc:
+            report.reject(line, [str(exc)])
+
+
+def run_import(
+    db: Session,
+    records: Iterable[Record],
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+    write_batch: Callable[[Session, List[Dict[str, Any]]], None],
+    report: ImportReport,
+    batch_size: int = IMPORT_BATCH_SIZE
+):
+    """Validate records batch by batch and write the valid rows (not committed)
+
+    See validate_records for to_row. Only one batch of rows is held in memory at a time.
+    """
+    rows = validate_records(records, to_row, report)
+    while True:
+        batch = [row for _, row in islice(rows, batch_size)]
+        if not batch:
+            return
+        write_batch(db, batch)
+        report.imported += len(batch)
+
+
+def copy_rows(db: Session, table: str, columns: Sequence[str], rows: List[Dict[str, Any]]) -> bool:
+    """Write rows with COPY if the session is connected to PostgreSQL through psycopg2
+
+    Returns False, without writing anything, on other databases. Empty strings and None
+    are both written as NULL.
+    """
+    connection = db.connection()
+    if connection.dialect.name != "postgresql" or connection.dialect.driver != "psycopg2":
+        return False
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    return True
+
+
+def employee_row(organization_id: int) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    def to_row(fields: Dict[str, Any]) -> Dict[str, Any]:
+        fields = dict(fields, organization_id=organization_id)
+        if isinstance(fields.get("preferences"), str):
+            # CSV cells hold preferences as JSON text
+            try:
+                fields["preferences"] = json.loads(fields["preferences"])
+            except json.JSONDecodeError:
+                raise ValueError("preferences: Invalid JSON")
+        employee = EmployeeCreate.model_validate(fields)
+        if not employee.name.strip():
+            raise ValueError("name: Must not be empty")
+        return {
+            "organization_id": organization_id,
+            "name": employee.name.strip(),
+            "email": employee.email,
+            "phone": employee.phone or None,
+            "is_active": True,
+            "preferences": json.dumps(employee.preferences) if employee.preferences else None,
+        }
+    return to_row
+
+
+def write_employee_batch(db: Session, rows: List[Dict[str, Any]]):
+    if not copy_rows(db, Employee.__tablename__, EMPLOYEE_COLUMNS, rows):
+        db.execute(insert(Employee), rows)
+
+
+def import_employees(
+    db: Session,
+    organization_id: int,
+    records: Iterable[Record],
+    dry_run: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> Dict[str, Any]:
+    """Create an organization's employees from records in one transaction
+
+    Invalid rows are skipped and reported with their line number, all valid rows are
+    imported. With dry_run the rows are validated and written, then rolled back.
+    """
+    report = ImportReport()
+    try:
+        run_import(db, records, employee_row(organization_id), write_employee_batch, report, batch_size)
+    except BaseException:
+        db.rollback()
+        raise
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return {**report.as_dict(), "dry_run": dry_run}
+
+
+def leave_row(
+    employee_ids: Dict[int, None],
+    employee_ids_by_email: Dict[str, Optional[int]]
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    def to_row(fields: Dict[str, Any]) -> Dict[str, Any]:
+        fields = dict(fields)
+        email = fields.pop("employee_email", None)
+        if fields.get("employee_id") is None:
+            if not email or not isinstance(email, str):
+                raise ValueError("employee_id or employee_email is required")
+            if email.strip().lower() not in employee_ids_by_email:
+                raise ValueError(f"employee_email: No employee with e-mail {email} in this organization")
+            # Ambiguous e-mails map to None
+            fields["employee_id"] = employee_ids_by_email[email.strip().lower()]
+            if fields["employee_id"] is None:
+                raise ValueError(f"employee_email: Several employees have the e-mail {email}, use employee_id")
+        leave = LeaveCreate.model_validate(fields)
+        if leave.employee_id not in employee_ids:
+            raise ValueError(f"employee_id: No employee {leave.employee_id} in this organization")
+        if leave.end_date < leave.start_date:
+            raise ValueError("end_date: Must not be before start_date")
+        return {
+            "employee_id": leave.employee_id,
+            "start_date": leave.start_date,
+            "end_date": leave.end_date,
+            "reason": leave.reason or None,
+            "notes": leave.notes or None,
+            "is_active": True,
+        }
+    return to_row
+
+
+def find_leave_overlaps(
+    new_leaves: Iterable[LeaveInterval],
+    existing_leaves: Iterable[Tuple[int, int, date, date]]
+) -> Dict[int, str]:
+    """Find imported leaves that duplicate or overlap existing leaves or each other
+
+    new_leaves are (line, employee_id, start_date, end_date) and existing_leaves
+    (leave id, employee_id, start_date, end_date). A new leave is rejected if it overlaps
+    an existing leave, or else an accepted new leave that starts earlier (or on the
+    same day with an earlier line). Both lists are sorted once and then swept in a
+    single pass with one binary search per new leave, O(n log n) overall. Returns the
+    reason for every rejected line.
+    """
+    # Per employee the existing starts in order, and for each prefix the leave reaching furthest
+    existing_starts: Dict[int, List[date]] = {}
+    existing_reach: Dict[int, List[Tuple[date, int, date]]] = {}
+    existing_exact: Dict[Tuple[int, date, date], int] = {}
+    for leave_id, employee_id, start_date, end_date in sorted(existing_leaves, key=lambda leave: (leave[1], leave[2])):
+        starts = existing_starts.setdefault(employee_id, [])
+        reach = existing_reach.setdefault(employee_id, [])
+        starts.append(start_date)
+        if reach and reach[-1][0] >= end_date:
+            reach.append(reach[-1])
+        else:
+            reach.append((end_date, leave_id, start_date))
+        existing_exact.setdefault((employee_id, start_date, end_date), leave_id)
+
+    rejected: Dict[int, str] = {}
+    # Accepted new leaves of an employee never overlap, so only the last one can overlap the next
+    last_accepted: Optional[LeaveInterval] = None
+    for leave in sorted(new_leaves, key=lambda leave: (leave[1], leave[2], leave[3], leave[0])):
+        line, employee_id, start_date, end_date = leave
+        if last_accepted is not None and last_accepted[1] != employee_id:
+            last_accepted = None
+
+        duplicate_id = existing_exact.get((employee_id, start_date, end_date))
+        if duplicate_id is not None:
+            rejected[line] = f"Duplicate of leave {duplicate_id}"
+            continue
+        starts = existing_starts.get(employee_id)
+        if starts:
+            position = bisect_right(starts, end_date) - 1
+            if position >= 0 and existing_reach[employee_id][position][0] >= start_date:
+                reach_end, leave_id, reach_start = existing_reach[employee_id][position]
+                rejected[line] = f"Overlaps leave {leave_id} ({reach_start} to {reach_end})"
+                continue
+
+        if last_accepted is not None and start_date <= last_accepted[3]:
+            if (start_date, end_date) == (last_accepted[2], last_accepted[3]):
+                rejected[line] = f"Duplicate of line {last_accepted[0]}"
+            else:
+                rejected[line] = f"Overlaps line {last_accepted[0]} ({last_accepted[2]} to {last_accepted[3]})"
+            continue
+        last_accepted = leave
+    return rejected
+
+
+def find_assignment_conflicts(
+    db: Session,
+    organization_id: int,
+    leaves: List[LeaveInterval],
+    conflicts: List[Dict[str, Any]]
+) -> int:
+    """Find schedule assignments falling on the new leaves and return their number
+
+    leaves must not overlap per employee. The organization's assignments in the leaves'
+    date range are streamed in (employee, date) order and merged with the leaves sorted
+    the same way. The first MAX_REPORTED_ERRORS conflicts are appended to conflicts.
+    """
+    if not leaves:
+        return 0
+    leaves = sorted(leaves, key=lambda leave: (leave[1], leave[2]))
+    start_date = min(leave[2] for leave in leaves)
+    end_date = max(leave[3] for leave in leaves)
+
+    count = 0
+    position = 0
+    for assignment_id, schedule_id, employee_id, assignment_date, status in schedule_crud.iter_assignments_by_organization(
+        db, organization_id, start_date, end_date
+    ):
+        # Skip leaves of earlier employees, or that ended before this assignment
+        while position < len(leaves) and (leaves[position][1], leaves[position][3]) < (employee_id, assignment_date):
+            position += 1
+        if position == len(leaves):
+            break
+        line, leave_employee_id, leave_start, leave_end = leaves[position]
+        if leave_employee_id != employee_id or leave_start > assignment_date:
+            continue
+        count += 1
+        if len(conflicts) < MAX_REPORTED_ERRORS:
+            conflicts.append({
+                "line": line,
+                "employee_id": employee_id,
+                "date": assignment_date,
+                "assignment_id": assignment_id,
+                "schedule_id": schedule_id,
+                "schedule_status": status,
+            })
+    return count
+
+
+def write_leave_batch(db: Session, rows: List[Dict[str, Any]]):
+    if not copy_rows(db, Leave.__tablename__, LEAVE_COLUMNS, rows):
+        db.execute(insert(Leave), rows)
+
+
+def import_leaves(
+    db: Session,
+    organization_id: int,
+    records: Iterable[Record],
+    dry_run: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> Dict[str, Any]:
+    """Create leaves of an organization's employees from records in one transaction
+
+    Employees are given by employee_id or employee_email. Rows are validated while the
+    file is read; invalid rows and rows that duplicate or overlap another leave (see
+    find_leave_overlaps) are skipped and reported. The accepted leaves are inserted in
+    batches. The report also lists the schedule assignments that fall on the new leaves.
+    Schedules are not changed; draft schedules can be re-planned afterwards. With
+    dry_run nothing is committed.
+    """
+    report = ImportReport()
+    employee_ids: Dict[int, None] = {}
+    employee_ids_by_email: Dict[str, Optional[int]] = {}
+    for employee_id, email in db.query(Employee.id, Employee.email).filter(Employee.organization_id == organization_id):
+        employee_ids[employee_id] = None
+        if email:
+            key = email.lower()
+            employee_ids_by_email[key] = None if key in employee_ids_by_email else employee_id
+
+    # Overlaps can only be decided once every row is known, so the validated rows are kept
+    rows = dict(validate_records(records, leave_row(employee_ids, employee_ids_by_email), report))
+
+    conflicts: List[Dict[str, Any]] = []
+    conflicts_count = 0
+    try:
+        if rows:
+            new_leaves = [(line, row["employee_id"], row["start_date"], row["end_date"]) for line, row in rows.items()]
+            existing_leaves = leave_crud.get_active_leave_intervals_by_organization(
+                db, organization_id,
+                min(leave[2] for leave in new_leaves), max(leave[3] for leave in new_leaves),
+                with_ids=True
+            )
+            rejected = find_leave_overlaps(new_leaves, existing_leaves)
+            for line in sorted(rejected):
+                report.reject(line, [rejected[line]])
+                del rows[line]
+
+            accepted = iter(sorted(rows))
+            while True:
+                batch = [rows[line] for line in islice(accepted, batch_size)]
+                if not batch:
+                    break
+                write_leave_batch(db, batch)
+                report.imported += len(batch)
+
+            conflicts_count = find_assignment_conflicts(
+                db, organization_id,
+                [(line, row["employee_id"], row["start_date"], row["end_date"]) for line, row in rows.items()],
+                conflicts
+            )
+    except BaseException:
+        db.rollback()
+        raise
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+    # Rows failing validation and overlapping rows in line order
+    report.errors.sort(key=lambda error: error["line"])
+    return {
+        **report.as_dict(),
+        "dry_run": dry_run,
+        "conflicts": conflicts,
+        "conflicts_count": conflicts_count,
+        "conflicts_truncated": conflicts_count > len(conflicts),
+    }
+
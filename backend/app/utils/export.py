@@ -1,130 +1,51 @@
-import pandas as pd
+import importlib
+import threading
 from datetime import datetime
-from typing import List
-from fastapi.responses import StreamingResponse
-import io
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+from typing import Any, Callable, Dict, Iterator, Tuple
+from ..models.schedule import Schedule
 from ..schemas.schedule import ScheduleWithAssignments
 
+# Module (relative to this package) and function rendering each export format. A backend
+# is only imported on the first export in its format; reportlab alone takes about a
+# tenth of a second and tens of MB per process.
+EXPORT_BACKENDS: Dict[str, Tuple[str, str]] = {
+    "excel": (".export_excel", "stream_schedule_excel"),
+    "pdf": (".export_pdf", "render_schedule_pdf"),
+}
 
-def export_schedule_to_excel(schedule: ScheduleWithAssignments):
-    """Export schedule to Excel format"""
-    
-    # Create a DataFrame for the schedule
-    data = []
-    headers = ["Date", "Employee", "Shift Position", "Notes"]
-    
-    for assignment in schedule.assignments:
-        data.append([
-            assignment.date.strftime("%Y-%m-%d"),
-            assignment.employee.name,
-            f"Shift {assignment.shift_position}",
-            assignment.notes or ""
-        ])
-    
-    df = pd.DataFrame(data, columns=headers)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=f"Schedule {schedule.year}-{schedule.month:02d}", index=False)
-    
-    output.seek(0)
-    
-    # Return streaming response
-    return StreamingResponse(
-        io.BytesIO(output.getvalue()),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=schedule_{schedule.year}_{schedule.month:02d}.xlsx"
-        }
-    )
+_renderers: Dict[str, Callable[..., Any]] = {}
+_renderers_lock = threading.Lock()
 
 
-def export_schedule_to_pdf(schedule: ScheduleWithAssignments):
-    """Export schedule to PDF format"""
-    
-    # Create PDF in memory
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=30
-    )
-    
-    # Add title
-    title = Paragraph(f"Schedule: {schedule.name}", title_style)
-    elements.append(title)
-    
-    # Add schedule info
-    info_text = f"Year: {schedule.year}, Month: {schedule.month}, Status: {schedule.status}"
-    info_para = Paragraph(info_text, styles['Normal'])
-    elements.append(info_para)
-    elements.append(Spacer(1, 20))
-    
-    # Group assignments by date
-    assignments_by_date = {}
-    for assignment in schedule.assignments:
-        date_str = assignment.date.strftime("%Y-%m-%d")
-        if date_str not in assignments_by_date:
-            assignments_by_date[date_str] = []
-        assignments_by_date[date_str].append(assignment)
-    
-    # Create table for each date
-    for date_str in sorted(assignments_by_date.keys()):
-        # Date header
-        date_header = Paragraph(f"Date: {date_str}", styles['Heading2'])
-        elements.append(date_header)
-        elements.append(Spacer(1, 10))
-        
-        # Create table for this date
-        table_data = [["Employee", "Shift Position", "Notes"]]
-        
-        for assignment in assignments_by_date[date_str]:
-            table_data.append([
-                assignment.employee.name,
-                f"Shift {assignment.shift_position}",
-                assignment.notes or ""
-            ])
-        
-        # Create table
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 20))
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    
-    # Return streaming response
-    return StreamingResponse(
-        io.BytesIO(buffer.getvalue()),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=schedule_{schedule.year}_{schedule.month:02d}.pdf"
-        }
-    )
+def register_export_backend(export_format: str, module: str, function: str):
+    """Add or replace the backend of an export format; module may be relative to this package"""
+    with _renderers_lock:
+        EXPORT_BACKENDS[export_format] = (module, function)
+        _renderers.pop(export_format, None)
+
+
+def get_renderer(export_format: str) -> Callable[..., Any]:
+    """Get the render function of an export format, importing its backend on first use"""
+    renderer = _renderers.get(export_format)
+    if renderer is not None:
+        return renderer
+    with _renderers_lock:
+        if export_format not in _renderers:
+            if export_format not in EXPORT_BACKENDS:
+                raise ValueError(f"Unknown export format: {export_format}")
+            module, function = EXPORT_BACKENDS[export_format]
+            _renderers[export_format] = getattr(importlib.import_module(module, __package__), function)
+        return _renderers[export_format]
+
+
+def stream_schedule_excel(schedule: Schedule) -> Iterator[bytes]:
+    """Stream a schedule as an Excel workbook; its assignments need not be loaded"""
+    return get_renderer("excel")(schedule)
+
+
+def render_schedule_pdf(schedule: ScheduleWithAssignments) -> bytes:
+    """Render a schedule with its loaded assignments as a PDF document"""
+    return get_renderer("pdf")(schedule)
 
 
 def create_monthly_calendar_view(schedule: ScheduleWithAssignments):
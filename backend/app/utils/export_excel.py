@@ -0,0 +1,85 @@
+from typing import Any, Iterator, List
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..core.database import SessionLocal
+from ..models.employee import Employee
+from ..models.schedule import Schedule
+from ..models.schedule_assignment import ScheduleAssignment
+from .xlsx import stream_xlsx
+
+# Assignment rows fetched per round trip, through a server-side cursor on PostgreSQL
+EXPORT_FETCH_SIZE = 1000
+
+
+def stream_schedule_excel(schedule: Schedule) -> Iterator[bytes]:
+    """Stream a schedule as an Excel workbook
+
+    The first sheet lists the assignments by date, the second the shifts of each
+    employee per shift position. Assignments are read in batches and written as they
+    arrive, so memory use does not grow with the schedule. The workbook is read on a
+    session of its own, as the stream outlives the request's session.
+    """
+    return _stream_workbook(schedule.id, f"Schedule {schedule.year}-{schedule.month:02d}")
+
+
+def _stream_workbook(schedule_id: int, title: str) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        yield from stream_xlsx([
+            (title, assignment_rows(db, schedule_id)),
+            ("By employee", employee_pivot_rows(db, schedule_id)),
+        ])
+    finally:
+        db.close()
+
+
+def assignment_rows(db: Session, schedule_id: int) -> Iterator[List[Any]]:
+    yield ["Date", "Employee", "Shift Position", "Notes"]
+    rows = db.execute(
+        select(
+            ScheduleAssignment.date, Employee.name, ScheduleAssignment.shift_position, ScheduleAssignment.notes
+        ).join(
+            Employee, Employee.id == ScheduleAssignment.employee_id
+        ).where(
+            ScheduleAssignment.schedule_id == schedule_id
+        ).order_by(
+            ScheduleAssignment.date, ScheduleAssignment.shift_position, ScheduleAssignment.id
+        ).execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+    for assignment_date, employee_name, shift_position, notes in rows:
+        yield [assignment_date.strftime("%Y-%m-%d"), employee_name, f"Shift {shift_position}", notes or ""]
+
+
+def employee_pivot_rows(db: Session, schedule_id: int) -> Iterator[List[Any]]:
+    """Yield a header and one row per assigned employee with their shift count per position"""
+    counts = db.execute(
+        select(
+            Employee.id, Employee.name, ScheduleAssignment.shift_position, func.count(ScheduleAssignment.id)
+        ).join(
+            Employee, Employee.id == ScheduleAssignment.employee_id
+        ).where(
+            ScheduleAssignment.schedule_id == schedule_id
+        ).group_by(
+            Employee.id, Employee.name, ScheduleAssignment.shift_position
+        ).order_by(Employee.name, Employee.id)
+    ).all()
+    positions = sorted({shift_position for _, _, shift_position, _ in counts})
+    columns = {shift_position: column for column, shift_position in enumerate(positions, start=1)}
+    yield ["Employee", *(f"Shift {shift_position}" for shift_position in positions), "Total"]
+
+    totals = [0] * (len(positions) + 1)
+    row = None
+    previous_id = None
+    for employee_id, employee_name, shift_position, shift_count in counts:
+        if employee_id != previous_id:
+            if row is not None:
+                yield row
+            row = [employee_name] + [0] * (len(positions) + 1)
+            previous_id = employee_id
+        row[columns[shift_position]] += shift_count
+        row[-1] += shift_count
+        totals[columns[shift_position] - 1] += shift_count
+        totals[-1] += shift_count
+    if row is not None:
+        yield row
+        yield ["Total", *totals]
@@ -0,0 +1,79 @@
+import io
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from ..schemas.schedule import ScheduleWithAssignments
+
+
+def render_schedule_pdf(schedule: ScheduleWithAssignments) -> bytes:
+    """Render a schedule as a PDF document"""
+    
+    # Create PDF in memory
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    
+    # Get styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30
+    )
+    
+    # Add title
+    title = Paragraph(f"Schedule: {schedule.name}", title_style)
+    elements.append(title)
+    
+    # Add schedule info
+    info_text = f"Year: {schedule.year}, Month: {schedule.month}, Status: {schedule.status}"
+    info_para = Paragraph(info_text, styles['Normal'])
+    elements.append(info_para)
+    elements.append(Spacer(1, 20))
+    
+    # Group assignments by date
+    assignments_by_date = {}
+    for assignment in schedule.assignments:
+        date_str = assignment.date.strftime("%Y-%m-%d")
+        if date_str not in assignments_by_date:
+            assignments_by_date[date_str] = []
+        assignments_by_date[date_str].append(assignment)
+    
+    # Create table for each date
+    for date_str in sorted(assignments_by_date.keys()):
+        # Date header
+        date_header = Paragraph(f"Date: {date_str}", styles['Heading2'])
+        elements.append(date_header)
+        elements.append(Spacer(1, 10))
+        
+        # Create table for this date
+        table_data = [["Employee", "Shift Position", "Notes"]]
+        
+        for assignment in assignments_by_date[date_str]:
+            table_data.append([
+                assignment.employee.name,
+                f"Shift {assignment.shift_position}",
+                assignment.notes or ""
+            ])
+        
+        # Create table
+        table = Table(table_data)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        
+        elements.append(table)
+        elements.append(Spacer(1, 20))
+    
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
@@ -0,0 +1,39 @@
+import heapq
+import random
+from typing import List, Optional
+from .pattern_cache import CompiledPattern
+
+
+class FairShareSelector:
+    """Picks the employees for a day's shifts by lowest accumulated load
+
+    Employees are identified by their row index. Running shift counts, hours and
+    per-position counts are kept across days; each day the candidates are heapified on
+    (shifts, hours, random tie-break) so that picking a shift costs O(log n). Ties are
+    broken with a seeded RNG, which makes schedules reproducible.
+    """
+
+    def __init__(self, num_employees: int, shifts_per_day: int, pattern: CompiledPattern, seed: Optional[int] = None):
+        self.shift_counts = [0] * num_employees
+        self.hours = [0.0] * num_employees
+        self.position_counts = [[0] * shifts_per_day for _ in range(num_employees)]
+        self._pattern = pattern
+        self._rng = random.Random(seed)
+
+    def select(self, candidate_rows: List[int], count: int) -> List[int]:
+        """Get up to count candidates with the lowest load, least loaded first"""
+        if count >= len(candidate_rows):
+            heap = [(self.shift_counts[row], self.hours[row], self._rng.random(), row) for row in candidate_rows]
+            heap.sort()
+            return [row for _, _, _, row in heap]
+
+        random_float = self._rng.random
+        heap = [(self.shift_counts[row], self.hours[row], random_float(), row) for row in candidate_rows]
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[3] for _ in range(count)]
+
+    def record(self, row: int, shift_position: int):
+        """Account an assigned shift to an employee"""
+        self.shift_counts[row] += 1
+        self.hours[row] += self._pattern.hours_for(shift_position)
+        self.position_counts[row][shift_position - 1] += 1
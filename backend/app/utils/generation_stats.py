@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..core.metrics import registry
+
+GENERATION_SECONDS = registry.histogram(
+    "schedule_generation_seconds",
+    "Wall time of schedule generations",
+    ["status"],
+)
+GENERATION_PHASE_SECONDS = registry.histogram(
+    "schedule_generation_phase_seconds",
+    "Wall time of the phases of schedule generations",
+    ["phase"],
+)
+GENERATION_QUERIES = registry.counter(
+    "schedule_generation_queries_total",
+    "SQL statements issued by schedule generations",
+)
+GENERATION_ROWS_WRITTEN = registry.counter(
+    "schedule_generation_rows_written_total",
+    "Assignment rows written by schedule generations",
+)
+GENERATION_CANDIDATES = registry.counter(
+    "schedule_generation_candidates_evaluated_total",
+    "Available employees considered for a day's shifts by schedule generations",
+)
+
+# Stats of the generation running in the current thread or task, if any
+current_generation_stats: ContextVar[Optional["GenerationStats"]] = ContextVar(
+    "current_generation_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_generation_query(conn, cursor, statement, parameters, context, executemany):
+    stats = current_generation_stats.get()
+    if stats is not None:
+        stats.counters["queries"] += 1
+
+
+class GenerationStats:
+    """Phase timings and counters of one schedule generation
+
+    Use phase() around each step; SQL statements executed by the current thread while
+    collecting() is active are counted. as_dict() is returned to API clients and
+    record() exports the numbers to the process' metrics.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {
+            "queries": 0,
+            "employees": 0,
+            "days": 0,
+            "leave_intervals": 0,
+            "candidates_evaluated": 0,
+            "rows_written": 0,
+            "optimizer_iterations": 0,
+        }
+        self._started = time.perf_counter()
+        self.total_seconds: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def collecting(self):
+        token = current_generation_stats.set(self)
+        try:
+            yield self
+        finally:
+            current_generation_stats.reset(token)
+
+    def record(self, status: str):
+        """Stop the clock and add this generation to the exported metrics"""
+        self.total_seconds = time.perf_counter() - self._started
+        GENERATION_SECONDS.observe(self.total_seconds, status=status)
+        for name, seconds in self.phases.items():
+            GENERATION_PHASE_SECONDS.observe(seconds, phase=name)
+        GENERATION_QUERIES.inc(self.counters["queries"])
+        GENERATION_ROWS_WRITTEN.inc(self.counters["rows_written"])
+        GENERATION_CANDIDATES.inc(self.counters["candidates_evaluated"])
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(self.total_seconds, 6) if self.total_seconds is not None else None,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def server_timing(self) -> str:
+        """Format the phase timings as a Server-Timing header value (milliseconds)"""
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items())
@@ -0,0 +1,165 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from ..core.config import settings
+
+# Share of the overall progress taken by each schedule generation phase
+GENERATION_PHASE_WEIGHTS = OrderedDict([
+    ("loading", 0.1),
+    ("assigning", 0.3),
+    ("optimizing", 0.5),
+    ("writing", 0.1),
+])
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its cancellation was requested"""
+
+
+class Job:
+    """State of one background job, updated by the worker and read by the API"""
+
+    def __init__(self, kind: str, params: Dict[str, Any], phase_weights: Optional[Dict[str, float]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.phase_weights = phase_weights or GENERATION_PHASE_WEIGHTS
+        self.status = "queued"  # queued, running, succeeded, failed, cancelled
+        self.phase: Optional[str] = None
+        self.progress = 0.0
+        self.phase_timings: Dict[str, float] = {}
+        self.result: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._cancel_event = threading.Event()
+        self._phase_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def schedule_id(self) -> Optional[int]:
+        return self.result.get("schedule_id")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def report_progress(self, phase: str, fraction: float):
+        """Progress callback for the worker, raises JobCancelled if the job was cancelled"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+        now = time.perf_counter()
+        with self._lock:
+            if phase != self.phase:
+                self._close_phase(now)
+                self.phase = phase
+                self._phase_started = now
+
+            completed = 0.0
+            for name, weight in self.phase_weights.items():
+                if name == phase:
+                    completed += weight * min(max(fraction, 0.0), 1.0)
+                    break
+                completed += weight
+            self.progress = max(self.progress, completed)
+
+    def _close_phase(self, now: float):
+        if self.phase is not None and self._phase_started is not None:
+            self.phase_timings[self.phase] = self.phase_timings.get(self.phase, 0.0) + (
+                now - self._phase_started
+            )
+
+    def _finish(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self._close_phase(time.perf_counter())
+            self.phase = None
+            self.status = status
+            self.error = error
+            if status == "succeeded":
+                self.progress = 1.0
+            self.finished_at = datetime.now(timezone.utc)
+
+
+class JobManager:
+    """Runs jobs on a local thread pool and keeps a bounded history of their state"""
+
+    def __init__(self, max_workers: int, history_size: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._history_size = history_size
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        target: Callable[[Job], Dict[str, Any]],
+        phase_weights: Optional[Dict[str, float]] = None
+    ) -> Job:
+        """Queue target(job) for execution and return the job immediately
+
+        target returns the job result and reports progress through job.report_progress.
+        phase_weights maps the phases it reports, in order, to their share of the progress.
+        """
+        job = Job(kind, params, phase_weights)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job, target)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation, queued jobs never start and running jobs stop at the next progress report"""
+        job = self.get(job_id)
+        if job is not None and job.status in ("queued", "running"):
+            job._cancel_event.set()
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: Job, target: Callable[[Job], Dict[str, Any]]):
+        if job.cancel_requested:
+            job._finish("cancelled")
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            job.result = target(job) or {}
+        except JobCancelled:
+            job._finish("cancelled")
+        except Exception as exc:
+            job._finish("failed", error=str(exc) or exc.__class__.__name__)
+        else:
+            job._finish("succeeded")
+
+    def _evict_finished(self):
+        # Drop the oldest finished jobs once the history is full
+        if len(self._jobs) <= self._history_size:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self._history_size:
+                break
+            if self._jobs[job_id].finished_at is not None:
+                del self._jobs[job_id]
+
+
+job_manager = JobManager(
+    max_workers=settings.JOB_WORKERS,
+    history_size=settings.JOB_HISTORY_SIZE,
+)
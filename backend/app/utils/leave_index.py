@@ -0,0 +1,58 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy.orm import Session
+from ..crud import leave as leave_crud
+
+
+class LeaveIndex:
+    """In-memory index of leave intervals answering "is employee X on leave on date D"
+
+    Intervals are stored per employee, sorted by start date and merged so that
+    they never overlap, which makes a lookup a single binary search.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, date, date]] = ()):
+        raw: Dict[int, List[Tuple[date, date]]] = {}
+        for employee_id, start_date, end_date in intervals:
+            raw.setdefault(employee_id, []).append((start_date, end_date))
+
+        self._starts: Dict[int, List[date]] = {}
+        self._ends: Dict[int, List[date]] = {}
+        for employee_id, employee_intervals in raw.items():
+            starts, ends = [], []
+            for start_date, end_date in sorted(employee_intervals):
+                # Merge overlapping or touching intervals
+                if ends and (start_date - ends[-1]).days <= 1:
+                    if end_date > ends[-1]:
+                        ends[-1] = end_date
+                    continue
+                starts.append(start_date)
+                ends.append(end_date)
+            self._starts[employee_id] = starts
+            self._ends[employee_id] = ends
+
+    @property
+    def interval_count(self) -> int:
+        """Number of merged leave intervals in the index"""
+        return sum(len(starts) for starts in self._starts.values())
+
+    def is_on_leave(self, employee_id: int, check_date: date) -> bool:
+        """Check if an employee is on leave on a specific date"""
+        starts = self._starts.get(employee_id)
+        if not starts:
+            return False
+        position = bisect_right(starts, check_date) - 1
+        return position >= 0 and self._ends[employee_id][position] >= check_date
+
+    def intervals_for(self, employee_id: int) -> List[Tuple[date, date]]:
+        """Get the merged leave intervals of an employee, sorted by start date"""
+        return list(zip(self._starts.get(employee_id, []), self._ends.get(employee_id, [])))
+
+
+def load_leave_index(db: Session, organization_id: int, start_date: date, end_date: date) -> LeaveIndex:
+    """Load every active leave of an organization overlapping the date range with a single query"""
+    intervals = leave_crud.get_active_leave_intervals_by_organization(
+        db, organization_id, start_date, end_date
+    )
+    return LeaveIndex(intervals)
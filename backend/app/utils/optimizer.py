@@ -0,0 +1,171 @@
+import math
+import random
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+
+# Objective weights, the optimizer minimizes
+#   COVERAGE_WEIGHT * empty shifts
+# + FAIRNESS_WEIGHT * sum of squared shift counts per employee
+# - PREFERENCE_WEIGHT * shifts on a preferred position
+COVERAGE_WEIGHT = 100.0
+FAIRNESS_WEIGHT = 1.0
+PREFERENCE_WEIGHT = 2.0
+
+# Annealing temperature at the start and at the end of the time budget
+START_TEMPERATURE = 4.0
+END_TEMPERATURE = 0.05
+
+# How many moves to make between two clock reads
+CLOCK_CHECK_INTERVAL = 1024
+
+# A grid holds one row per day and one employee index per shift position, -1 is empty
+Grid = List[List[int]]
+
+
+def score_grid(grid: Grid, preferred_by_row: List[Set[int]], num_employees: int) -> float:
+    """Compute the full objective of a grid (lower is better)"""
+    counts = [0] * num_employees
+    empty = 0
+    preferred = 0
+    for day in grid:
+        for index, row in enumerate(day):
+            if row < 0:
+                empty += 1
+                continue
+            counts[row] += 1
+            if index + 1 in preferred_by_row[row]:
+                preferred += 1
+    return (
+        COVERAGE_WEIGHT * empty
+        + FAIRNESS_WEIGHT * sum(count * count for count in counts)
+        - PREFERENCE_WEIGHT * preferred
+    )
+
+
+def optimize_schedule_grid(
+    grid: Grid,
+    candidates_by_day: List[List[int]],
+    preferred_by_row: List[Set[int]],
+    time_budget: float,
+    seed: Optional[int] = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    max_iterations: Optional[int] = None
+) -> Tuple[Grid, Dict[str, Any]]:
+    """Improve a schedule grid with simulated annealing under a wall-clock budget
+
+    Two moves are used: handing a shift to another employee available that day, and
+    swapping the positions of two shifts on the same day. Each move is scored
+    incrementally in O(1) from running per-employee shift counts, so the search only
+    pays for what a move changes. Returns the best grid found and search statistics.
+
+    progress_callback, if given, receives the fraction of the budget used at every
+    clock check; raising from it stops the search. max_iterations additionally bounds
+    the number of moves tried; with a seed and a budget that is not reached, the result
+    is reproducible.
+    """
+    rng = random.Random(seed)
+    grid = [list(day) for day in grid]
+    num_employees = len(preferred_by_row)
+    shifts_per_day = len(grid[0]) if grid else 0
+
+    # Running state for incremental scoring
+    counts = [0] * num_employees
+    working = [set() for _ in grid]
+    for day_index, day in enumerate(grid):
+        for row in day:
+            if row >= 0:
+                counts[row] += 1
+                working[day_index].add(row)
+
+    cost = score_grid(grid, preferred_by_row, num_employees)
+    initial_cost = cost
+    best_cost = cost
+    best_grid = [list(day) for day in grid]
+
+    # Only shifts on days with at least one candidate can be changed
+    slots = [
+        (day_index, position)
+        for day_index in range(len(grid)) if candidates_by_day[day_index]
+        for position in range(shifts_per_day)
+    ]
+
+    started = time.perf_counter()
+    deadline = started + time_budget
+    iterations = 0
+    accepted = 0
+    temperature = START_TEMPERATURE
+    random_float = rng.random
+    num_slots = len(slots)
+
+    while num_slots and (max_iterations is None or iterations < max_iterations):
+        if iterations % CLOCK_CHECK_INTERVAL == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            progress = (now - started) / time_budget
+            if progress_callback is not None:
+                progress_callback(progress)
+            temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+        iterations += 1
+
+        day_index, position = slots[int(random_float() * num_slots)]
+        day = grid[day_index]
+
+        if shifts_per_day > 1 and random_float() < 0.5:
+            # Swap two positions on the same day, only preferences change
+            other = int(random_float() * (shifts_per_day - 1))
+            if other >= position:
+                other += 1
+            first, second = day[position], day[other]
+            before = after = 0
+            if first >= 0:
+                preferences = preferred_by_row[first]
+                before += (position + 1) in preferences
+                after += (other + 1) in preferences
+            if second >= 0:
+                preferences = preferred_by_row[second]
+                before += (other + 1) in preferences
+                after += (position + 1) in preferences
+            delta = PREFERENCE_WEIGHT * (before - after)
+            if delta > 0 and random_float() >= math.exp(-delta / temperature):
+                continue
+            day[position], day[other] = second, first
+        else:
+            # Hand the shift to another available employee who is not working that day
+            candidates = candidates_by_day[day_index]
+            new_row = candidates[int(random_float() * len(candidates))]
+            if new_row in working[day_index]:
+                continue
+            old_row = day[position]
+            delta = FAIRNESS_WEIGHT * (2 * counts[new_row] + 1)
+            if (position + 1) in preferred_by_row[new_row]:
+                delta -= PREFERENCE_WEIGHT
+            if old_row < 0:
+                delta -= COVERAGE_WEIGHT
+            else:
+                delta += FAIRNESS_WEIGHT * (1 - 2 * counts[old_row])
+                if (position + 1) in preferred_by_row[old_row]:
+                    delta += PREFERENCE_WEIGHT
+            if delta > 0 and random_float() >= math.exp(-delta / temperature):
+                continue
+            day[position] = new_row
+            counts[new_row] += 1
+            working[day_index].add(new_row)
+            if old_row >= 0:
+                counts[old_row] -= 1
+                working[day_index].discard(old_row)
+
+        accepted += 1
+        cost += delta
+        if cost < best_cost - 1e-9:
+            best_cost = cost
+            best_grid = [list(day) for day in grid]
+
+    elapsed = time.perf_counter() - started
+    return best_grid, {
+        "iterations": iterations,
+        "accepted_moves": accepted,
+        "initial_score": initial_cost,
+        "best_score": best_cost,
+        "elapsed_seconds": elapsed,
+    }
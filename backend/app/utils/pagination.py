@@ -0,0 +1,101 @@
+import base64
+import json
+from datetime import date
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Largest page the list endpoints return
+MAX_PAGE_SIZE = 1000
+
+# Page size of the internal iterators
+ITERATION_BATCH_SIZE = 1000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last item of a page as an opaque token"""
+    payload = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> Tuple[Any, ...]:
+    """Decode a token created by encode_cursor for the given sort columns
+
+    Raises ValueError if the token is malformed or does not match the columns.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        try:
+            if python_type is date:
+                decoded.append(date.fromisoformat(value))
+            elif python_type is int and isinstance(value, int) and not isinstance(value, bool):
+                decoded.append(value)
+            else:
+                raise TypeError()
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+    return tuple(decoded)
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """Filter for rows sorting after values, i.e. (columns) > (values) lexicographically"""
+    clauses = []
+    for index, column in enumerate(columns):
+        equal_prefix = [columns[position] == values[position] for position in range(index)]
+        clauses.append(and_(*equal_prefix, column > values[index]))
+    return or_(*clauses)
+
+
+def paginate(query: Query, columns: Sequence[Any], cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Get one page of query results in the order of columns, starting after cursor
+
+    columns must make the order unique (end with the primary key). Returns the items and
+    the cursor of the next page, which is None on the last page. Raises ValueError for
+    an invalid cursor.
+    """
+    if cursor:
+        query = query.filter(keyset_after(columns, decode_cursor(cursor, columns)))
+    items = query.order_by(*columns).limit(limit + 1).all()
+    return split_page(items, columns, limit)
+
+
+async def paginate_async(db: AsyncSession, statement: Select, columns: Sequence[Any], cursor: Optional[str],
+                         limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Like paginate, for a select() of one entity executed on an async session"""
+    if cursor:
+        statement = statement.where(keyset_after(columns, decode_cursor(cursor, columns)))
+    items = list((await db.scalars(statement.order_by(*columns).limit(limit + 1))).all())
+    return split_page(items, columns, limit)
+
+
+def split_page(items: List[Any], columns: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split limit + 1 fetched items into the page and the cursor of the next page"""
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor([getattr(items[-1], column.key) for column in columns])
+
+
+def iterate(query: Query, columns: Sequence[Any], batch_size: int = ITERATION_BATCH_SIZE) -> Iterator[Any]:
+    """Iterate over all query results in the order of columns, batch_size rows per query"""
+    after = None
+    while True:
+        batch_query = query if after is None else query.filter(keyset_after(columns, after))
+        items = batch_query.order_by(*columns).limit(batch_size).all()
+        yield from items
+        if len(items) < batch_size:
+            return
+        after = [getattr(items[-1], column.key) for column in columns]
@@ -0,0 +1,152 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from ..models.shift_pattern import ShiftPattern
+
+# Number of compiled patterns kept per process
+PATTERN_CACHE_SIZE = 256
+
+# Longest work/rest cycle in days; compiling a cycle takes time quadratic in its length
+MAX_CYCLE_LENGTH = 366
+
+# Length of a shift when the pattern does not define shift_hours
+DEFAULT_SHIFT_HOURS = 8.0
+
+
+class CompiledPattern:
+    """Validated, immutable form of a shift pattern's JSON definition
+
+    The work/rest rotation is compiled into a bitmask over the cycle (bit i is set when
+    day i of the cycle is a work day) and an equivalent lookup table. shift_hours holds
+    the length of every shift position, or a single length for all of them.
+    """
+
+    __slots__ = (
+        "work_days", "rest_days", "cycle_length", "skip_weekends",
+        "cycle_mask", "cycle_table", "shift_hours", "data",
+    )
+
+    def __init__(
+        self,
+        work_days: int,
+        rest_days: int,
+        skip_weekends: bool,
+        data: Mapping[str, Any],
+        shift_hours: Union[float, Tuple[float, ...]] = DEFAULT_SHIFT_HOURS
+    ):
+        self.work_days = work_days
+        self.rest_days = rest_days
+        self.cycle_length = work_days + rest_days
+        self.skip_weekends = skip_weekends
+        self.cycle_mask = (1 << work_days) - 1
+        self.cycle_table: Tuple[bool, ...] = tuple(
+            bool(self.cycle_mask >> position & 1) for position in range(self.cycle_length)
+        )
+        self.shift_hours = shift_hours
+        self.data = data
+
+    def hours_for(self, shift_position: int) -> float:
+        """Get the length in hours of a shift position (1-based)"""
+        if isinstance(self.shift_hours, tuple):
+            if 1 <= shift_position <= len(self.shift_hours):
+                return self.shift_hours[shift_position - 1]
+            return DEFAULT_SHIFT_HOURS
+        return self.shift_hours
+
+    def works_on(self, current_date: date) -> bool:
+        """Determine if the pattern says to work on a specific date"""
+        if self.skip_weekends and current_date.weekday() >= 5:
+            return False
+        # Position in cycle is counted from the start of the date's year
+        days_since_reference = (current_date - date(current_date.year, 1, 1)).days
+        return bool(self.cycle_mask >> (days_since_reference % self.cycle_length) & 1)
+
+
+def compile_pattern_data(pattern_data: Union[str, Dict[str, Any]]) -> CompiledPattern:
+    """Validate pattern data (a dict or its JSON string) and compile it
+
+    Raises ValueError if the data is not a valid pattern definition.
+    """
+    if isinstance(pattern_data, str):
+        try:
+            pattern_data = json.loads(pattern_data)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Pattern data is not valid JSON: {exc}")
+    if not isinstance(pattern_data, dict):
+        raise ValueError("Pattern data must be an object")
+
+    work_days = pattern_data.get("work_days", 4)
+    rest_days = pattern_data.get("rest_days", 2)
+    for key, value in (("work_days", work_days), ("rest_days", rest_days)):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f"{key} must be a non-negative integer")
+    if work_days + rest_days <= 0:
+        raise ValueError("work_days and rest_days must not both be 0")
+    if work_days + rest_days > MAX_CYCLE_LENGTH:
+        raise ValueError(f"work_days and rest_days must add up to at most {MAX_CYCLE_LENGTH}")
+
+    skip_weekends = pattern_data.get("skip_weekends", False)
+    if not isinstance(skip_weekends, bool):
+        raise ValueError("skip_weekends must be a boolean")
+
+    shift_hours = pattern_data.get("shift_hours", DEFAULT_SHIFT_HOURS)
+    values = shift_hours if isinstance(shift_hours, list) else [shift_hours]
+    if any(isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0 for value in values):
+        raise ValueError("shift_hours must be a positive number or a list of positive numbers")
+    shift_hours = tuple(float(value) for value in shift_hours) if isinstance(shift_hours, list) else float(shift_hours)
+
+    return CompiledPattern(
+        work_days, rest_days, skip_weekends, MappingProxyType(dict(pattern_data)), shift_hours
+    )
+
+
+class PatternCache:
+    """Thread-safe LRU cache of compiled patterns keyed by (pattern id, updated_at)
+
+    Including updated_at in the key means a pattern edited in another process is never
+    served stale here; invalidate() only frees the memory of outdated versions early.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, Optional[datetime]], CompiledPattern]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, shift_pattern: ShiftPattern) -> CompiledPattern:
+        if shift_pattern.id is None:
+            return compile_pattern_data(shift_pattern.pattern_data)
+
+        key = (shift_pattern.id, shift_pattern.updated_at)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled = compile_pattern_data(shift_pattern.pattern_data)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, shift_pattern_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == shift_pattern_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+pattern_cache = PatternCache(PATTERN_CACHE_SIZE)
+
+
+def get_compiled_pattern(shift_pattern: ShiftPattern) -> CompiledPattern:
+    """Get the compiled form of a stored shift pattern, compiling it on first use"""
+    return pattern_cache.get(shift_pattern)
@@ -0,0 +1,166 @@
+from collections import Counter
+from datetime import date
+from typing import List, Dict, Iterable
+from sqlalchemy import and_, func, update, delete
+from sqlalchemy.orm import Session
+from ..models.employee import Employee
+from ..models.schedule import Schedule
+from ..models.schedule_assignment import ScheduleAssignment
+from ..crud import schedule_stats
+from ..crud.schedule import touch_schedule
+from .assignment_solver import get_preferred_shifts
+from .leave_index import load_leave_index
+from .scheduler import get_month_dates
+
+
+def replan_schedule(
+    db: Session,
+    schedule: Schedule,
+    employee_ids: Iterable[int],
+    start_date: date,
+    end_date: date,
+    commit: bool = True
+) -> Dict[str, int]:
+    """Hand the shifts of employees who became unavailable to other employees
+
+    Only generated assignments of the given employees between start_date and end_date
+    are touched; manual overrides and every other day stay as they are. Replacements
+    are active employees who are not on leave and not yet working that day, preferring
+    the fewest shifts in the schedule and then a preferred shift position. Rotation
+    patterns apply to the whole organization, so a day with shifts is a working day for
+    everyone. Shifts nobody can take are removed.
+    """
+    employee_ids = set(employee_ids)
+    month_dates = get_month_dates(schedule.year, schedule.month)
+    start_date = max(start_date, month_dates[0])
+    end_date = min(end_date, month_dates[-1])
+    result = {"reassigned": 0, "removed": 0}
+    if not employee_ids or start_date > end_date:
+        return result
+
+    affected = db.query(ScheduleAssignment).filter(
+        and_(
+            ScheduleAssignment.schedule_id == schedule.id,
+            ScheduleAssignment.employee_id.in_(employee_ids),
+            ScheduleAssignment.date >= start_date,
+            ScheduleAssignment.date <= end_date,
+            ScheduleAssignment.is_manual_override == False
+        )
+    ).order_by(ScheduleAssignment.date, ScheduleAssignment.shift_position).all()
+    if not affected:
+        return result
+
+    affected_dates = sorted({assignment.date for assignment in affected})
+
+    # Who already works on the affected days
+    working_by_date: Dict[date, set] = {}
+    for assignment_date, employee_id in db.query(
+        ScheduleAssignment.date, ScheduleAssignment.employee_id
+    ).filter(
+        ScheduleAssignment.schedule_id == schedule.id,
+        ScheduleAssignment.date.in_(affected_dates)
+    ):
+        working_by_date.setdefault(assignment_date, set()).add(employee_id)
+
+    # Shift counts over the whole schedule to keep the load balanced
+    shift_counts = Counter(dict(
+        db.query(ScheduleAssignment.employee_id, func.count(ScheduleAssignment.id)).filter(
+            ScheduleAssignment.schedule_id == schedule.id
+        ).group_by(ScheduleAssignment.employee_id).all()
+    ))
+
+    employees = db.query(Employee.id, Employee.preferences).filter(
+        Employee.organization_id == schedule.organization_id,
+        Employee.is_active == True
+    ).all()
+    preferred_shifts = get_preferred_shifts(employees)
+    candidate_ids = [employee.id for employee in employees if employee.id not in employee_ids]
+
+    leave_index = load_leave_index(db, schedule.organization_id, affected_dates[0], affected_dates[-1])
+
+    updates: List[Dict[str, int]] = []
+    removed: List[int] = []
+    # (employee_id, shift_position) before and after, for the schedule's statistics
+    removed_keys = []
+    added_keys = []
+    for assignment in affected:
+        working = working_by_date.setdefault(assignment.date, set())
+        candidates = [
+            employee_id for employee_id in candidate_ids
+            if employee_id not in working and not leave_index.is_on_leave(employee_id, assignment.date)
+        ]
+        removed_keys.append((assignment.employee_id, assignment.shift_position))
+        if not candidates:
+            removed.append(assignment.id)
+            shift_counts[assignment.employee_id] -= 1
+            continue
+
+        replacement = min(
+            candidates,
+            key=lambda employee_id: (
+                shift_counts[employee_id],
+                assignment.shift_position not in preferred_shifts.get(employee_id, ()),
+                employee_id
+            )
+        )
+        updates.append({"id": assignment.id, "employee_id": replacement})
+        added_keys.append((replacement, assignment.shift_position))
+        working.add(replacement)
+        shift_counts[replacement] += 1
+        shift_counts[assignment.employee_id] -= 1
+
+    # Write only the rows that changed
+    if updates:
+        db.execute(update(ScheduleAssignment), updates)
+    if removed:
+        db.execute(
+            delete(ScheduleAssignment).where(ScheduleAssignment.id.in_(removed)),
+            execution_options={"synchronize_session": False}
+        )
+    schedule_stats.record_assignment_changes(db, schedule.id, removed=removed_keys, added=added_keys)
+    if updates or removed:
+        touch_schedule(db, schedule.id)
+    if commit:
+        db.commit()
+    else:
+        # Bulk statements bypass the loaded objects
+        for assignment in affected:
+            db.expire(assignment)
+
+    result["reassigned"] = len(updates)
+    result["removed"] = len(removed)
+    return result
+
+
+def replan_draft_schedules_for_employee(
+    db: Session,
+    employee_id: int,
+    start_date: date,
+    end_date: date,
+    commit: bool = True
+) -> Dict[int, Dict[str, int]]:
+    """Re-plan every draft schedule in which the employee works between the two dates
+
+    Used when an employee becomes unavailable, e.g. a leave is recorded or the employee
+    is deactivated. Finalized schedules are left alone. With commit=False the changes are
+    left to the caller's transaction. Returns the outcome per schedule id.
+    """
+    schedules = db.query(Schedule).join(
+        ScheduleAssignment, ScheduleAssignment.schedule_id == Schedule.id
+    ).filter(
+        and_(
+            Schedule.status == "draft",
+            ScheduleAssignment.employee_id == employee_id,
+            ScheduleAssignment.date >= start_date,
+            ScheduleAssignment.date <= end_date
+        )
+    ).distinct().all()
+
+    results = {}
+    for schedule in schedules:
+        results[schedule.id] = replan_schedule(
+            db, schedule, [employee_id], start_date, end_date, commit=False
+        )
+    if schedules and commit:
+        db.commit()
+    return results
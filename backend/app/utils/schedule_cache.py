@@ -0,0 +1,253 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.metrics import registry
+from ..models.schedule import Schedule
+from ..schemas.schedule import ScheduleWithAssignments
+
+# Bump when the rendered form of a response changes, so cached bodies of older releases are not served
+CACHE_FORMAT_VERSION = 1
+
+# Media type and file extension of each cached response kind, exports are sent as attachments
+RESPONSE_KINDS: Dict[str, Tuple[str, Optional[str]]] = {
+    "json": ("application/json", None),
+    "grid": ("application/json", None),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "pdf": ("application/pdf", "pdf"),
+}
+
+# Clients may keep the response but have to revalidate it with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+SCHEDULE_CACHE_LOOKUPS = registry.counter(
+    "schedule_cache_lookups_total",
+    "Finalized-schedule response cache lookups by result (not_modified, memory, disk, miss)",
+    ["kind", "result"],
+)
+
+
+def schedule_etag(schedule: Schedule, kind: str) -> str:
+    """Strong ETag of a response kind for the current version of a schedule"""
+    version = schedule.updated_at or schedule.created_at
+    digest = hashlib.sha256(
+        f"{CACHE_FORMAT_VERSION}:{schedule.id}:{version.isoformat() if version else ''}:{kind}".encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the If-None-Match header of a request matches etag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ScheduleCache:
+    """Thread-safe LRU cache of rendered finalized-schedule responses
+
+    Entries are keyed by (schedule id, kind) and hold the body together with the ETag of
+    the schedule version it was rendered from; a lookup with the ETag of a newer version
+    misses and the next store replaces the entry. The memory tier is bounded by the total
+    body size. With a directory, bodies are also written to disk, which survives restarts
+    and is shared by the workers on a host.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def get(self, schedule_id: int, kind: str, etag: str) -> Tuple[Optional[bytes], str]:
+        """Get the cached body for etag and the tier it came from ("memory", "disk" or "miss")"""
+        key = (schedule_id, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                self._entries.move_to_end(key)
+                return entry[1], "memory"
+
+        body = self._read_file(schedule_id, kind, etag)
+        if body is None:
+            return None, "miss"
+        self._remember(key, etag, body)
+        return body, "disk"
+
+    def put(self, schedule_id: int, kind: str, etag: str, body: bytes):
+        self._remember((schedule_id, kind), etag, body)
+        self._write_file(schedule_id, kind, etag, body)
+
+    def invalidate(self, schedule_id: int):
+        """Drop the entries of a schedule, e.g. before its assignments change"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == schedule_id]:
+                self._size -= len(self._entries.pop(key)[1])
+        directory = self._schedule_directory(schedule_id)
+        if directory is not None and os.path.isdir(directory):
+            for name in os.listdir(directory):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key: Tuple[int, str], etag: str, body: bytes):
+        if len(body) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (etag, body)
+            self._size += len(body)
+            while self._size > self._max_bytes:
+                self._size -= len(self._entries.popitem(last=False)[1][1])
+
+    def _schedule_directory(self, schedule_id: int) -> Optional[str]:
+        if not self._directory:
+            return None
+        return os.path.join(self._directory, str(schedule_id))
+
+    def _file_path(self, schedule_id: int, kind: str, etag: str) -> Optional[str]:
+        directory = self._schedule_directory(schedule_id)
+        if directory is None:
+            return None
+        digest = etag.strip('"')
+        return os.path.join(directory, f"{kind}-{digest}")
+
+    def _read_file(self, schedule_id: int, kind: str, etag: str) -> Optional[bytes]:
+        path = self._file_path(schedule_id, kind, etag)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as cached_file:
+                return cached_file.read()
+        except OSError:
+            return None
+
+    def _write_file(self, schedule_id: int, kind: str, etag: str, body: bytes):
+        path = self._file_path(schedule_id, kind, etag)
+        if path is None:
+            return
+        # The disk tier is best effort, a failed write only costs a later re-render
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            for name in os.listdir(directory):
+                if name.startswith(f"{kind}-"):
+                    os.remove(os.path.join(directory, name))
+            # Written under a temporary name and renamed, so readers never see partial files
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(descriptor, "wb") as cached_file:
+                cached_file.write(body)
+            os.replace(temporary_path, path)
+        except OSError:
+            pass
+
+
+schedule_cache = ScheduleCache(settings.SCHEDULE_CACHE_MAX_BYTES, settings.SCHEDULE_CACHE_DIR)
+
+
+def render_schedule_json(schedule: Schedule) -> bytes:
+    """Serialize a schedule with its loaded assignments like the read endpoint does"""
+    return ScheduleWithAssignments.model_validate(schedule).model_dump_json().encode()
+
+
+def response_headers(schedule: Schedule, kind: str, etag: Optional[str] = None) -> Dict[str, str]:
+    headers = {}
+    extension = RESPONSE_KINDS[kind][1]
+    if extension:
+        headers["Content-Disposition"] = f"attachment; filename=schedule_{schedule.year}_{schedule.month:02d}.{extension}"
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = CACHE_CONTROL
+    return headers
+
+
+def cached_schedule_response(request: Request, schedule: Schedule, kind: str) -> Optional[Response]:
+    """Answer a request for a finalized schedule without rendering, if possible
+
+    Returns 304 Not Modified when the client's If-None-Match matches the schedule's
+    current version, or the cached body. Returns None for schedules that are not
+    finalized and on cache misses; the caller then renders and calls schedule_response.
+    """
+    if schedule.status != "finalized":
+        return None
+    etag = schedule_etag(schedule, kind)
+    if etag_matches(request, etag):
+        SCHEDULE_CACHE_LOOKUPS.inc(kind=kind, result="not_modified")
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    body, tier = schedule_cache.get(schedule.id, kind, etag)
+    SCHEDULE_CACHE_LOOKUPS.inc(kind=kind, result=tier)
+    if body is None:
+        return None
+    return Response(body, media_type=RESPONSE_KINDS[kind][0], headers=response_headers(schedule, kind, etag))
+
+
+def schedule_response(schedule: Schedule, kind: str, body: bytes) -> Response:
+    """Send a rendered schedule response, caching it and adding an ETag if the schedule is finalized"""
+    etag = None
+    if schedule.status == "finalized":
+        etag = schedule_etag(schedule, kind)
+        schedule_cache.put(schedule.id, kind, etag, body)
+    return Response(body, media_type=RESPONSE_KINDS[kind][0], headers=response_headers(schedule, kind, etag))
+
+
+def streaming_schedule_response(schedule: Schedule, kind: str, chunks: Iterator[bytes]) -> StreamingResponse:
+    """Stream a rendered schedule response; finalized schedules are cached once it is complete
+
+    Chunks are sent as they are produced. For finalized schedules they are also collected,
+    up to the cache's size limit, and stored when the stream ends without error and the
+    schedule is still at the version of the ETag; the chunks are usually read on another
+    session than the schedule, and a body of a newer version must not be cached under it.
+    """
+    etag = None
+    if schedule.status == "finalized":
+        etag = schedule_etag(schedule, kind)
+        chunks = _cache_when_complete(schedule.id, kind, etag, chunks)
+    return StreamingResponse(chunks, media_type=RESPONSE_KINDS[kind][0], headers=response_headers(schedule, kind, etag))
+
+
+def _cache_when_complete(schedule_id: int, kind: str, etag: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    collected = []
+    size = 0
+    for chunk in chunks:
+        if collected is not None:
+            size += len(chunk)
+            if size > schedule_cache.max_bytes:
+                # Would not fit the cache anyway
+                collected = None
+            else:
+                collected.append(chunk)
+        yield chunk
+    if collected is not None and is_current_etag(schedule_id, kind, etag):
+        schedule_cache.put(schedule_id, kind, etag, b"".join(collected))
+
+
+def is_current_etag(schedule_id: int, kind: str, etag: str) -> bool:
+    """Whether etag is still the ETag of the finalized schedule, read on a session of its own"""
+    db = SessionLocal()
+    try:
+        schedule = db.get(Schedule, schedule_id)
+        return schedule is not None and schedule.status == "finalized" and schedule_etag(schedule, kind) == etag
+    finally:
+        db.close()
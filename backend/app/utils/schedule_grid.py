@@ -0,0 +1,99 @@
+import calendar
+import numpy as np
+from datetime import date
+from typing import Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..models.employee import Employee
+from ..models.schedule import Schedule
+from ..models.schedule_assignment import ScheduleAssignment
+from ..models.shift_pattern import ShiftPattern
+from ..schemas.schedule import ScheduleGrid
+
+
+def build_schedule_grid(db: Session, schedule: Schedule) -> ScheduleGrid:
+    """Build the compact grid of a schedule
+
+    Reads only the assignment columns the grid needs and the names of the assigned
+    employees, two queries without loading ORM objects, and the shifts per day of the
+    schedule's shift pattern if it has one.
+    """
+    shifts_per_day = 0
+    if schedule.shift_pattern_id is not None:
+        shifts_per_day = db.execute(
+            select(ShiftPattern.shifts_per_day).where(ShiftPattern.id == schedule.shift_pattern_id)
+        ).scalar() or 0
+    assignment_rows = db.execute(
+        select(
+            ScheduleAssignment.date,
+            ScheduleAssignment.shift_position,
+            ScheduleAssignment.employee_id,
+            ScheduleAssignment.is_manual_override
+        ).where(
+            ScheduleAssignment.schedule_id == schedule.id
+        ).order_by(ScheduleAssignment.date, ScheduleAssignment.shift_position, ScheduleAssignment.id)
+    ).all()
+    employee_rows = db.execute(
+        select(Employee.id, Employee.name).where(
+            Employee.id.in_(
+                select(ScheduleAssignment.employee_id).where(
+                    ScheduleAssignment.schedule_id == schedule.id
+                ).distinct()
+            )
+        ).order_by(Employee.id)
+    ).all()
+    return grid_from_rows(schedule, assignment_rows, employee_rows, shifts_per_day)
+
+
+def grid_from_rows(
+    schedule: Schedule,
+    assignment_rows: Sequence[tuple],
+    employee_rows: Sequence[tuple],
+    shifts_per_day: int = 0
+) -> ScheduleGrid:
+    """Arrange (date, shift position, employee id, manual) rows into a ScheduleGrid
+
+    assignment_rows must be ordered by date and shift position; the first assignment of
+    a cell goes into the grid and later ones into extra. employee_rows are the (id, name)
+    of the assigned employees ordered by id. The grid has shifts_per_day columns, or more
+    if a higher position is assigned.
+    """
+    start_date = date(schedule.year, schedule.month, 1)
+    days_in_month = calendar.monthrange(schedule.year, schedule.month)[1]
+    employee_ids = [employee_id for employee_id, _ in employee_rows]
+    grid = ScheduleGrid(
+        schedule_id=schedule.id,
+        year=schedule.year,
+        month=schedule.month,
+        status=schedule.status,
+        updated_at=schedule.updated_at,
+        start_date=start_date,
+        shifts_per_day=shifts_per_day,
+        employee_ids=employee_ids,
+        employee_names=[name for _, name in employee_rows],
+        grid=[[-1] * shifts_per_day for _ in range(days_in_month)]
+    )
+    if not assignment_rows:
+        return grid
+
+    dates, positions, assignment_employee_ids, manual = zip(*assignment_rows)
+    # Ordinals convert far faster than datetime64 parsing of date objects
+    days = np.fromiter(map(date.toordinal, dates), dtype=np.int64, count=len(dates)) - start_date.toordinal()
+    shifts = np.array(positions, dtype=np.int64) - 1
+    rows = np.searchsorted(np.array(employee_ids, dtype=np.int64), np.array(assignment_employee_ids, dtype=np.int64))
+    shifts_per_day = max(int(shifts.max()) + 1, shifts_per_day)
+
+    # Cells are unique per (day, shift), and equal cells are adjacent in the row order
+    cells = days * shifts_per_day + shifts
+    in_grid = (days >= 0) & (days < days_in_month) & (shifts >= 0)
+    in_grid[1:] &= cells[1:] != cells[:-1]
+
+    matrix = np.full(days_in_month * shifts_per_day, -1, dtype=np.int64)
+    matrix[cells[in_grid]] = rows[in_grid]
+    manual = np.array(manual, dtype=bool)
+
+    grid.shifts_per_day = shifts_per_day
+    grid.grid = matrix.reshape(days_in_month, shifts_per_day).tolist()
+    grid.extra = np.column_stack((days, shifts, rows))[~in_grid].tolist()
+    grid.manual_overrides = np.column_stack((days, shifts))[manual].tolist()
+    return grid
@@ -1,13 +1,23 @@
-import random
-import json
+import numpy as np
 from datetime import date, datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
 from sqlalchemy.orm import Session
 from ..models.schedule import Schedule
 from ..models.schedule_assignment import ScheduleAssignment
 from ..models.employee import Employee
 from ..models.shift_pattern import ShiftPattern
-from ..crud import schedule as schedule_crud, leave as leave_crud
+from ..schemas.schedule import ScheduleCreate
+from ..crud import schedule as schedule_crud
+from .leave_index import LeaveIndex, load_leave_index
+from .pattern_cache import compile_pattern_data, get_compiled_pattern
+from .availability import build_availability_matrix
+from .assignment_solver import get_preferred_shifts, solve_day_assignment
+from .optimizer import optimize_schedule_grid
+from .fair_share import FairShareSelector
+from .generation_stats import GenerationStats
+
+# Called with (phase, fraction of the phase done)
+ProgressCallback = Callable[[str, float], None]
 
 
 def generate_schedule(
@@ -17,58 +27,192 @@ def generate_schedule(
     month: int,
     shift_pattern: ShiftPattern,
     employees: List[Employee],
-    name: str
+    name: str,
+    optimize: bool = False,
+    time_budget: float = 2.0,
+    seed: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    stats: Optional[GenerationStats] = None
 ) -> Schedule:
-    """Generate a complete schedule for a month based on shift pattern and employees"""
+    """Generate a complete schedule for a month based on shift pattern and employees
+
+    The schedule and all of its assignments are written in a single transaction, so a
+    failure midway leaves no partially generated draft behind. With optimize set, the
+    generated schedule is improved by local search for up to time_budget seconds.
+
+    progress_callback is called with the current phase and the fraction of it that is
+    done; an exception raised from it aborts (and rolls back) the generation. It is not
+    called after the commit, so a cancelled generation never leaves a schedule behind.
+
+    Phase timings and counters are collected into stats (pass a GenerationStats to read
+    them afterwards) and exported to the metrics registry.
+    """
     
-    # Create the schedule
-    schedule_data = {
-        "organization_id": organization_id,
-        "name": name,
-        "year": year,
-        "month": month,
-        "status": "draft"
-    }
+    if stats is None:
+        stats = GenerationStats()
     
-    schedule = schedule_crud.create_schedule(db, schedule_data)
+    with stats.collecting():
+        try:
+            # Create the schedule (flushed only, committed together with its assignments)
+            with stats.phase("create_schedule"):
+                schedule = schedule_crud.create_schedule(
+                    db,
+                    ScheduleCreate(
+                        organization_id=organization_id, name=name, year=year, month=month,
+                        shift_pattern_id=shift_pattern.id
+                    ),
+                    commit=False
+                )
+            
+            assignments = build_schedule_assignments(
+                db, schedule.id, organization_id, year, month, shift_pattern, employees,
+                optimize=optimize, time_budget=time_budget, seed=seed,
+                progress_callback=progress_callback, stats=stats
+            )
+            
+            report_progress(progress_callback, "writing", 0.0)
+            with stats.phase("write_assignments"):
+                schedule_crud.bulk_create_schedule_assignments(db, assignments, commit=False)
+            stats.counters["rows_written"] += len(assignments)
+            # Last cancellation point: once committed, the schedule must be reported
+            report_progress(progress_callback, "writing", 1.0)
+            
+            with stats.phase("commit"):
+                db.commit()
+        except Exception:
+            db.rollback()
+            stats.record("failed")
+            raise
+        
+        with stats.phase("refresh"):
+            db.refresh(schedule)
     
-    # Parse shift pattern data
-    pattern_data = json.loads(shift_pattern.pattern_data)
+    stats.record("succeeded")
+    return schedule
+
+
+def build_schedule_assignments(
+    db: Session,
+    schedule_id: int,
+    organization_id: int,
+    year: int,
+    month: int,
+    shift_pattern: ShiftPattern,
+    employees: List[Employee],
+    optimize: bool = False,
+    time_budget: float = 2.0,
+    seed: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    stats: Optional[GenerationStats] = None
+) -> List[Dict[str, Any]]:
+    """Build the assignment rows of a month based on shift pattern and employees"""
+    
+    if stats is None:
+        stats = GenerationStats()
+    
+    report_progress(progress_callback, "loading", 0.0)
+    
+    # Validated pattern, compiled once per pattern version
+    with stats.phase("compile_pattern"):
+        pattern = get_compiled_pattern(shift_pattern)
     shifts_per_day = shift_pattern.shifts_per_day
     
     # Get all dates in the month
     month_dates = get_month_dates(year, month)
     
+    # Load all leaves overlapping the month at once instead of querying per employee and day
+    with stats.phase("load_leaves"):
+        leave_index = load_leave_index(db, organization_id, month_dates[0], month_dates[-1])
+    
+    # Evaluate the pattern and leaves for every employee and day in one shot
+    with stats.phase("availability"):
+        availability = build_availability_matrix(
+            [employee.id for employee in employees],
+            month_dates[0], month_dates[-1], pattern, leave_index
+        )
+    stats.counters["employees"] += len(employees)
+    stats.counters["days"] += len(month_dates)
+    stats.counters["leave_intervals"] += leave_index.interval_count
+    
+    with stats.phase("load_preferences"):
+        preferred_shifts = get_preferred_shifts(employees)
+    employee_rows = {employee.id: row for row, employee in enumerate(employees)}
+    selector = FairShareSelector(len(employees), shifts_per_day, pattern, seed)
+    
+    # One row per day with the employee row index of each shift position (-1 if empty)
+    grid = []
+    
+    report_progress(progress_callback, "loading", 1.0)
+    
     # Generate assignments for each date
-    for current_date in month_dates:
-        # Skip weekends if specified in pattern
-        if pattern_data.get("skip_weekends", False) and current_date.weekday() >= 5:
-            continue
+    for day_index, current_date in enumerate(month_dates):
+        report_progress(progress_callback, "assigning", day_index / len(month_dates))
         
-        # Determine which employees should work on this date based on pattern
-        working_employees = get_working_employees_for_date(
-            employees, current_date, pattern_data, db
-        )
+        # Employees who should work on this date based on pattern (weekends included)
+        # and are not on leave, least loaded first
+        with stats.phase("selection"):
+            candidate_rows = np.flatnonzero(availability[:, day_index]).tolist()
+            selected_rows = selector.select(candidate_rows, shifts_per_day)
+        stats.counters["candidates_evaluated"] += len(candidate_rows)
         
-        # Assign shifts for this date
-        for shift_position in range(1, shifts_per_day + 1):
-            if working_employees:
-                # Randomly select an employee for this shift
-                employee = random.choice(working_employees)
-                working_employees.remove(employee)  # Remove to avoid double assignment
-                
-                # Create assignment
-                assignment_data = {
-                    "schedule_id": schedule.id,
-                    "employee_id": employee.id,
-                    "date": current_date,
-                    "shift_position": shift_position,
-                    "is_manual_override": False
-                }
-                
-                schedule_crud.create_schedule_assignment(db, assignment_data)
+        # Spread the selected employees over the day's shifts, satisfying preferences
+        # first and balancing each employee's shift positions otherwise
+        with stats.phase("position_matching"):
+            day_positions = solve_day_assignment(
+                [employees[row].id for row in selected_rows],
+                list(range(1, len(selected_rows) + 1)),
+                preferred_shifts,
+                fill_rank=lambda employee_id, position: (
+                    selector.position_counts[employee_rows[employee_id]][position - 1]
+                )
+            )
+            
+            day = [-1] * shifts_per_day
+            for employee_id, shift_position in day_positions.items():
+                row = employee_rows[employee_id]
+                selector.record(row, shift_position)
+                day[shift_position - 1] = row
+        grid.append(day)
     
-    return schedule
+    report_progress(progress_callback, "assigning", 1.0)
+    
+    if optimize:
+        # Improve fairness, preferences and coverage of the greedy schedule
+        candidates_by_day = [
+            np.flatnonzero(availability[:, day_index]).tolist()
+            for day_index in range(len(month_dates))
+        ]
+        preferred_by_row = [preferred_shifts.get(employee.id, set()) for employee in employees]
+        with stats.phase("optimizing"):
+            grid, optimizer_stats = optimize_schedule_grid(
+                grid, candidates_by_day, preferred_by_row, time_budget, seed,
+                progress_callback=(
+                    (lambda fraction: progress_callback("optimizing", fraction))
+                    if progress_callback else None
+                )
+            )
+        stats.counters["optimizer_iterations"] += optimizer_stats["iterations"]
+    
+    assignments = []
+    for current_date, day in zip(month_dates, grid):
+        for index, row in enumerate(day):
+            if row < 0:
+                continue
+            assignments.append({
+                "schedule_id": schedule_id,
+                "employee_id": employees[row].id,
+                "date": current_date,
+                "shift_position": index + 1,
+                "is_manual_override": False
+            })
+    
+    return assignments
+
+
+def report_progress(progress_callback: Optional[ProgressCallback], phase: str, fraction: float):
+    """Report generation progress if a callback was given"""
+    if progress_callback is not None:
+        progress_callback(phase, fraction)
 
 
 def get_month_dates(year: int, month: int) -> List[date]:
@@ -86,19 +230,20 @@ def get_working_employees_for_date(
     employees: List[Employee],
     current_date: date,
     pattern_data: Dict[str, Any],
-    db: Session
+    leave_index: LeaveIndex
 ) -> List[Employee]:
     """Determine which employees should work on a given date based on pattern"""
     
+    pattern = compile_pattern_data(pattern_data)
     working_employees = []
     
     for employee in employees:
         # Skip if employee is on leave
-        if leave_crud.is_employee_on_leave(db, employee.id, current_date):
+        if leave_index.is_on_leave(employee.id, current_date):
             continue
         
         # Check if employee should work based on pattern
-        if should_employee_work_on_date(employee, current_date, pattern_data):
+        if pattern.works_on(current_date):
             working_employees.append(employee)
     
     return working_employees
@@ -111,88 +256,44 @@ def should_employee_work_on_date(
 ) -> bool:
     """Determine if an employee should work on a specific date based on pattern"""
     
-    # Get pattern parameters
-    work_days = pattern_data.get("work_days", 4)
-    rest_days = pattern_data.get("rest_days", 2)
-    cycle_length = work_days + rest_days
-    
-    # Calculate days since a reference date (e.g., start of year)
-    reference_date = date(current_date.year, 1, 1)
-    days_since_reference = (current_date - reference_date).days
-    
-    # Calculate position in cycle
-    position_in_cycle = days_since_reference % cycle_length
-    
     # Employee should work if within work days portion of cycle
-    return position_in_cycle < work_days
+    return compile_pattern_data(pattern_data).works_on(current_date)
 
 
 def apply_employee_preferences(
     assignments: List[ScheduleAssignment],
     employees: List[Employee]
 ) -> List[ScheduleAssignment]:
-    """Apply employee preferences to shift assignments"""
+    """Apply employee preferences to shift assignments
+
+    Shift positions are rearranged among the employees working on the same day so that
+    the number of satisfied preferred_shifts is maximal.
+    """
     
-    # Create a mapping of employee preferences
-    employee_prefs = {}
-    for employee in employees:
-        if employee.preferences:
-            try:
-                prefs = json.loads(employee.preferences)
-                employee_prefs[employee.id] = prefs
-            except json.JSONDecodeError:
-                continue
+    preferred_shifts = get_preferred_shifts(employees)
     
-    # Apply preferences by swapping assignments where beneficial
-    for i, assignment in enumerate(assignments):
-        employee_pref = employee_prefs.get(assignment.employee_id, {})
-        preferred_shifts = employee_pref.get("preferred_shifts", [])
-        
-        # If employee has a preference for this shift position, try to keep it
-        if assignment.shift_position in preferred_shifts:
+    # Group assignments by date, swaps only make sense within a day
+    assignments_by_date = {}
+    for assignment in assignments:
+        assignments_by_date.setdefault(assignment.date, []).append(assignment)
+    
+    for day_assignments in assignments_by_date.values():
+        current_positions = {a.employee_id: a.shift_position for a in day_assignments}
+        if len(current_positions) != len(day_assignments):
+            # Same employee twice on one day (manual edits), leave the day as it is
             continue
         
-        # Look for opportunities to swap with other assignments
-        for j, other_assignment in enumerate(assignments):
-            if i == j:
-                continue
-            
-            # Check if swap would be beneficial for both employees
-            if would_swap_be_beneficial(assignment, other_assignment, employee_prefs):
-                # Perform swap
-                temp_shift = assignment.shift_position
-                assignment.shift_position = other_assignment.shift_position
-                other_assignment.shift_position = temp_shift
+        day_positions = solve_day_assignment(
+            list(current_positions),
+            sorted(current_positions.values()),
+            preferred_shifts,
+            current_positions
+        )
+        for assignment in day_assignments:
+            assignment.shift_position = day_positions[assignment.employee_id]
     
     return assignments
 
 
-def would_swap_be_beneficial(
-    assignment1: ScheduleAssignment,
-    assignment2: ScheduleAssignment,
-    employee_prefs: Dict[int, Dict]
-) -> bool:
-    """Check if swapping two assignments would be beneficial for both employees"""
-    
-    pref1 = employee_prefs.get(assignment1.employee_id, {})
-    pref2 = employee_prefs.get(assignment2.employee_id, {})
-    
-    preferred_shifts1 = pref1.get("preferred_shifts", [])
-    preferred_shifts2 = pref2.get("preferred_shifts", [])
-    
-    # Check if swap would improve both employees' preferences
-    current_score1 = 1 if assignment1.shift_position in preferred_shifts1 else 0
-    current_score2 = 1 if assignment2.shift_position in preferred_shifts2 else 0
-    
-    potential_score1 = 1 if assignment2.shift_position in preferred_shifts1 else 0
-    potential_score2 = 1 if assignment1.shift_position in preferred_shifts2 else 0
-    
-    # Swap is beneficial if total preference score increases
-    current_total = current_score1 + current_score2
-    potential_total = potential_score1 + potential_score2
-    
-    return potential_total > current_total
-
-
 # Import calendar at the top level
 import calendar 
\ No newline at end of file
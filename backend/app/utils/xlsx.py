@@ -0,0 +1,158 @@
+import re
+import zipfile
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+# Rows written between two yields of stream_xlsx
+ROWS_PER_CHUNK = 500
+
+# Control characters are not allowed in XML 1.0, even escaped
+_INVALID_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}</Types>'
+)
+_SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{index}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}<Relationship Id="rIdStyles" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>'
+)
+_SHEET_RELATIONSHIP = (
+    '<Relationship Id="rId{index}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{index}.xml"/>'
+)
+# Style 0 is the default, style 1 bold for header rows
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '<dxfs count="0"/><tableStyles count="0"/></styleSheet>'
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+# (sheet name, rows), the first row is the header
+Sheet = Tuple[str, Iterable[Sequence[Any]]]
+
+
+class _ChunkSink:
+    """Write-only file collecting what zipfile writes until the next drain
+
+    It has no seek or tell, so zipfile writes sizes and checksums in data descriptors
+    after each member instead of seeking back, and never needs the whole archive.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        """Yield everything written since the last drain as one chunk, if anything was"""
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+
+def stream_xlsx(sheets: Sequence[Sheet]) -> Iterator[bytes]:
+    """Write an Excel workbook as a stream of chunks
+
+    The rows of each sheet are consumed lazily, in sheet order, and only about
+    ROWS_PER_CHUNK rows are held in memory at a time. Cells hold strings, which are
+    written inline instead of into a shared string table, and numbers; None leaves a
+    cell empty. The first row of each sheet is a bold header.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES.format(sheets="".join(
+            _SHEET_CONTENT_TYPE.format(index=index) for index in range(1, len(sheets) + 1)
+        )))
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(sheets="".join(
+            f'<sheet name={quoteattr(sheet_name(name))} sheetId="{index}" r:id="rId{index}"/>'
+            for index, (name, _) in enumerate(sheets, start=1)
+        )))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(sheets="".join(
+            _SHEET_RELATIONSHIP.format(index=index) for index in range(1, len(sheets) + 1)
+        )))
+        archive.writestr("xl/styles.xml", _STYLES)
+        yield from sink.drain()
+
+        for index, (_, rows) in enumerate(sheets, start=1):
+            with archive.open(f"xl/worksheets/sheet{index}.xml", "w") as sheet:
+                sheet.write(_SHEET_START.encode())
+                parts = []
+                for row_number, row in enumerate(rows):
+                    parts.append(row_xml(row, style=0 if row_number else 1))
+                    if len(parts) == ROWS_PER_CHUNK:
+                        sheet.write("".join(parts).encode())
+                        parts.clear()
+                        yield from sink.drain()
+                sheet.write("".join(parts).encode())
+                sheet.write(_SHEET_END.encode())
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def row_xml(values: Sequence[Any], style: int = 0) -> str:
+    cells = []
+    style_attribute = f' s="{style}"' if style else ""
+    for value in values:
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c{style_attribute}><v>{value}</v></c>")
+        else:
+            text = escape(_INVALID_XML_CHARACTERS.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"{style_attribute}><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def sheet_name(name: str) -> str:
+    """Make a valid sheet name: at most 31 characters and none of []:*?/\\"""
+    return re.sub(r"[\[\]:*?/\\]", "-", name)[:31] or "Sheet"
@@ -0,0 +1,67 @@
+"""Compare two benchmark result files phase by phase
+
+    python -m benchmarks.compare benchmarks/results/before.json benchmarks/results/after.json
+
+Exits with status 1 when a phase got slower than --threshold times the baseline, or
+issued more queries than the baseline, so it can gate a release.
+"""
+import argparse
+import json
+import sys
+from typing import List
+
+
+def load_phases(path: str):
+    with open(path) as result_file:
+        results = json.load(result_file)
+    phases = {}
+    # Startup phases do not depend on the data set
+    for name, metrics in ((results.get("startup") or {}).get("phases") or {}).items():
+        phases[(0, 0, name)] = metrics
+    for scenario in results["scenarios"]:
+        for name, metrics in scenario["phases"].items():
+            phases[(scenario["employees"], scenario["months"], name)] = metrics
+    return phases
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio (default: 1.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Ignore slowdowns of phases faster than this in both runs (default: 0.05)")
+    args = parser.parse_args(argv)
+
+    baseline = load_phases(args.baseline)
+    candidate = load_phases(args.candidate)
+
+    regressions = 0
+    print(f"{'employees':>9} {'months':>6} {'phase':<24} {'baseline':>10} {'candidate':>10} {'ratio':>7} {'queries':>15}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        employees, months, name = key
+        before, after = baseline[key], candidate[key]
+        ratio = after["wall_seconds"] / before["wall_seconds"] if before["wall_seconds"] else float("inf")
+        flags = []
+        if ratio > args.threshold and max(before["wall_seconds"], after["wall_seconds"]) >= args.min_seconds:
+            flags.append("SLOWER")
+        if after["queries"] > before["queries"]:
+            flags.append("MORE QUERIES")
+        regressions += bool(flags)
+        queries = f"{before['queries']}->{after['queries']}"
+        print(
+            f"{employees:>9} {months:>6} {name:<24} {before['wall_seconds']:>9.3f}s {after['wall_seconds']:>9.3f}s "
+            f"{ratio:>6.2f}x {queries:>15} {' '.join(flags)}"
+        )
+
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"Only in {'baseline' if key in baseline else 'candidate'}: {key}")
+
+    if regressions:
+        print(f"{regressions} phase(s) regressed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Query-plan check for the hot query shapes
+
+Each check calls the real CRUD/helper function, captures the SELECT statements it issues
+and asks the database for their plans. A check passes when the plan uses the index that
+the migrations created for that query shape. On PostgreSQL sequential scans are disabled
+while explaining, so small benchmark tables do not hide a missing or unusable index.
+"""
+from datetime import date
+from typing import Any, Callable, Dict, List
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.crud import employee as employee_crud, leave as leave_crud, schedule as schedule_crud
+from app.models.schedule import Schedule
+from app.utils.replan import replan_schedule
+
+
+def capture_selects(db: Session, call: Callable[[], Any]) -> List[tuple]:
+    """Run call and return the (statement, parameters) of the SELECTs it executed"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def explain(db: Session, statement: str, parameters) -> str:
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+        return "\n".join(row[0] for row in rows)
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        return "\n".join(row[-1] for row in rows)
+    raise ValueError(f"Query-plan check does not support {connection.dialect.name}")
+
+
+def check_query_plans(db: Session, organization_id: int, schedule_id: int, employee_id: int,
+                      start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """Explain the hot queries against existing benchmark data
+
+    Returns one entry per check with the expected index, whether the plan uses it and
+    the plans of the captured statements.
+    """
+    def replan_without_changes():
+        # Re-planning an employee that has no leave only reads the affected assignments
+        schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
+        replan_schedule(db, schedule, [employee_id], start_date, end_date, commit=False)
+
+    checks = [
+        (
+            "employees_by_organization",
+            lambda: list(employee_crud.iter_employees_by_organization(db, organization_id)),
+            "ix_employees_organization_id_is_active",
+        ),
+        (
+            "leaves_by_employee_and_range",
+            lambda: leave_crud.get_active_leaves_by_date_range(db, employee_id, start_date, end_date),
+            "ix_leaves_employee_id_is_active_dates",
+        ),
+        (
+            "leave_intervals_by_organization",
+            lambda: leave_crud.get_active_leave_intervals_by_organization(db, organization_id, start_date, end_date),
+            "ix_leaves_employee_id_is_active_dates",
+        ),
+        (
+            "schedule_assignments",
+            lambda: schedule_crud.load_assignments(db, schedule_crud.get_schedule(db, schedule_id)),
+            "ix_schedule_assignments_schedule_id_date",
+        ),
+        (
+            "replan_affected_assignments",
+            replan_without_changes,
+            "ix_schedule_assignments_schedule_id_date",
+        ),
+    ]
+
+    results = []
+    for name, call, expected_index in checks:
+        try:
+            plans = [explain(db, statement, parameters) for statement, parameters in capture_selects(db, call)]
+        finally:
+            db.rollback()
+            db.expunge_all()
+        results.append({
+            "name": name,
+            "expected_index": expected_index,
+            "uses_index": any(expected_index in plan for plan in plans),
+            "plans": plans,
+        })
+    return results
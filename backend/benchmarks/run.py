@@ -0,0 +1,332 @@
+"""Synthetic-workload benchmarks for schedule generation, exports and the schedule API
+
+Run from the backend directory:
+
+    python -m benchmarks.run --employees 100 1000 10000 --months 1 12
+
+By default a fresh SQLite database in a temporary directory is used; pass
+--database-url to run against e.g. a Postgres container instead. Results are written
+as JSON and can be compared between releases with benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Dict, Any, List
+
+
+class PhaseRecorder:
+    """Measures wall time, SQL statements and peak Python memory of benchmark phases"""
+
+    def __init__(self, engine, trace_memory: bool):
+        self.queries = 0
+        self.trace_memory = trace_memory
+        self.add_engine(engine)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_engine(self, engine):
+        from sqlalchemy import event
+
+        event.listen(engine, "before_cursor_execute", self._count_query)
+
+    def _count_query(self, *args):
+        self.queries += 1
+
+    @contextmanager
+    def phase(self, results: Dict[str, Any], name: str):
+        queries_before = self.queries
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        metrics: Dict[str, Any] = {}
+        try:
+            yield metrics
+        finally:
+            metrics["wall_seconds"] = round(time.perf_counter() - started, 6)
+            metrics["queries"] = self.queries - queries_before
+            if self.trace_memory:
+                metrics["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - memory_before
+            results[name] = metrics
+            print(f"  {name:<34} {metrics['wall_seconds']:>10.3f}s {metrics['queries']:>8} queries", flush=True)
+
+
+def parse_month(value: str) -> date:
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected YYYY-MM, got {value!r}")
+
+
+def add_months(start: date, months: int) -> date:
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def concurrent_reads(app, headers, url: str, concurrency: int, requests: int) -> List[int]:
+    """Send requests GETs of url to app, concurrency at a time, and return their status codes"""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers) as client:
+        async def read():
+            async with semaphore:
+                return (await client.get(url)).status_code
+
+        statuses = await asyncio.gather(*(read() for _ in range(requests)))
+
+    if "app.core.async_database" in sys.modules:
+        # Pooled async connections belong to this event loop
+        await sys.modules["app.core.async_database"].async_engine.dispose()
+    return statuses
+
+
+def run_scenario(args, recorder: PhaseRecorder, client, num_employees: int, months: int) -> Dict[str, Any]:
+    from datetime import timedelta
+    from app.core.database import SessionLocal
+    from app.crud import employee as employee_crud, shift_pattern as shift_pattern_crud
+    from app.utils.scheduler import generate_schedule
+    from .synthetic import create_synthetic_organization
+
+    shifts_per_day = max(1, int(num_employees * args.staffing_ratio))
+    end_date = add_months(args.start, months) - timedelta(days=1)
+    phases: Dict[str, Any] = {}
+    print(f"{num_employees} employees, {months} month(s), {shifts_per_day} shifts/day", flush=True)
+
+    db = SessionLocal()
+    try:
+        with recorder.phase(phases, "seed") as metrics:
+            seeded = create_synthetic_organization(
+                db, num_employees, args.start, end_date, shifts_per_day,
+                leave_ratio=args.leave_ratio, seed=args.seed
+            )
+            metrics.update(employees=seeded["employees"], leaves=seeded["leaves"])
+
+        organization_id = seeded["organization_id"]
+        shift_pattern = shift_pattern_crud.get_shift_pattern(db, seeded["shift_pattern_id"])
+
+        with recorder.phase(phases, "load_employees") as metrics:
+            metrics["rows"] = len(list(employee_crud.iter_employees_by_organization(db, organization_id)))
+
+        schedule_ids = []
+        with recorder.phase(phases, "generate") as metrics:
+            for offset in range(months):
+                month_start = add_months(args.start, offset)
+                # Like the API, load the employees per request; committing expires them
+                employees = list(employee_crud.iter_employees_by_organization(db, organization_id))
+                schedule = generate_schedule(
+                    db=db,
+                    organization_id=organization_id,
+                    year=month_start.year,
+                    month=month_start.month,
+                    shift_pattern=shift_pattern,
+                    employees=employees,
+                    name=f"Benchmark {month_start:%Y-%m}",
+                    optimize=args.optimize_budget > 0,
+                    time_budget=args.optimize_budget or 1.0,
+                    seed=args.seed
+                )
+                schedule_ids.append(schedule.id)
+            metrics["schedules"] = len(schedule_ids)
+    finally:
+        db.close()
+
+    if client is not None:
+        schedule_id = schedule_ids[0]
+        requests = [
+            ("api_list_schedules", "GET", f"/api/schedules/organization/{organization_id}"),
+            ("api_read_schedule", "GET", f"/api/schedules/{schedule_id}"),
+            ("api_read_schedule_grid", "GET", f"/api/schedules/{schedule_id}/grid"),
+            ("api_statistics", "GET", f"/api/schedules/{schedule_id}/statistics"),
+            ("api_export_excel", "GET", f"/api/schedules/{schedule_id}/export/excel"),
+        ]
+        if not args.skip_pdf:
+            requests.append(("api_export_pdf", "GET", f"/api/schedules/{schedule_id}/export/pdf"))
+        requests += [
+            ("api_finalize", "POST", f"/api/schedules/{schedule_id}/finalize"),
+            ("api_statistics_finalized", "GET", f"/api/schedules/{schedule_id}/statistics"),
+            # Finalized schedules are rendered once, then served from the response cache
+            ("api_read_finalized", "GET", f"/api/schedules/{schedule_id}"),
+            ("api_read_finalized_cached", "GET", f"/api/schedules/{schedule_id}"),
+            ("api_read_finalized_not_modified", "GET", f"/api/schedules/{schedule_id}"),
+            ("api_export_excel_finalized", "GET", f"/api/schedules/{schedule_id}/export/excel"),
+            ("api_export_excel_finalized_cached", "GET", f"/api/schedules/{schedule_id}/export/excel"),
+        ]
+        etags = {}
+        for name, method, url in requests:
+            # Revalidate with the ETag of the previous response, as a polling browser does
+            headers = {"If-None-Match": etags[url]} if name.endswith("_not_modified") else None
+            with recorder.phase(phases, name) as metrics:
+                response = client.request(method, url, headers=headers)
+                metrics["status_code"] = response.status_code
+                metrics["response_bytes"] = len(response.content)
+            if "etag" in response.headers:
+                etags[url] = response.headers["etag"]
+
+        if args.concurrency:
+            with recorder.phase(phases, "api_concurrent_reads") as metrics:
+                statuses = asyncio.run(concurrent_reads(
+                    client.app, dict(client.headers), f"/api/schedules/{schedule_id}",
+                    args.concurrency, args.concurrent_requests
+                ))
+            metrics["concurrency"] = args.concurrency
+            metrics["requests"] = len(statuses)
+            metrics["failed_requests"] = sum(1 for status in statuses if status != 200)
+            metrics["requests_per_second"] = round(len(statuses) / metrics["wall_seconds"], 1)
+
+    return {
+        "employees": num_employees,
+        "months": months,
+        "shifts_per_day": shifts_per_day,
+        "organization_id": organization_id,
+        "schedule_id": schedule_ids[0],
+        "phases": phases,
+    }
+
+
+def run_query_plan_check(args, scenario: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from datetime import timedelta
+    from app.core.database import SessionLocal
+    from app.models.schedule_assignment import ScheduleAssignment
+    from .query_plans import check_query_plans
+
+    db = SessionLocal()
+    try:
+        employee_id = db.query(ScheduleAssignment.employee_id).filter(
+            ScheduleAssignment.schedule_id == scenario["schedule_id"]
+        ).limit(1).scalar()
+        results = check_query_plans(
+            db, scenario["organization_id"], scenario["schedule_id"], employee_id,
+            args.start, add_months(args.start, 1) - timedelta(days=1)
+        )
+    finally:
+        db.close()
+
+    print("Query plans")
+    for result in results:
+        print(f"  {result['name']:<34} {'ok' if result['uses_index'] else 'MISSING'} ({result['expected_index']})")
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Database to benchmark against (default: fresh SQLite file)")
+    parser.add_argument("--employees", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--months", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--start", type=parse_month, default=date(2025, 1, 1), metavar="YYYY-MM")
+    parser.add_argument("--staffing-ratio", type=float, default=0.1, help="Shifts per day as a share of employees")
+    parser.add_argument("--leave-ratio", type=float, default=0.3, help="Share of employees on leave each month")
+    parser.add_argument("--optimize-budget", type=float, default=0.0, help="Optimizer seconds per schedule, 0 disables")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-api", action="store_true", help="Only benchmark generation")
+    parser.add_argument("--skip-pdf", action="store_true", help="Skip the PDF export")
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="Also read the schedule with this many concurrent requests, 0 disables")
+    parser.add_argument("--concurrent-requests", type=int, default=200, help="Requests of the concurrent read phase")
+    parser.add_argument("--async-database", action="store_true",
+                        help="Serve the read endpoints from the async engine (ASYNC_DATABASE_ENABLED)")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="Fresh interpreters importing the application for the startup phases, 0 disables")
+    parser.add_argument("--no-memory", action="store_true", help="Do not trace memory (tracing slows Python code down)")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="Exit with status 1 if a hot query does not use its index")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='shift-planner-bench-'), 'bench.db')}"
+    # Must be set before the application modules create their engine
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ASYNC_DATABASE_ENABLED"] = "true" if args.async_database else "false"
+
+    startup = None
+    if args.startup_runs:
+        from .startup import measure_startup
+
+        startup = measure_startup(args.startup_runs)
+
+    import sqlalchemy
+    from app.core.database import engine, SessionLocal
+    from app.core.migrations import run_migrations
+    from app.core.security import create_access_token
+    from app.models import User
+
+    run_migrations()
+    recorder = PhaseRecorder(engine, trace_memory=not args.no_memory)
+
+    client = None
+    if not args.skip_api:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        if args.async_database:
+            from app.core.async_database import async_engine
+            recorder.add_engine(async_engine.sync_engine)
+
+        db = SessionLocal()
+        email = f"benchmark-{time.time_ns()}@example.com"
+        db.add(User(email=email, hashed_password="!", full_name="Benchmark"))
+        db.commit()
+        db.close()
+        client = TestClient(app)
+        client.headers["Authorization"] = f"Bearer {create_access_token({'sub': email})}"
+
+    scenarios = []
+    for num_employees in args.employees:
+        for months in args.months:
+            scenarios.append(run_scenario(args, recorder, client, num_employees, months))
+
+    # Plans depend on table statistics, check them against the largest data set
+    query_plans = run_query_plan_check(args, scenarios[-1])
+
+    started_at = datetime.now(timezone.utc)
+    results = {
+        "meta": {
+            "timestamp": started_at.isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": engine.dialect.name,
+            "arguments": {key: str(value) for key, value in vars(args).items()},
+        },
+        "startup": startup,
+        "scenarios": scenarios,
+        "query_plans": query_plans,
+    }
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"{started_at:%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as result_file:
+        json.dump(results, result_file, indent=2)
+    print(f"Results written to {output}")
+    if args.check_plans and not all(result["uses_index"] for result in query_plans):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Cold-start cost of a worker: importing the application in a fresh interpreter
+
+Each run starts a new Python process that imports app.main, as a uvicorn worker does,
+and then the export backends, which are loaded lazily on the first export.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+# Runs in the child process; ru_maxrss is in KiB on Linux and in bytes on macOS
+CHILD_SCRIPT = """
+import json, resource, sys, time
+def rss():
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+app_rss = rss()
+preloaded = sorted(name for name in ("pandas", "reportlab", "openpyxl") if name in sys.modules)
+from app.utils.export import EXPORT_BACKENDS, get_renderer
+for export_format in EXPORT_BACKENDS:
+    get_renderer(export_format)
+print(json.dumps({
+    "import_seconds": imported - started,
+    "import_rss_bytes": app_rss,
+    "export_backends_seconds": time.perf_counter() - imported,
+    "export_backends_rss_bytes": rss(),
+    "preloaded_modules": preloaded,
+}))
+"""
+
+BACKEND_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_startup(runs: int) -> Dict[str, Any]:
+    """Median import times and peak RSS of runs fresh interpreters, as benchmark phases
+
+    The process phase covers interpreter start and the application import, the import
+    phase only the latter. The child inherits the environment, including DATABASE_URL.
+    """
+    samples = []
+    process_seconds = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD_SCRIPT], cwd=BACKEND_DIRECTORY,
+            check=True, capture_output=True, text=True
+        ).stdout
+        process_seconds.append(time.perf_counter() - started)
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    def phase(seconds, rss_key):
+        return {
+            "wall_seconds": round(statistics.median(seconds), 6),
+            "queries": 0,
+            "peak_rss_bytes": max(sample[rss_key] for sample in samples),
+        }
+
+    phases = {
+        "startup_process": phase(process_seconds, "import_rss_bytes"),
+        "startup_import_app": phase([sample["import_seconds"] for sample in samples], "import_rss_bytes"),
+        "startup_export_backends": phase(
+            [sample["export_backends_seconds"] for sample in samples], "export_backends_rss_bytes"
+        ),
+    }
+    print("Startup")
+    for name, metrics in phases.items():
+        print(f"  {name:<34} {metrics['wall_seconds']:>10.3f}s {metrics['peak_rss_bytes'] / 2**20:>7.1f} MiB RSS")
+    if samples[0]["preloaded_modules"]:
+        print(f"  modules imported at startup that should load lazily: {', '.join(samples[0]['preloaded_modules'])}")
+    return {"runs": runs, "preloaded_modules": samples[0]["preloaded_modules"], "phases": phases}
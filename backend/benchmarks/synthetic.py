@@ -0,0 +1,92 @@
+import json
+import random
+from datetime import date, timedelta
+from typing import Dict, Any
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.employee import Employee
+from app.models.leave import Leave
+from app.models.organization import Organization
+from app.models.shift_pattern import ShiftPattern
+
+# Rows per executemany batch when seeding
+SEED_BATCH_SIZE = 5000
+
+
+def create_synthetic_organization(
+    db: Session,
+    num_employees: int,
+    start_date: date,
+    end_date: date,
+    shifts_per_day: int,
+    leave_ratio: float = 0.3,
+    preference_ratio: float = 0.5,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Create an organization with employees, a shift pattern and a dense leave calendar
+
+    Every month, leave_ratio of the employees take one to three leaves of one to ten days.
+    preference_ratio of the employees prefer one or two shift positions. Returns the ids
+    of what was created.
+    """
+    rng = random.Random(seed)
+
+    organization = Organization(name=f"Benchmark {num_employees}", description="Synthetic benchmark data")
+    db.add(organization)
+    db.flush()
+
+    shift_pattern = ShiftPattern(
+        organization_id=organization.id,
+        name="Benchmark 5-2",
+        pattern_data=json.dumps({"work_days": 5, "rest_days": 2}),
+        shifts_per_day=shifts_per_day
+    )
+    db.add(shift_pattern)
+    db.flush()
+
+    positions = list(range(1, shifts_per_day + 1))
+    employee_rows = []
+    for index in range(num_employees):
+        preferences = None
+        if rng.random() < preference_ratio:
+            preferences = json.dumps({"preferred_shifts": rng.sample(positions, min(len(positions), rng.randint(1, 2)))})
+        employee_rows.append({
+            "organization_id": organization.id,
+            "name": f"Employee {index:05d}",
+            "email": f"employee{index:05d}@example.com",
+            "is_active": True,
+            "preferences": preferences,
+        })
+    for start in range(0, len(employee_rows), SEED_BATCH_SIZE):
+        db.execute(insert(Employee), employee_rows[start:start + SEED_BATCH_SIZE])
+
+    employee_ids = [
+        employee_id for (employee_id,) in db.query(Employee.id).filter(
+            Employee.organization_id == organization.id
+        ).order_by(Employee.id)
+    ]
+
+    leave_rows = []
+    month_start = date(start_date.year, start_date.month, 1)
+    while month_start <= end_date:
+        for employee_id in rng.sample(employee_ids, int(len(employee_ids) * leave_ratio)):
+            for _ in range(rng.randint(1, 3)):
+                leave_start = month_start + timedelta(days=rng.randint(0, 27))
+                leave_rows.append({
+                    "employee_id": employee_id,
+                    "start_date": leave_start,
+                    "end_date": leave_start + timedelta(days=rng.randint(0, 9)),
+                    "reason": "Synthetic",
+                    "is_active": True,
+                })
+        month_start = (month_start + timedelta(days=32)).replace(day=1)
+    for start in range(0, len(leave_rows), SEED_BATCH_SIZE):
+        db.execute(insert(Leave), leave_rows[start:start + SEED_BATCH_SIZE])
+
+    db.commit()
+    return {
+        "organization_id": organization.id,
+        "shift_pattern_id": shift_pattern.id,
+        "employees": len(employee_ids),
+        "leaves": len(leave_rows),
+    }
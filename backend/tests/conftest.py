@@ -0,0 +1,65 @@
+import os
+import tempfile
+import uuid
+import pytest
+
+# Settings are read when the application is imported, so point it at a fresh SQLite file first
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='shift-planner-tests-'), 'test.db')}"
+os.environ["ASYNC_DATABASE_ENABLED"] = "false"
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.core.migrations import run_migrations
+    from app.main import app
+
+    run_migrations()
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.models import User
+
+    email = "tests@example.com"
+    db = SessionLocal()
+    db.add(User(email=email, hashed_password="!", full_name="Tests"))
+    db.commit()
+    db.close()
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token({'sub': email})}"
+    return client
+
+
+@pytest.fixture
+def db(app):
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def organization(client):
+    """A new organization per test, so tests do not see each other's data"""
+    response = client.post("/api/organizations/", json={"name": f"Organization {uuid.uuid4().hex[:8]}"})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def create_employees(client, organization):
+    def create(count):
+        employees = []
+        for index in range(count):
+            response = client.post(
+                "/api/employees/", json={"name": f"Employee {index}", "organization_id": organization["id"]}
+            )
+            assert response.status_code == 200
+            employees.append(response.json())
+        return employees
+    return create
@@ -0,0 +1,80 @@
+import json
+from itertools import permutations
+from types import SimpleNamespace
+import pytest
+from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.utils.assignment_solver import get_preferred_shifts, solve_day_assignment
+
+
+def satisfied(assignment, preferred_shifts):
+    return sum(position in preferred_shifts.get(employee_id, ()) for employee_id, position in assignment.items())
+
+
+def best_possible(employee_ids, positions, preferred_shifts):
+    return max(
+        satisfied(dict(zip(employee_ids, chosen)), preferred_shifts)
+        for chosen in permutations(positions, len(employee_ids))
+    )
+
+
+@pytest.mark.parametrize("employee_ids, positions, preferred_shifts", [
+    # Greedy in id order would give employee 1 position 1 and leave employee 2 unsatisfied
+    ([1, 2], [1, 2], {1: {1, 2}, 2: {1}}),
+    ([1, 2, 3], [1, 2, 3], {1: {1}, 2: {1, 2}, 3: {2, 3}}),
+    ([1, 2, 3], [1, 2, 3, 4], {1: {4}, 2: {4}, 3: {4, 1}}),
+    ([1, 2, 3, 4], [1, 2, 3, 4], {1: {1, 2}, 2: {2, 3}, 3: {3, 4}, 4: {1}}),
+    ([1, 2], [1, 2, 3], {}),
+])
+def test_satisfies_as_many_preferences_as_possible(employee_ids, positions, preferred_shifts):
+    assignment = solve_day_assignment(employee_ids, positions, preferred_shifts)
+    assert sorted(assignment) == sorted(employee_ids)
+    assert len(set(assignment.values())) == len(employee_ids)
+    assert set(assignment.values()) <= set(positions)
+    assert satisfied(assignment, preferred_shifts) == best_possible(employee_ids, positions, preferred_shifts)
+
+
+def test_warm_start_keeps_current_positions():
+    preferred_shifts = {1: {1, 2}, 2: {2, 3}}
+    current_positions = {1: 2, 2: 3, 3: 1}
+    assignment = solve_day_assignment([1, 2, 3], [1, 2, 3], preferred_shifts, current_positions)
+    assert assignment == current_positions
+
+
+def test_warm_start_gives_way_to_more_satisfied_preferences():
+    # Employee 1 sits on 1, the only position employee 2 wants, and also likes 2
+    preferred_shifts = {1: {1, 2}, 2: {1}}
+    assignment = solve_day_assignment([1, 2], [1, 2], preferred_shifts, {1: 1, 2: 2})
+    assert assignment == {1: 2, 2: 1}
+
+
+def test_fill_rank_orders_free_positions():
+    assignment = solve_day_assignment([1, 2], [1, 2, 3], {}, fill_rank=lambda employee_id, position: -position)
+    assert assignment == {1: 3, 2: 2}
+
+
+def employee(employee_id, preferences):
+    return SimpleNamespace(id=employee_id, preferences=None if preferences is None else json.dumps(preferences))
+
+
+def test_get_preferred_shifts_ignores_malformed_preferences():
+    employees = [
+        employee(1, {"preferred_shifts": [1, 3]}),
+        employee(2, {"preferred_shifts": [[1]]}),
+        employee(3, {"preferred_shifts": {"a": 1}}),
+        employee(4, {"preferred_shifts": [2, "3", True, None]}),
+        employee(5, {"preferred_shifts": 2}),
+        employee(6, ["preferred_shifts"]),
+        employee(7, None),
+    ]
+    assert get_preferred_shifts(employees) == {1: {1, 3}, 4: {2}}
+    # Invalid JSON is skipped as well
+    assert get_preferred_shifts([SimpleNamespace(id=8, preferences="{")]) == {}
+
+
+@pytest.mark.parametrize("preferred_shifts", [[[1]], {"a": 1}, [0], ["1"], [True], 2])
+def test_employee_schemas_reject_malformed_preferred_shifts(preferred_shifts):
+    with pytest.raises(ValueError):
+        EmployeeCreate(name="e", organization_id=1, preferences={"preferred_shifts": preferred_shifts})
+    with pytest.raises(ValueError):
+        EmployeeUpdate(preferences={"preferred_shifts": preferred_shifts})
+    EmployeeCreate(name="e", organization_id=1, preferences={"preferred_shifts": [1, 2], "note": "x"})
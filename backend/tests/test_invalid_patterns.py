@@ -0,0 +1,49 @@
+import json
+import pytest
+from app.models import Schedule, ShiftPattern
+from app.utils.batch import generate_schedule_for_organization_month
+
+
+@pytest.fixture(params=[{"work_days": 400, "rest_days": 2}, {"work_days": "5", "rest_days": 2}])
+def invalid_pattern(request, client, db, organization, create_employees):
+    """A shift pattern stored before pattern validation existed"""
+    create_employees(3)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "Legacy",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 5, "rest_days": 2},
+        "shifts_per_day": 1,
+    }).json()
+    db_pattern = db.get(ShiftPattern, pattern["id"])
+    db_pattern.pattern_data = json.dumps(request.param)
+    db.commit()
+    return pattern
+
+
+def schedule_count(db, organization_id):
+    db.expire_all()
+    return db.query(Schedule).filter(Schedule.organization_id == organization_id).count()
+
+
+def test_generate_rejects_invalid_stored_pattern(client, db, organization, invalid_pattern):
+    response = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": invalid_pattern["id"],
+    })
+    assert response.status_code == 400
+    assert "work_days" in response.json()["detail"]
+    assert schedule_count(db, organization["id"]) == 0
+
+
+def test_generation_job_rejects_invalid_stored_pattern(client, organization, invalid_pattern):
+    response = client.post("/api/jobs/schedule-generation", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": invalid_pattern["id"],
+    })
+    assert response.status_code == 400
+    assert "work_days" in response.json()["detail"]
+
+
+def test_batch_skips_invalid_stored_pattern(db, organization, invalid_pattern):
+    result = generate_schedule_for_organization_month(organization["id"], 2024, 3, invalid_pattern["id"])
+    assert result["status"] == "skipped"
+    assert "work_days" in result["error"]
+    assert schedule_count(db, organization["id"]) == 0
@@ -0,0 +1,71 @@
+import pytest
+from app.api import leaves as leaves_api
+from app.models import Leave
+
+
+@pytest.fixture
+def draft_schedule(client, organization, create_employees):
+    employees = create_employees(6)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "5 on 2 off",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 5, "rest_days": 2},
+        "shifts_per_day": 2,
+    }).json()
+    schedule = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": pattern["id"], "seed": 1,
+    }).json()
+    return schedule, employees
+
+
+def shifts_of(client, schedule_id, employee_id, start, end):
+    assignments = client.get(f"/api/schedules/{schedule_id}").json()["assignments"]
+    return [a for a in assignments if a["employee_id"] == employee_id and start <= a["date"] <= end]
+
+
+def test_leave_moves_draft_shifts_to_colleagues(client, draft_schedule):
+    schedule, employees = draft_schedule
+    employee_id = employees[0]["id"]
+    assert shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-10")
+
+    response = client.post("/api/leaves/", json={
+        "employee_id": employee_id, "start_date": "2024-03-01", "end_date": "2024-03-10",
+    })
+    assert response.status_code == 200
+    assert shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-10") == []
+
+
+def test_failed_replan_does_not_save_the_leave(client, db, draft_schedule, monkeypatch):
+    schedule, employees = draft_schedule
+    employee_id = employees[0]["id"]
+    before = shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-10")
+
+    def failing_replan(db, *args, **kwargs):
+        raise RuntimeError("replan failed")
+
+    monkeypatch.setattr(leaves_api, "replan_draft_schedules_for_employee", failing_replan)
+    with pytest.raises(RuntimeError):
+        client.post("/api/leaves/", json={
+            "employee_id": employee_id, "start_date": "2024-03-01", "end_date": "2024-03-10",
+        })
+    assert db.query(Leave).filter(Leave.employee_id == employee_id).count() == 0
+    assert shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-10") == before
+
+
+def test_failed_replan_does_not_deactivate_the_employee(client, db, draft_schedule, monkeypatch):
+    from app.api import employees as employees_api
+    from app.models import Employee
+
+    schedule, employees = draft_schedule
+    employee_id = employees[0]["id"]
+    before = shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-31")
+
+    def failing_replan(db, *args, **kwargs):
+        raise RuntimeError("replan failed")
+
+    monkeypatch.setattr(employees_api, "replan_draft_schedules_for_employee", failing_replan)
+    with pytest.raises(RuntimeError):
+        client.delete(f"/api/employees/{employee_id}")
+    db.expire_all()
+    assert db.get(Employee, employee_id).is_active
+    assert shifts_of(client, schedule["id"], employee_id, "2024-03-01", "2024-03-31") == before
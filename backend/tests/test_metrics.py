@@ -0,0 +1,59 @@
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine, text
+from app.core.database import RequestDatabaseStats, current_request_db_stats, instrument_engine
+
+
+def make_engine():
+    path = os.path.join(tempfile.mkdtemp(prefix="shift-planner-pool-"), "pool.db")
+    engine = create_engine(f"sqlite:///{path}", pool_size=1, max_overflow=0, pool_timeout=5, pool_pre_ping=True)
+    instrument_engine(engine)
+    return engine
+
+
+def checkout_wait(engine, hold_seconds):
+    """Wait of a checkout while another thread holds the only connection for hold_seconds"""
+    held = engine.connect()
+    released = threading.Timer(hold_seconds, held.close)
+    stats = RequestDatabaseStats()
+    token = current_request_db_stats.set(stats)
+    try:
+        released.start()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    finally:
+        current_request_db_stats.reset(token)
+        released.join()
+    return stats.checkout_wait_seconds
+
+
+def test_checkout_wait_is_the_time_spent_in_the_pool_queue():
+    engine = make_engine()
+    assert checkout_wait(engine, 0.3) >= 0.25
+
+    stats = RequestDatabaseStats()
+    token = current_request_db_stats.set(stats)
+    try:
+        started = time.perf_counter()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        elapsed = time.perf_counter() - started
+    finally:
+        current_request_db_stats.reset(token)
+    assert stats.checkout_wait_seconds < elapsed
+    assert stats.checkout_wait_seconds < 0.05
+
+
+def test_disposed_engine_keeps_timing_its_new_pool():
+    engine = make_engine()
+    engine.dispose()
+    assert checkout_wait(engine, 0.3) >= 0.25
+
+
+def test_pool_wait_is_exported_per_route(client, organization):
+    assert client.get(f"/api/organizations/{organization['id']}").status_code == 200
+
+    metrics = client.get("/metrics").text
+    assert 'http_request_db_pool_wait_seconds_count{method="GET",route="/api/organizations/{organization_id}"}' in metrics
@@ -0,0 +1,75 @@
+import random
+import pytest
+from app.utils.optimizer import optimize_schedule_grid, score_grid
+
+NUM_EMPLOYEES = 12
+DAYS = 28
+SHIFTS_PER_DAY = 3
+
+
+@pytest.fixture
+def problem():
+    """A greedy grid filled from random daily availability, with some shifts left empty"""
+    rng = random.Random(7)
+    candidates_by_day = [
+        sorted(rng.sample(range(NUM_EMPLOYEES), rng.randint(2, NUM_EMPLOYEES))) for _ in range(DAYS)
+    ]
+    preferred_by_row = [set(rng.sample(range(1, SHIFTS_PER_DAY + 1), rng.randint(0, 2))) for _ in range(NUM_EMPLOYEES)]
+    grid = []
+    for candidates in candidates_by_day:
+        day = [-1] * SHIFTS_PER_DAY
+        for position, row in enumerate(candidates[:SHIFTS_PER_DAY]):
+            if rng.random() < 0.8:
+                day[position] = row
+        grid.append(day)
+    return grid, candidates_by_day, preferred_by_row
+
+
+def optimize(problem, seed=1, max_iterations=20000):
+    grid, candidates_by_day, preferred_by_row = problem
+    return optimize_schedule_grid(
+        grid, candidates_by_day, preferred_by_row, time_budget=60.0, seed=seed, max_iterations=max_iterations
+    )
+
+
+def test_fixed_seed_is_reproducible(problem):
+    first_grid, first_stats = optimize(problem, seed=3)
+    second_grid, second_stats = optimize(problem, seed=3)
+    assert first_grid == second_grid
+    assert first_stats["iterations"] == second_stats["iterations"] == 20000
+    assert first_stats["best_score"] == second_stats["best_score"]
+
+
+def test_score_never_worse_than_greedy_input(problem):
+    grid, _, preferred_by_row = problem
+    initial = score_grid(grid, preferred_by_row, NUM_EMPLOYEES)
+    for seed in range(5):
+        best_grid, stats = optimize(problem, seed=seed)
+        assert stats["initial_score"] == initial
+        assert score_grid(best_grid, preferred_by_row, NUM_EMPLOYEES) <= initial
+
+
+def test_assignments_stay_within_candidates(problem):
+    _, candidates_by_day, _ = problem
+    best_grid, _ = optimize(problem)
+    for day_index, day in enumerate(best_grid):
+        assigned = [row for row in day if row >= 0]
+        assert set(assigned) <= set(candidates_by_day[day_index])
+        # Nobody works two shifts on the same day
+        assert len(assigned) == len(set(assigned))
+
+
+def test_incremental_score_matches_full_rescore(problem):
+    _, _, preferred_by_row = problem
+    for seed in range(5):
+        best_grid, stats = optimize(problem, seed=seed)
+        assert stats["best_score"] == pytest.approx(score_grid(best_grid, preferred_by_row, NUM_EMPLOYEES))
+
+
+def test_empty_days_are_left_alone():
+    grid = [[-1, -1], [0, -1]]
+    best_grid, stats = optimize_schedule_grid(
+        grid, [[], [0, 1]], [set(), set()], time_budget=60.0, seed=0, max_iterations=1000
+    )
+    assert best_grid[0] == [-1, -1]
+    assert sorted(best_grid[1]) == [0, 1]
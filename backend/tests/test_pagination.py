@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+import pytest
+from app.models import Leave
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+
+def read_all_pages(client, url, limit):
+    items = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        items.extend(response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items, pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([date(2024, 3, 1), 42])
+    assert decode_cursor(cursor, [Leave.start_date, Leave.id]) == (date(2024, 3, 1), 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    encode_cursor([1]),  # wrong number of values
+    encode_cursor(["2024-03-01", "42"]),  # id is not an int
+    encode_cursor(["March", 42]),  # not a date
+    encode_cursor([True, 1]),
+    "e30",  # {} instead of a list
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, [Leave.start_date, Leave.id])
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 7, 25])
+def test_pages_with_equal_sort_keys_skip_and_repeat_nothing(client, db, create_employees, limit):
+    employee = create_employees(1)[0]
+    # Leaves sharing a start date are ordered by id, the cursor has to break the tie
+    start_dates = [date(2024, 3, 1)] * 6 + [date(2024, 2, 1)] * 4 + [date(2024, 4, 1)] * 5
+    leaves = [
+        Leave(employee_id=employee["id"], start_date=start, end_date=start + timedelta(days=1))
+        for start in start_dates
+    ]
+    db.add_all(leaves)
+    db.add(Leave(employee_id=employee["id"], start_date=date(2024, 3, 1), end_date=date(2024, 3, 2), is_active=False))
+    db.commit()
+    expected = [leave.id for leave in sorted(leaves, key=lambda leave: (leave.start_date, leave.id))]
+
+    items, pages = read_all_pages(client, f"/api/leaves/employee/{employee['id']}", limit)
+    assert [item["id"] for item in items] == expected
+    assert pages == max(1, -(-len(expected) // limit))
+
+
+def test_employee_pages_cover_the_organization(client, organization, create_employees):
+    employees = create_employees(5)
+    items, pages = read_all_pages(client, f"/api/employees/organization/{organization['id']}", 2)
+    assert [item["id"] for item in items] == [employee["id"] for employee in employees]
+    assert pages == 3
+
+
+@pytest.mark.parametrize("url", ["/api/leaves/employee/{employee_id}", "/api/employees/organization/{organization_id}"])
+def test_endpoints_answer_malformed_cursor_with_400(client, organization, create_employees, url):
+    employee = create_employees(1)[0]
+    url = url.format(employee_id=employee["id"], organization_id=organization["id"])
+    for cursor in ("garbage", encode_cursor(["x", "y", "z"])):
+        response = client.get(url, params={"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,149 @@
+from collections import defaultdict
+import pytest
+
+
+@pytest.fixture
+def draft_schedule(client, organization, create_employees):
+    employees = create_employees(6)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "5 on 2 off",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 5, "rest_days": 2},
+        "shifts_per_day": 2,
+    }).json()
+    schedule = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": pattern["id"], "seed": 1,
+    }).json()
+    return schedule, [employee["id"] for employee in employees]
+
+
+def get_assignments(client, schedule_id):
+    return client.get(f"/api/schedules/{schedule_id}").json()["assignments"]
+
+
+def full_days(assignments):
+    """(first, second) assignments of every date with both shifts staffed"""
+    by_date = defaultdict(list)
+    for assignment in assignments:
+        by_date[assignment["date"]].append(assignment)
+    return [sorted(day, key=lambda a: a["shift_position"]) for day in by_date.values() if len(day) == 2]
+
+
+def post_batch(client, schedule_id, edits=(), swaps=()):
+    return client.post(f"/api/schedules/{schedule_id}/assignments/batch", json={
+        "edits": list(edits), "swaps": list(swaps),
+    })
+
+
+def assert_rejected(client, schedule_id, before, response, detail):
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+    assert get_assignments(client, schedule_id) == before
+
+
+def test_edits_and_swaps_are_applied(client, draft_schedule):
+    schedule, employee_ids = draft_schedule
+    (first, second), (third, fourth) = full_days(get_assignments(client, schedule["id"]))[:2]
+    free = next(e for e in employee_ids if e not in (first["employee_id"], second["employee_id"]))
+
+    response = post_batch(
+        client, schedule["id"],
+        edits=[{"assignment_id": first["id"], "employee_id": free, "notes": "covering"}],
+        swaps=[{"assignment_id": third["id"], "other_assignment_id": fourth["id"]}],
+    )
+    assert response.status_code == 200
+    changed = {assignment["id"]: assignment for assignment in response.json()}
+    assert changed[first["id"]]["employee_id"] == free
+    assert changed[first["id"]]["notes"] == "covering"
+    assert changed[third["id"]]["employee_id"] == fourth["employee_id"]
+    assert changed[fourth["id"]]["employee_id"] == third["employee_id"]
+    assert all(assignment["is_manual_override"] for assignment in changed.values())
+
+
+def test_shift_position_outside_the_pattern_is_rejected(client, draft_schedule):
+    schedule, _ = draft_schedule
+    (first, _), = full_days(get_assignments(client, schedule["id"]))[:1]
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(client, schedule["id"], edits=[{"assignment_id": first["id"], "shift_position": 99}])
+    assert_rejected(client, schedule["id"], before, response, "between 1 and 2")
+
+
+def test_edit_double_booking_an_employee_is_rejected(client, draft_schedule):
+    schedule, _ = draft_schedule
+    (first, second), = full_days(get_assignments(client, schedule["id"]))[:1]
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(
+        client, schedule["id"], edits=[{"assignment_id": first["id"], "employee_id": second["employee_id"]}]
+    )
+    assert_rejected(client, schedule["id"], before, response, "more than one shift")
+
+
+def test_edits_of_one_date_are_checked_together(client, draft_schedule):
+    schedule, employee_ids = draft_schedule
+    (first, second), = full_days(get_assignments(client, schedule["id"]))[:1]
+    free = next(e for e in employee_ids if e not in (first["employee_id"], second["employee_id"]))
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(client, schedule["id"], edits=[
+        {"assignment_id": first["id"], "employee_id": free},
+        {"assignment_id": second["id"], "employee_id": free},
+    ])
+    assert_rejected(client, schedule["id"], before, response, "more than one shift")
+
+
+def test_swap_double_booking_an_employee_is_rejected(client, draft_schedule):
+    schedule, _ = draft_schedule
+    assignments = get_assignments(client, schedule["id"])
+    (first, second), = full_days(assignments)[:1]
+    # Another day of the employee working the second shift, who would then hold both shifts
+    other = next(
+        a for a in assignments
+        if a["employee_id"] == second["employee_id"] and a["date"] != first["date"]
+    )
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(client, schedule["id"], swaps=[{"assignment_id": first["id"], "other_assignment_id": other["id"]}])
+    assert_rejected(client, schedule["id"], before, response, "more than one shift")
+
+
+def test_inactive_employee_is_rejected(client, draft_schedule):
+    schedule, employee_ids = draft_schedule
+    inactive = employee_ids[-1]
+    assert client.delete(f"/api/employees/{inactive}").status_code == 200
+    first = next(a for a in get_assignments(client, schedule["id"]) if a["employee_id"] != inactive)
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(client, schedule["id"], edits=[{"assignment_id": first["id"], "employee_id": inactive}])
+    assert_rejected(client, schedule["id"], before, response, "inactive")
+
+
+def test_employee_on_leave_is_rejected(client, draft_schedule):
+    schedule, employee_ids = draft_schedule
+    (first, second), = full_days(get_assignments(client, schedule["id"]))[:1]
+    on_leave = next(e for e in employee_ids if e not in (first["employee_id"], second["employee_id"]))
+    assert client.post("/api/leaves/", json={
+        "employee_id": on_leave, "start_date": first["date"], "end_date": first["date"],
+    }).status_code == 200
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(client, schedule["id"], edits=[{"assignment_id": first["id"], "employee_id": on_leave}])
+    assert_rejected(client, schedule["id"], before, response, "on leave")
+
+
+def test_invalid_operation_rolls_back_the_whole_batch(client, draft_schedule):
+    schedule, employee_ids = draft_schedule
+    (first, second), (third, fourth) = full_days(get_assignments(client, schedule["id"]))[:2]
+    free = next(e for e in employee_ids if e not in (first["employee_id"], second["employee_id"]))
+
+    before = get_assignments(client, schedule["id"])
+    response = post_batch(
+        client, schedule["id"],
+        edits=[
+            {"assignment_id": first["id"], "employee_id": free},
+            {"assignment_id": third["id"], "shift_position": 3},
+        ],
+        swaps=[{"assignment_id": second["id"], "other_assignment_id": fourth["id"]}],
+    )
+    assert_rejected(client, schedule["id"], before, response, "between 1 and 2")
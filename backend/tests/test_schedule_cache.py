@@ -0,0 +1,102 @@
+import io
+import zipfile
+import pytest
+
+
+@pytest.fixture
+def finalized_schedule(client, organization, create_employees):
+    employees = create_employees(6)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "5 on 2 off",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 5, "rest_days": 2},
+        "shifts_per_day": 2,
+    }).json()
+    schedule = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": pattern["id"], "seed": 1,
+    }).json()
+    assert client.post(f"/api/schedules/{schedule['id']}/finalize").status_code == 200
+    return schedule
+
+
+def excel_text(response):
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        return archive.read("xl/worksheets/sheet1.xml").decode()
+
+
+@pytest.mark.parametrize("path", ["", "/grid", "/export/excel"])
+def test_matching_etag_is_not_modified(client, finalized_schedule, path):
+    url = f"/api/schedules/{finalized_schedule['id']}{path}"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    assert client.get(url).content == first.content
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_assignment_change_invalidates_the_cached_schedule(client, finalized_schedule):
+    url = f"/api/schedules/{finalized_schedule['id']}"
+    first = client.get(url)
+    assignment = first.json()["assignments"][0]
+
+    response = client.put(f"{url}/assignments/{assignment['id']}", json={"notes": "changed"})
+    assert response.status_code == 200
+
+    response = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert response.json()["assignments"][0]["notes"] == "changed"
+
+
+def test_employee_rename_invalidates_the_cached_schedule(client, finalized_schedule):
+    url = f"/api/schedules/{finalized_schedule['id']}"
+    grid = client.get(f"{url}/grid")
+    excel = client.get(f"{url}/export/excel")
+    employee_id = grid.json()["employee_ids"][0]
+    old_name = grid.json()["employee_names"][0]
+    assert old_name in excel_text(excel)
+
+    response = client.put(f"/api/employees/{employee_id}", json={"name": "Renamed Employee"})
+    assert response.status_code == 200
+
+    response = client.get(f"{url}/grid", headers={"If-None-Match": grid.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != grid.headers["ETag"]
+    assert response.json()["employee_names"][0] == "Renamed Employee"
+
+    response = client.get(f"{url}/export/excel", headers={"If-None-Match": excel.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != excel.headers["ETag"]
+    assert "Renamed Employee" in excel_text(response)
+    assert old_name not in excel_text(response)
+
+
+
+def test_streamed_body_of_a_changed_schedule_is_not_cached(client, db, finalized_schedule, monkeypatch):
+    from app.api import schedules as schedules_api
+    from app.crud.schedule import touch_schedule
+    from app.utils.export import stream_schedule_excel
+    from app.utils.schedule_cache import schedule_cache
+
+    def stream_with_change(schedule):
+        chunks = stream_schedule_excel(schedule)
+        yield next(chunks)
+        # The schedule changes while the rest of the workbook is read
+        touch_schedule(db, schedule.id)
+        db.commit()
+        yield from chunks
+
+    url = f"/api/schedules/{finalized_schedule['id']}/export/excel"
+    monkeypatch.setattr(schedules_api, "stream_schedule_excel", stream_with_change)
+    stale = client.get(url)
+    assert stale.status_code == 200
+    assert schedule_cache.get(finalized_schedule["id"], "excel", stale.headers["ETag"]) == (None, "miss")
+    monkeypatch.undo()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != stale.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": stale.headers["ETag"]}).status_code == 200
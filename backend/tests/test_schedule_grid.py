@@ -0,0 +1,54 @@
+from datetime import date
+from types import SimpleNamespace
+from app.utils.schedule_grid import grid_from_rows
+
+
+def make_schedule():
+    return SimpleNamespace(id=1, year=2024, month=2, status="draft", updated_at=None)
+
+
+def test_unassigned_trailing_shifts_keep_their_columns():
+    rows = [(date(2024, 2, 1), 1, 10, False), (date(2024, 2, 2), 2, 11, True)]
+    grid = grid_from_rows(make_schedule(), rows, [(10, "A"), (11, "B")], shifts_per_day=3)
+
+    assert grid.shifts_per_day == 3
+    assert len(grid.grid) == 29
+    assert grid.grid[0] == [0, -1, -1]
+    assert grid.grid[1] == [-1, 1, -1]
+    assert grid.grid[2] == [-1, -1, -1]
+    assert grid.manual_overrides == [[1, 1]]
+
+
+def test_empty_month_has_the_pattern_shifts():
+    grid = grid_from_rows(make_schedule(), [], [], shifts_per_day=2)
+
+    assert grid.shifts_per_day == 2
+    assert grid.grid == [[-1, -1]] * 29
+
+
+def test_positions_beyond_the_pattern_get_a_column():
+    rows = [(date(2024, 2, 1), 1, 10, False), (date(2024, 2, 1), 4, 10, False)]
+    grid = grid_from_rows(make_schedule(), rows, [(10, "A")], shifts_per_day=2)
+
+    assert grid.shifts_per_day == 4
+    assert grid.grid[0] == [0, -1, -1, 0]
+    assert grid.extra == []
+
+
+def test_grid_endpoint_uses_the_schedule_pattern(client, organization, create_employees):
+    create_employees(2)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "Three shifts",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 5, "rest_days": 2},
+        "shifts_per_day": 3,
+    }).json()
+    schedule = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": pattern["id"], "seed": 1,
+    }).json()
+
+    grid = client.get(f"/api/schedules/{schedule['id']}/grid").json()
+    # Two employees can staff at most two of the three shifts a day
+    assert grid["shifts_per_day"] == 3
+    assert all(len(day) == 3 for day in grid["grid"])
+    assert all(day[2] == -1 for day in grid["grid"])
@@ -0,0 +1,91 @@
+from sqlalchemy import func, select
+from app.crud import schedule as schedule_crud
+from app.models import ScheduleAssignment, ScheduleEmployeeStat
+from app.schemas.schedule import ScheduleAssignmentCreate
+
+
+def maintained_stats(db, schedule_id):
+    return {
+        (employee_id, position): count
+        for employee_id, position, count in db.execute(
+            select(
+                ScheduleEmployeeStat.employee_id, ScheduleEmployeeStat.shift_position, ScheduleEmployeeStat.shift_count
+            ).where(ScheduleEmployeeStat.schedule_id == schedule_id)
+        )
+    }
+
+
+def recomputed_stats(db, schedule_id):
+    return {
+        (employee_id, position): count
+        for employee_id, position, count in db.execute(
+            select(
+                ScheduleAssignment.employee_id, ScheduleAssignment.shift_position, func.count(ScheduleAssignment.id)
+            ).where(
+                ScheduleAssignment.schedule_id == schedule_id
+            ).group_by(ScheduleAssignment.employee_id, ScheduleAssignment.shift_position)
+        )
+    }
+
+
+def assert_stats_match(db, schedule_id):
+    db.expire_all()
+    expected = recomputed_stats(db, schedule_id)
+    assert expected
+    assert maintained_stats(db, schedule_id) == expected
+
+
+def test_maintained_stats_match_group_by_after_every_change(client, db, organization, create_employees):
+    employees = create_employees(8)
+    pattern = client.post("/api/shift-patterns/", json={
+        "name": "4 on 2 off",
+        "organization_id": organization["id"],
+        "pattern_data": {"work_days": 4, "rest_days": 2},
+        "shifts_per_day": 3,
+    }).json()
+    schedule = client.post("/api/schedules/generate", json={
+        "organization_id": organization["id"], "year": 2024, "month": 3, "shift_pattern_id": pattern["id"], "seed": 1,
+    }).json()
+    schedule_id = schedule["id"]
+    assert client.post(f"/api/schedules/{schedule_id}/finalize").status_code == 200
+    assert_stats_match(db, schedule_id)
+
+    assignments = client.get(f"/api/schedules/{schedule_id}").json()["assignments"]
+    first, second, third, fourth = assignments[:4]
+    employee_ids = [employee["id"] for employee in employees]
+    other_employee = next(employee_id for employee_id in employee_ids if employee_id != first["employee_id"])
+
+    # Single PUT changing employee and position
+    response = client.put(
+        f"/api/schedules/{schedule_id}/assignments/{first['id']}",
+        json={"employee_id": other_employee, "shift_position": 3 if first["shift_position"] != 3 else 1},
+    )
+    assert response.status_code == 200
+    assert_stats_match(db, schedule_id)
+
+    # Batch edit and swap
+    response = client.post(f"/api/schedules/{schedule_id}/assignments/batch", json={
+        "edits": [{"assignment_id": second["id"], "employee_id": employee_ids[-1], "shift_position": 2}],
+        "swaps": [{"assignment_id": third["id"], "other_assignment_id": assignments[-1]["id"]}],
+    })
+    assert response.status_code == 200
+    assert_stats_match(db, schedule_id)
+
+    # Delete and create
+    schedule_crud.delete_schedule_assignment(db, fourth["id"])
+    assert_stats_match(db, schedule_id)
+    schedule_crud.create_schedule_assignment(db, ScheduleAssignmentCreate(
+        schedule_id=schedule_id, employee_id=employee_ids[0], date=fourth["date"], shift_position=4
+    ))
+    assert_stats_match(db, schedule_id)
+
+    # Reopening drops the statistics, finalizing again rebuilds them
+    assert client.put(f"/api/schedules/{schedule_id}", json={"status": "draft"}).status_code == 200
+    db.expire_all()
+    assert maintained_stats(db, schedule_id) == {}
+    assert client.post(f"/api/schedules/{schedule_id}/finalize").status_code == 200
+    assert_stats_match(db, schedule_id)
+
+    # The statistics endpoint reads the maintained table for finalized schedules
+    statistics = client.get(f"/api/schedules/{schedule_id}/statistics").json()
+    assert statistics["total_assignments"] == sum(recomputed_stats(db, schedule_id).values())